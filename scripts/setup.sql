@@ -133,6 +133,7 @@ SHOW DATABASES LIKE 'SNOW_BEAR_DB';
 -- 1. Upload all files to SNOW_BEAR_STAGE:
 --    - basketball_fan_survey_data.csv.gz
 --    - snow_bear.py
+--    - snow_bear_*.py (helper modules imported by snow_bear.py)
 --    - environment.yml  
 --    - snow_bear_fan_360.yaml
 -- 2. Download and import snow_bear_complete_setup.ipynb using Snowsight's Import .ipynb file feature
@@ -17,10 +17,26 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from snowflake.snowpark.context import get_active_session
 import altair as alt
+import functools
 import json
+import os
+import tempfile
+import time
 import traceback
+import snow_bear_analyst as sb_analyst
+import snow_bear_backend as sb_backend
+import snow_bear_charts as sb_charts
+import snow_bear_narrative as sb_narrative
+import snow_bear_search as sb_search
+import snow_bear_semantic as sb_semantic
+from snow_bear_cache import DataCache
+import snow_bear_data as sb_data
+import snow_bear_metrics as sb_metrics
+import snow_bear_telemetry as sb_telemetry
+
+# Time this script run from the top, for the debug panel's rerun report
+rerun_timer = sb_telemetry.RerunTimer()
 
 # Set page config
 st.set_page_config(
@@ -146,27 +162,39 @@ st.markdown("""
 # Initialize session state for better management
 def init_session_state():
     """Initialize session state variables"""
-    if 'data_loaded' not in st.session_state:
-        st.session_state.data_loaded = False
-    if 'df' not in st.session_state:
-        st.session_state.df = None
-    if 'themes_df' not in st.session_state:
-        st.session_state.themes_df = None
-    if 'session' not in st.session_state:
-        st.session_state.session = None
+    if 'backend' not in st.session_state:
+        st.session_state.backend = None
     if 'error_count' not in st.session_state:
         st.session_state.error_count = 0
+    if 'search_query' not in st.session_state:
+        st.session_state.search_query = ""
+    if 'search_page' not in st.session_state:
+        st.session_state.search_page = 1
+    if 'view_timings' not in st.session_state:
+        st.session_state.view_timings = sb_telemetry.ViewTimings()
     if 'session_id' not in st.session_state:
         import uuid
         st.session_state.session_id = str(uuid.uuid4())[:8]  # Short unique ID
 
+@st.cache_resource
+def get_profiler():
+    """Process-wide profiler: SQL, view, cache and Cortex events for the debug panel and JSON logs"""
+    return sb_telemetry.Profiler()
+
+@st.cache_resource
+def get_local_backend():
+    """Offline DuckDB backend, built once per process (SNOW_BEAR_BACKEND=local)"""
+    return sb_telemetry.instrument_backend(sb_backend.create_backend("local"), get_profiler())
+
 # Initialize session connection without caching
-def get_snowflake_session():
-    """Get Snowflake session with error handling"""
+def get_backend():
+    """Get the data backend (Snowflake session, or the local stand-in) with error handling"""
     try:
-        if st.session_state.session is None:
-            st.session_state.session = get_active_session()
-        return st.session_state.session
+        if sb_backend.backend_name() == "local":
+            return get_local_backend()
+        if st.session_state.backend is None:
+            st.session_state.backend = sb_telemetry.instrument_backend(sb_backend.create_backend("snowflake"), get_profiler())
+        return st.session_state.backend
     except Exception as e:
         st.error(f"Failed to connect to Snowflake: {str(e)}")
         return None
@@ -174,19 +202,44 @@ def get_snowflake_session():
 # Initialize session state
 init_session_state()
 
+# Events recorded on this thread belong to this run until it finishes
+profiler = get_profiler()
+profiler.start_run(rerun_timer, st.session_state.session_id)
+
 # Get session first
-session = get_snowflake_session()
+backend = get_backend()
 
-if session is None:
+if backend is None:
     st.error("❌ Unable to connect to Snowflake. Please check your connection.")
     st.stop()
 
+session = backend.session
+rerun_timer.lap("startup")
+
 # Customer configuration - COMPATIBLE WITH QUICKSTART
-DATABASE = session.get_current_database()
+DATABASE = backend.current_database()
 SCHEMA = "ANALYTICS"
 CUSTOMER_SCHEMA = f"SNOW_BEAR_DB.GOLD_LAYER"
 STAGE = "SEMANTIC_MODELS"
 
+# Shared data cache - one copy of each table for all viewers of the app
+DATA_CACHE_TTL_SECONDS = 15 * 60
+DATA_CACHE_MAX_BYTES = 512 * 1024 * 1024
+TABLE_VERSION_TTL_SECONDS = 60
+# Search results follow the service refresh (TARGET_LAG = '1 days'); without a version they expire on the data TTL
+SEARCH_CACHE_TTL_SECONDS = 24 * 60 * 60
+SEARCH_PAGE_SIZE = 10
+# The fallback search index is memory-mapped from here, one directory per scorecard version
+SEARCH_INDEX_DIR = os.path.join(tempfile.gettempdir(), "snow_bear_search_index")
+ANALYST_HISTORY_PAGE_SIZE = 5
+NARRATIVE_FIRST_TOKEN_TIMEOUT_SECONDS = 30
+NARRATIVE_TIMEOUT_SECONDS = 180
+NARRATIVE_CONTEXT_TOKENS = 1500
+# Profiler events are appended here when "Write telemetry to table" is on in the debug panel
+TELEMETRY_TABLE = "SNOW_BEAR_DB.ANALYTICS.APP_TELEMETRY"
+# Semantic model YAMLs change rarely; the stage is listed again after this or on "Reload models"
+SEMANTIC_MODEL_TTL_SECONDS = 10 * 60
+
 # Note: Data stored in SNOW_BEAR_DB schemas - hardcoded for quickstart compatibility
 
 # Note: Query tags removed due to Snowflake native Streamlit restrictions
@@ -207,49 +260,199 @@ st.markdown("""
 # Sidebar
 st.sidebar.title("🎯 Navigation")
 
-# Load data function with better error handling and no caching decorator
-def load_main_data():
-    """Load main data with error handling"""
+@st.cache_resource
+def get_data_cache():
+    """Process-wide cache shared by all browser sessions"""
+    cache = DataCache(max_bytes=DATA_CACHE_MAX_BYTES, default_ttl=DATA_CACHE_TTL_SECONDS)
+    cache.listener = get_profiler().cache_event
+    return cache
+
+data_cache = get_data_cache()
+
+@st.cache_resource
+def get_analyst_cache():
+    """Process-wide Cortex Analyst response and generated-SQL result cache"""
+    cache = sb_analyst.AnalystCache()
+    cache.cache.listener = get_profiler().cache_event
+    return cache
+
+analyst_cache = get_analyst_cache()
+
+@st.cache_resource
+def get_semantic_model_registry():
+    """Process-wide listing and validation results of the SEMANTIC_MODELS stage"""
+    return sb_semantic.SemanticModelRegistry(f"{CUSTOMER_SCHEMA}.{STAGE}", ttl=SEMANTIC_MODEL_TTL_SECONDS)
+
+semantic_models = get_semantic_model_registry()
+
+def get_table_version(table_name):
+    """Return the LAST_ALTERED timestamp of a gold layer table, used in cache keys"""
     try:
-        if not st.session_state.data_loaded or st.session_state.df is None:
-            with st.spinner("❄️ Loading Snow Bear fan data..."):
-                query = f"""
-                SELECT * FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD
-                ORDER BY REVIEW_DATE DESC
-                LIMIT 10000
-                """
-                df = session.sql(query).to_pandas()
-                st.session_state.df = df
-                st.session_state.data_loaded = True
-                
-        return st.session_state.df
+        return data_cache.get_or_load(
+            "table_version", table_name, lambda: backend.table_version("GOLD_LAYER", table_name), ttl=TABLE_VERSION_TTL_SECONDS
+        )
+    except Exception:
+        # Fall back to TTL-only expiry if the metadata query is not permitted
+        return None
+
+def get_semantic_model_hash(file_name):
+    """Return the stage MD5 of a semantic model YAML, used in Analyst cache keys"""
+    try:
+        model = semantic_models.get(backend, file_name)
+        return model.md5 if model else None
+    except Exception:
+        return None
+
+def get_search_version():
+    """Return the data_timestamp of the Cortex Search service, used in search cache keys"""
+    try:
+        return data_cache.get_or_load(
+            "table_version", ("search", sb_backend.SEARCH_SERVICE), backend.search_version, ttl=TABLE_VERSION_TTL_SECONDS
+        )
+    except Exception:
+        return None
+
+def run_search(search_term, columns=sb_backend.SEARCH_COLUMNS, limit=200, search_filter=None):
+    """Cortex Search results shared across sessions until the service refreshes"""
+    query = sb_backend.normalize_search_query(search_term)
+    version = get_search_version()
+    return data_cache.get_or_load(
+        "search", (query, tuple(columns), limit, json.dumps(search_filter, sort_keys=True), version),
+        lambda: backend.search(query, columns=columns, limit=limit, filter=search_filter),
+        ttl=SEARCH_CACHE_TTL_SECONDS if version is not None else None
+    )
+
+def open_search_index(version):
+    """Memory-mapped search index of a scorecard version - published by notebook step 5b, else built here once"""
+    def populate(path):
+        if not sb_search.download_index(backend, version, path):
+            sb_search.SearchIndex.from_frame(session.sql(sb_search.INDEX_QUERY).to_pandas()).save(path)
+    return sb_search.open_saved_index(SEARCH_INDEX_DIR, version, populate)
+
+def run_local_search(search_term, columns=sb_backend.SEARCH_COLUMNS, limit=200, search_filter=None):
+    """In-app BM25 search over the scorecard, used when Cortex Search is unavailable"""
+    version = get_table_version("QUALTRICS_SCORECARD")
+    index = data_cache.get_or_load("search_index", version, lambda: open_search_index(version))
+    doc_ids, _ = index.search(sb_backend.normalize_search_query(search_term), limit=limit, filter=search_filter)
+    return sb_backend.search_frame(index.rows(doc_ids, columns), columns)
+
+def stream_narrative(model, messages, temperature, max_tokens, stop_key, state_key=None):
+    """Render a Cortex Complete narrative as it streams and return the text received"""
+    st.button("⏹️ Stop", key=stop_key, help="Stop generating; the text received so far is kept")
+    stream = sb_narrative.NarrativeStream(
+        lambda: backend.complete_stream(model, messages, temperature, max_tokens),
+        first_token_timeout=NARRATIVE_FIRST_TOKEN_TIMEOUT_SECONDS,
+        total_timeout=NARRATIVE_TIMEOUT_SECONDS,
+    )
+
+    def chunks():
+        for chunk in stream:
+            # Keep partial text, so a Stop click (which reruns the script) still shows it
+            if state_key:
+                st.session_state[state_key] = stream.text
+            yield chunk
+
+    st.write_stream(chunks())
+    if stream.status == "error":
+        if isinstance(stream.error, ImportError) and not stream.text:
+            # Streaming needs snowflake-ml-python; fall back to the blocking COMPLETE call
+            text = backend.complete(model, messages, temperature=temperature, max_tokens=max_tokens)
+            st.markdown(text or "")
+            return text
+        raise stream.error
+    profiler.record(
+        "cortex", "complete_stream", stream.elapsed or 0.0, status=stream.status,
+        first_token_ms=None if stream.time_to_first_token is None else round(stream.time_to_first_token * 1000, 1),
+        characters=len(stream.text),
+    )
+    if stream.status == "timed_out":
+        st.warning(f"Narrative stopped after the {NARRATIVE_TIMEOUT_SECONDS if stream.text else NARRATIVE_FIRST_TOKEN_TIMEOUT_SECONDS} s timeout")
+    st.caption(stream.summary())
+    return stream.text
+
+# Load data functions with error handling - results are shared through the data cache
+def load_filter_options():
+    """Load sidebar filter options (date bounds, segments, themes) with error handling"""
+    try:
+        version = get_table_version("QUALTRICS_SCORECARD")
+        return data_cache.get_or_load("scorecard", ("filter_options", version), lambda: sb_data.load_filter_options(session))
     except Exception as e:
         st.error(f"Error loading main data: {str(e)}")
-        return pd.DataFrame()
+        return None
+
+def load_filtered_data(filters, columns, **query_options):
+    """Load only the rows and columns matching the sidebar filters, in compact dtypes"""
+    query, params = sb_data.build_filtered_query(filters, columns, **query_options)
+    version = get_table_version("QUALTRICS_SCORECARD")
+    return data_cache.get_or_load(
+        "scorecard", (query, tuple(params), version),
+        lambda: sb_data.compact_frame(session.sql(query, params=params).to_pandas())
+    )
 
-def load_themes_data():
-    """Load themes data with error handling"""
+def peek_filtered_data(filters, columns, **query_options):
+    """The frame load_filtered_data would return, if it is already cached - else None, without querying"""
+    query, params = sb_data.build_filtered_query(filters, columns, **query_options)
+    return data_cache.peek("scorecard", (query, tuple(params), get_table_version("QUALTRICS_SCORECARD")))
+
+def load_dashboard_data(filters):
+    """Filtered dashboard columns - loaded by the views that use them, not on every rerun"""
     try:
-        if st.session_state.themes_df is None:
-            query = f"""
-            SELECT * FROM SNOW_BEAR_DB.GOLD_LAYER.EXTRACTED_THEMES_STRUCTURED
-            ORDER BY THEME_NUMBER
-            LIMIT 5000
-            """
-            themes_df = session.sql(query).to_pandas()
-            st.session_state.themes_df = themes_df
-                
-        return st.session_state.themes_df
+        return load_filtered_data(filters, sb_data.TAB_COLUMNS["dashboard"])
     except Exception as e:
-        st.error(f"Error loading themes data: {str(e)}")
-        return pd.DataFrame()
+        st.error(f"Error filtering data: {str(e)}")
+        return pd.DataFrame(columns=sb_data.TAB_COLUMNS["dashboard"])
+
+def load_dashboard_rollup(filters):
+    """Rollup rows for the dashboard tiles - precomputed table when possible, else built from the filtered rows"""
+    if sb_data.rollup_supports(filters):
+        try:
+            version = get_table_version("QUALTRICS_SCORECARD_ROLLUP")
+            if version is not None:
+                rollup = data_cache.get_or_load("rollup", version, lambda: sb_data.load_rollup(session))
+                return sb_data.filter_rollup(rollup, filters)
+        except Exception:
+            # Rollup table not built yet - aggregate the filtered rows instead
+            pass
+    # Only this fallback reads the raw rows
+    return sb_data.build_rollup(load_dashboard_data(filters))
+
+def load_scatter_rows(filters, max_rows=1000, sample_rows=500):
+    """Rows for the Sentiment vs Score scatter - a COUNT(*) first, the rows only when under ``max_rows``"""
+    row_count = int(load_filtered_data(filters, ["COUNT(*) AS ROW_COUNT"], order_by=None).iloc[0, 0])
+    if row_count == 0 or row_count >= max_rows:
+        return None
+    return load_filtered_data(filters, sb_data.TAB_COLUMNS["dashboard"], limit=sample_rows)
+
+def load_quick_insights():
+    """Quick Insights lists - the notebook's snapshot table when built, else computed once per scorecard version"""
+    version = get_table_version("QUICK_INSIGHTS_SNAPSHOT")
+    if version is not None:
+        return data_cache.get_or_load(
+            "quick_insights", ("snapshot", version),
+            lambda: dict(sb_data.split_quick_insights(backend.queries.to_pandas("quick_insights_snapshot")), source="snapshot table")
+        )
+    # Snapshot not built yet - one grouped query, reused until the scorecard changes
+    return data_cache.get_or_load(
+        "quick_insights", ("scorecard", get_table_version("QUALTRICS_SCORECARD")),
+        lambda: dict(sb_data.split_quick_insights(backend.queries.to_pandas(
+            "quick_insights",
+            max_score=sb_data.QUICK_INSIGHTS_MAX_PAIN_SCORE,
+            min_score=sb_data.QUICK_INSIGHTS_MIN_HIGHLIGHT_SCORE,
+        )), source="computed in app")
+    )
+
+def quick_insights_caption(insights):
+    """'Last computed' line shown under a Quick Insights list"""
+    computed_at = insights["computed_at"]
+    when = f"{computed_at:%Y-%m-%d %H:%M}" if computed_at is not None else "unknown"
+    return f"Last computed {when} ({insights['source']})"
 
 # Load data
 try:
-    df = load_main_data()
-    themes_df = load_themes_data()
+    with st.spinner("❄️ Loading Snow Bear fan data..."):
+        filter_options = load_filter_options()
     
-    if df.empty:
+    if not filter_options or filter_options["row_count"] == 0:
         st.error("❌ No data available. Please ensure the basketball survey data has been loaded and processed.")
         st.info("💡 Setup Instructions:\n1. Upload basketball survey data to the SNOW_BEAR_DATA_STAGE\n2. Run the Snow Bear analytics notebook\n3. Refresh this app")
         st.stop()
@@ -264,8 +467,8 @@ st.sidebar.header("🔍 Filters")
 
 # Date range filter with validation
 try:
-    min_date = df['REVIEW_DATE'].min()
-    max_date = df['REVIEW_DATE'].max()
+    min_date = filter_options["min_date"]
+    max_date = filter_options["max_date"]
     
     if pd.isna(min_date) or pd.isna(max_date):
         min_date = datetime.now() - timedelta(days=30)
@@ -285,15 +488,17 @@ except Exception as e:
 # Handle single date selection
 if isinstance(date_range, tuple) and len(date_range) == 2:
     start_date, end_date = date_range
+elif isinstance(date_range, tuple) and len(date_range) == 1:
+    start_date = end_date = date_range[0]
 else:
-    start_date = end_date = date_range if hasattr(date_range, '__iter__') else date_range
+    start_date = end_date = date_range
 
 # Other filters with error handling
 try:
-    segments = df['SEGMENT'].dropna().unique().tolist()
+    segments = filter_options["segments"]
     selected_segments = st.sidebar.multiselect("Fan Segments", segments, default=segments[:5] if len(segments) > 5 else segments)
     
-    themes = df['MAIN_THEME'].dropna().unique().tolist()
+    themes = filter_options["themes"]
     selected_themes = st.sidebar.multiselect("Main Themes", themes)
     
     sentiment_range = st.sidebar.slider("Sentiment Range", -1.0, 1.0, (-1.0, 1.0), 0.1)
@@ -305,38 +510,35 @@ except Exception as e:
     sentiment_range = (-1.0, 1.0)
     score_range = (1, 5)
 
-# Filter data with error handling
-try:
-    filtered_df = df[
-        (df['SEGMENT'].isin(selected_segments) if selected_segments else True) &
-        (df['AGGREGATE_SENTIMENT'].between(sentiment_range[0], sentiment_range[1])) &
-        (df['AGGREGATE_SCORE'].between(score_range[0], score_range[1])) &
-        (df['REVIEW_DATE'] >= pd.to_datetime(start_date)) &
-        (df['REVIEW_DATE'] <= pd.to_datetime(end_date))
-    ]
-
-    if selected_themes:
-        filtered_df = filtered_df[filtered_df['MAIN_THEME'].isin(selected_themes)]
-        
-except Exception as e:
-    st.error(f"Error filtering data: {str(e)}")
-    filtered_df = df.copy()
+filters = sb_data.FilterState(
+    start_date=start_date,
+    end_date=end_date,
+    segments=tuple(selected_segments),
+    themes=tuple(selected_themes),
+    sentiment_range=tuple(sentiment_range),
+    score_range=tuple(score_range),
+)
 
-# Add data refresh button
+# Add data refresh button - reloads the shared tables for every viewer
 if st.sidebar.button("🔄 Refresh Data"):
-    st.session_state.data_loaded = False
-    st.session_state.df = None
-    st.session_state.themes_df = None
+    data_cache.invalidate("table_version", "scorecard", "rollup", "quick_insights", "search", "search_index")
+    analyst_cache.invalidate()
+    semantic_models.invalidate()
     st.rerun()
 
 # Clear cache button for troubleshooting
 if st.sidebar.button("🗑️ Clear Cache"):
+    data_cache.clear()
+    analyst_cache.invalidate()
+    semantic_models.invalidate()
     st.cache_data.clear()
     st.session_state.clear()
     st.success("Cache cleared! Please refresh the page.")
 
-# Tabs
-tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
+rerun_timer.lap("filters")
+
+# View selector - unlike st.tabs, only the selected view's code runs on a rerun
+VIEWS = [
     "📊 Executive Dashboard", 
     "👥 Fan Journey Explorer", 
     "💭 Sentiment Deep Dive", 
@@ -344,18 +546,61 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
     "🚀 Recommendation Engine",
     "🔍 Interactive Search",
     "🧠 AI Assistant"
-])
+]
+active_view = st.radio("View", VIEWS, horizontal=True, key="active_view", label_visibility="collapsed")
+
+VIEW_RENDERERS = {}
+view_timings = st.session_state.view_timings
+# Widgets inside a fragment rerun only that fragment, so view interactions skip the page setup
+view_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+def finish_profiled_run(timer):
+    """Log the run's summary line, and append its events to the telemetry table when enabled"""
+    summary = profiler.finish_run()
+    if st.session_state.get("telemetry_to_table"):
+        sb_telemetry.write_events(session.unwrapped, TELEMETRY_TABLE, timer.events)
+    return summary
+
+def view(name):
+    """Register the render function of a view; it runs as a fragment and records its render time"""
+    def register(render):
+        @functools.wraps(render)
+        def run():
+            # A fragment rerun skips the page script, whose run finished last time: profile it as a run of its own
+            fragment_timer = None
+            if profiler.current_run() is None:
+                fragment_timer = profiler.start_run(sb_telemetry.RerunTimer(), st.session_state.session_id)
+            started = time.perf_counter()
+            try:
+                render()
+            finally:
+                seconds = time.perf_counter() - started
+                view_timings.record(name, seconds)
+                profiler.record("view", name, seconds)
+                if fragment_timer is not None:
+                    fragment_timer.lap("view")
+                    try:
+                        # Shown in the debug panel on the next full rerun
+                        st.session_state.last_view_rerun = dict(finish_profiled_run(fragment_timer), view=name)
+                    except Exception as e:
+                        st.error(f"Error writing telemetry: {str(e)}")
+        VIEW_RENDERERS[name] = view_fragment(run) if view_fragment else run
+        return render
+    return register
 
 # Tab 1: Executive Dashboard with error handling
-with tab1:
+@view(VIEWS[0])
+def render_executive_dashboard():
     st.header("📊 Executive Dashboard")
+    dashboard_rollup = load_dashboard_rollup(filters)
     
     try:
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         
         # Check if we have data after filtering
-        if len(filtered_df) == 0:
+        overall = sb_data.rollup_metrics(dashboard_rollup).iloc[0]
+        if overall["FAN_COUNT"] == 0:
             st.warning("⚠️ No data matches your current filters. Please adjust your filter criteria.")
             
             # Show empty metrics
@@ -369,19 +614,19 @@ with tab1:
                 st.metric("Satisfaction Rate", "N/A", delta="No data")
         else:
             with col1:
-                avg_score = filtered_df['AGGREGATE_SCORE'].mean()
+                avg_score = overall["AVG_SCORE"]
                 st.metric("Average Fan Score", f"{avg_score:.1f}/5", delta=f"{avg_score-3:.1f} vs neutral")
             
             with col2:
-                avg_sentiment = filtered_df['AGGREGATE_SENTIMENT'].mean()
+                avg_sentiment = overall["AVG_SENTIMENT"]
                 st.metric("Average Sentiment", f"{avg_sentiment:.2f}", delta=f"{avg_sentiment:.2f} vs neutral")
             
             with col3:
-                total_fans = len(filtered_df)
+                total_fans = int(overall["FAN_COUNT"])
                 st.metric("Total Fans", f"{total_fans:,}", delta=f"{total_fans}")
             
             with col4:
-                satisfaction_rate = len(filtered_df[filtered_df['AGGREGATE_SCORE'] >= 4]) / len(filtered_df) * 100
+                satisfaction_rate = overall["SATISFACTION_PCT"]
                 st.metric("Satisfaction Rate", f"{satisfaction_rate:.1f}%", delta=f"{satisfaction_rate-70:.1f}% vs target")
         
         # Visualizations with error handling
@@ -389,50 +634,27 @@ with tab1:
         
         with col1:
             st.subheader("📈 Fan Score Distribution")
-            if not filtered_df.empty:
-                score_counts = filtered_df['AGGREGATE_SCORE'].value_counts().sort_index()
-                score_df = pd.DataFrame({'Score': score_counts.index, 'Count': score_counts.values})
-                
-                chart = alt.Chart(score_df).mark_bar(color='#29B5E8').encode(
-                    x=alt.X('Score:O', title='Score'),
-                    y=alt.Y('Count:Q', title='Number of Fans'),
-                    tooltip=['Score', 'Count']
-                ).properties(
-                    title='Fan Satisfaction Scores',
-                    width=300,
-                    height=250
-                )
-                st.altair_chart(chart, use_container_width=True)
+            if not dashboard_rollup.empty:
+                score_counts = sb_data.rollup_metrics(dashboard_rollup, by='AGGREGATE_SCORE')['FAN_COUNT'].sort_index()
+                st.altair_chart(sb_charts.score_distribution_chart(score_counts), use_container_width=True)
             else:
                 st.info("No data to display")
         
         with col2:
             st.subheader("🎯 Sentiment vs Score")
-            if not filtered_df.empty and len(filtered_df) < 1000:  # Limit data size for performance
-                scatter_chart = alt.Chart(filtered_df.head(500)).mark_circle(size=60).encode(
-                    x=alt.X('AGGREGATE_SENTIMENT:Q', title='Sentiment'),
-                    y=alt.Y('AGGREGATE_SCORE:Q', title='Score'),
-                    color=alt.Color('SEGMENT:N', title='Segment'),
-                    tooltip=['SEGMENT', 'MAIN_THEME', 'SECONDARY_THEME', 'AGGREGATE_SENTIMENT', 'AGGREGATE_SCORE']
-                ).properties(
-                    title='Sentiment vs Satisfaction Score',
-                    width=300,
-                    height=250
-                )
-                st.altair_chart(scatter_chart, use_container_width=True)
+            scatter_rows = load_scatter_rows(filters)  # Limit data size for performance
+            if scatter_rows is not None:
+                st.altair_chart(sb_charts.sentiment_score_scatter(scatter_rows), use_container_width=True)
             else:
                 st.info("Chart not available - too much data or no data to display")
         
         # Segment breakdown
         st.subheader("👥 Fan Segment Analysis")
-        if not filtered_df.empty:
-            segment_analysis = filtered_df.groupby('SEGMENT').agg({
-                'AGGREGATE_SCORE': 'mean',
-                'AGGREGATE_SENTIMENT': 'mean',
-                'ID': 'count'
-            }).round(2)
+        if not dashboard_rollup.empty:
+            segment_metrics = sb_data.rollup_metrics(dashboard_rollup, by='SEGMENT')
+            segment_analysis = segment_metrics[['AVG_SCORE', 'AVG_SENTIMENT', 'FAN_COUNT']].round(2)
             segment_analysis.columns = ['Avg Score', 'Avg Sentiment', 'Fan Count']
-            segment_analysis['Satisfaction %'] = (filtered_df.groupby('SEGMENT')['AGGREGATE_SCORE'].apply(lambda x: (x >= 4).mean() * 100)).round(1)
+            segment_analysis['Satisfaction %'] = segment_metrics['SATISFACTION_PCT'].round(1)
             
             st.dataframe(segment_analysis, use_container_width=True)
         else:
@@ -443,8 +665,10 @@ with tab1:
         st.info("💡 Try refreshing the data or adjusting your filters.")
 
 # Tab 2: Fan Journey Explorer with better error handling
-with tab2:
+@view(VIEWS[1])
+def render_fan_journey():
     st.header("👥 Fan Journey Explorer")
+    filtered_df = load_dashboard_data(filters)
     
     try:
         # Check if we have fans in filtered data
@@ -455,8 +679,8 @@ with tab2:
             available_fans = filtered_df['ID'].unique()[:100]  # Limit to first 100 for performance
             selected_fan = st.selectbox("Select a Fan to Explore", available_fans)
             
-            # Get fan data safely
-            fan_matches = filtered_df[filtered_df['ID'] == selected_fan]
+            # Get fan data safely - full row is fetched only for the selected fan
+            fan_matches = sb_data.load_fan_details(session, selected_fan)
             if len(fan_matches) == 0:
                 st.error("Selected fan not found in filtered data. Please select a different fan.")
             else:
@@ -566,8 +790,10 @@ with tab2:
         st.info("💡 Try selecting a different fan or refreshing the data.")
 
 # Tab 3: Sentiment Deep Dive with error handling
-with tab3:
+@view(VIEWS[2])
+def render_sentiment_deep_dive():
     st.header("💭 Sentiment Deep Dive")
+    filtered_df = load_dashboard_data(filters)
     
     try:
         if filtered_df.empty:
@@ -582,23 +808,9 @@ with tab3:
                              'SEAT_LOCATION_SENTIMENT', 'STADIUM_ACCESS_SENTIMENT'] if col in filtered_df.columns]
             
             if sentiment_cols:
-                sentiment_data = filtered_df[sentiment_cols].mean().to_frame('Average Sentiment')
+                sentiment_data = sb_metrics.group_metrics(filtered_df, category_cols=sentiment_cols)[sentiment_cols].iloc[0].to_frame('Average Sentiment')
                 sentiment_data.index = [col.replace('_SENTIMENT', '').replace('_', ' ').title() for col in sentiment_cols]
-                
-                # Convert to DataFrame for altair
-                sentiment_chart_df = sentiment_data.reset_index()
-                sentiment_chart_df.columns = ['Category', 'Average_Sentiment']
-                
-                sentiment_bar = alt.Chart(sentiment_chart_df).mark_bar().encode(
-                    x=alt.X('Category:N', title='Category'),
-                    y=alt.Y('Average_Sentiment:Q', title='Average Sentiment'),
-                    color=alt.Color('Average_Sentiment:Q', scale=alt.Scale(scheme='blues'), title='Sentiment'),
-                    tooltip=['Category', 'Average_Sentiment']
-                ).properties(
-                    title='Average Sentiment by Category',
-                    height=300
-                )
-                st.altair_chart(sentiment_bar, use_container_width=True)
+                st.altair_chart(sb_charts.category_sentiment_chart(sentiment_data), use_container_width=True)
             
             # Sentiment over time and distribution
             col1, col2 = st.columns(2)
@@ -606,18 +818,10 @@ with tab3:
             with col1:
                 st.subheader("📅 Sentiment Trends")
                 if 'REVIEW_DATE' in filtered_df.columns:
-                    daily_sentiment = filtered_df.groupby('REVIEW_DATE')['AGGREGATE_SENTIMENT'].mean().reset_index()
+                    daily_sentiment = sb_metrics.group_metrics(filtered_df, 'REVIEW_DATE')['AVG_SENTIMENT'].rename('AGGREGATE_SENTIMENT').reset_index()
                     
                     if not daily_sentiment.empty and len(daily_sentiment) > 1:
-                        trend_chart = alt.Chart(daily_sentiment).mark_line(color='#29B5E8').encode(
-                            x=alt.X('REVIEW_DATE:T', title='Date'),
-                            y=alt.Y('AGGREGATE_SENTIMENT:Q', title='Average Sentiment'),
-                            tooltip=['REVIEW_DATE', 'AGGREGATE_SENTIMENT']
-                        ).properties(
-                            title='Daily Sentiment Trends',
-                            height=250
-                        )
-                        st.altair_chart(trend_chart, use_container_width=True)
+                        st.altair_chart(sb_charts.sentiment_trend_chart(daily_sentiment), use_container_width=True)
                     else:
                         st.info("Not enough data for trend analysis")
                 else:
@@ -625,20 +829,12 @@ with tab3:
             
             with col2:
                 st.subheader("🎯 Sentiment Distribution")
-                hist_chart = alt.Chart(filtered_df.head(1000)).mark_bar(color='#29B5E8').encode(
-                    alt.X('AGGREGATE_SENTIMENT:Q', bin=alt.Bin(maxbins=20), title='Sentiment'),
-                    y=alt.Y('count()', title='Count'),
-                    tooltip=['count()']
-                ).properties(
-                    title='Sentiment Distribution',
-                    height=250
-                )
-                st.altair_chart(hist_chart, use_container_width=True)
+                st.altair_chart(sb_charts.sentiment_histogram(filtered_df.head(1000)), use_container_width=True)
             
             # Sentiment by segment - simplified as table
             st.subheader("👥 Sentiment by Segment")
             if sentiment_cols:
-                segment_sentiment = filtered_df.groupby('SEGMENT')[sentiment_cols].mean().round(2)
+                segment_sentiment = sb_metrics.group_metrics(filtered_df, 'SEGMENT', category_cols=sentiment_cols)[sentiment_cols].round(2)
                 st.dataframe(segment_sentiment, use_container_width=True)
             else:
                 st.info("Sentiment columns not available")
@@ -649,67 +845,51 @@ with tab3:
 
 # Continue with simplified versions of remaining tabs...
 # Tab 4: Theme & Segment Analysis
-with tab4:
+@view(VIEWS[3])
+def render_theme_segment_analysis():
     st.header("🎯 Theme & Segment Analysis")
+    dashboard_rollup = load_dashboard_rollup(filters)
     
     try:
-        if filtered_df.empty:
+        if sb_data.rollup_metrics(dashboard_rollup).iloc[0]["FAN_COUNT"] == 0:
             st.warning("⚠️ No data available for analysis. Please adjust your filters.")
         else:
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("🏷️ Theme Distribution")
-                if 'MAIN_THEME' in filtered_df.columns:
-                    theme_counts = filtered_df['MAIN_THEME'].value_counts().head(10)
+                if not dashboard_rollup.empty:
+                    theme_counts = sb_data.rollup_metrics(dashboard_rollup, by='MAIN_THEME')['FAN_COUNT'].sort_values(ascending=False).head(10)
                     
                     if not theme_counts.empty:
-                        theme_df = pd.DataFrame({'Theme': theme_counts.index, 'Count': theme_counts.values})
-                        theme_chart = alt.Chart(theme_df).mark_bar(color='#29B5E8').encode(
-                            x=alt.X('Count:Q', title='Count'),
-                            y=alt.Y('Theme:N', sort='-x', title='Theme'),
-                            tooltip=['Theme', 'Count']
-                        ).properties(
-                            title='Primary Themes Distribution',
-                            height=300
-                        )
+                        theme_chart = sb_charts.ranked_count_chart(theme_counts, 'Theme', 'Primary Themes Distribution')
                         st.altair_chart(theme_chart, use_container_width=True)
                     else:
                         st.info("No theme data available")
                 else:
-                    st.info("Theme column not available")
+                    st.info("No theme data available")
             
             with col2:
                 st.subheader("👥 Segment Distribution")
-                if 'SEGMENT' in filtered_df.columns:
-                    segment_counts = filtered_df['SEGMENT'].value_counts().head(10)
+                if not dashboard_rollup.empty:
+                    segment_counts = sb_data.rollup_metrics(dashboard_rollup, by='SEGMENT')['FAN_COUNT'].sort_values(ascending=False).head(10)
                     
                     if not segment_counts.empty:
-                        segment_df = pd.DataFrame({'Segment': segment_counts.index, 'Count': segment_counts.values})
-                        segment_chart = alt.Chart(segment_df).mark_bar(color='#1E3A8A').encode(
-                            x=alt.X('Count:Q', title='Count'),
-                            y=alt.Y('Segment:N', sort='-x', title='Segment'),
-                            tooltip=['Segment', 'Count']
-                        ).properties(
-                            title='Fan Segments Distribution',
-                            height=300
-                        )
+                        segment_chart = sb_charts.ranked_count_chart(segment_counts, 'Segment', 'Fan Segments Distribution', sb_charts.NAVY)
                         st.altair_chart(segment_chart, use_container_width=True)
                     else:
                         st.info("No segment data available")
                 else:
-                    st.info("Segment column not available")
+                    st.info("No segment data available")
             
             # Theme analysis
             st.subheader("📊 Theme Performance Analysis")
-            if 'MAIN_THEME' in filtered_df.columns and not filtered_df.empty:
-                theme_analysis = filtered_df.groupby('MAIN_THEME').agg({
-                    'AGGREGATE_SCORE': ['mean', 'count'],
-                    'AGGREGATE_SENTIMENT': 'mean'
-                }).round(2)
+            if not dashboard_rollup.empty:
+                theme_metrics = sb_data.rollup_metrics(dashboard_rollup, by='MAIN_THEME')
+                theme_analysis = theme_metrics[['AVG_SCORE', 'FAN_COUNT', 'AVG_SENTIMENT']].round(2)
                 
                 theme_analysis.columns = ['Avg Score', 'Count', 'Avg Sentiment']
-                theme_analysis['Satisfaction Rate %'] = (filtered_df.groupby('MAIN_THEME')['AGGREGATE_SCORE'].apply(lambda x: (x >= 4).mean() * 100)).round(1)
+                theme_analysis['Satisfaction Rate %'] = theme_metrics['SATISFACTION_PCT'].round(1)
                 
                 st.dataframe(theme_analysis.sort_values('Avg Score', ascending=False).head(10), use_container_width=True)
             else:
@@ -720,30 +900,34 @@ with tab4:
         st.info("💡 Try adjusting your filters or refreshing the data.")
 
 # Simplified remaining tabs for performance and stability
-with tab5:
+@view(VIEWS[4])
+def render_recommendation_engine():
     st.header("🚀 Recommendation Engine")
     st.info("💡 Recommendation engine simplified for better performance")
     
     try:
-        if not filtered_df.empty:
-            # Simple recommendation analysis
-            if 'BUSINESS_RECOMMENDATION' in filtered_df.columns:
-                business_recs = filtered_df['BUSINESS_RECOMMENDATION'].dropna()
-                st.metric("Business Recommendations Available", len(business_recs))
-                
-                if not business_recs.empty:
-                    st.subheader("📝 Sample Business Recommendations")
-                    for i, rec in enumerate(business_recs.head(3).values):
-                        with st.expander(f"Recommendation #{i+1}"):
-                            st.write(rec)
+        # Simple recommendation analysis - count in the warehouse, fetch only the samples shown
+        rec_conditions = ["BUSINESS_RECOMMENDATION IS NOT NULL"]
+        rec_count = int(load_filtered_data(filters, ["COUNT(*) AS ROW_COUNT"], extra_conditions=rec_conditions, order_by=None).iloc[0, 0])
+        # No recommendations: tell an empty filter selection apart from rows still waiting for step 5
+        if rec_count == 0 and int(load_filtered_data(filters, ["COUNT(*) AS ROW_COUNT"], order_by=None).iloc[0, 0]) == 0:
+            st.warning("No data available. Please adjust your filters.")
+        else:
+            st.metric("Business Recommendations Available", rec_count)
+            
+            if rec_count:
+                business_recs = load_filtered_data(filters, sb_data.TAB_COLUMNS["recommendations"], extra_conditions=rec_conditions, limit=3)
+                st.subheader("📝 Sample Business Recommendations")
+                for i, rec in enumerate(business_recs['BUSINESS_RECOMMENDATION'].values):
+                    with st.expander(f"Recommendation #{i+1}"):
+                        st.write(rec)
             else:
                 st.info("No recommendation data available")
-        else:
-            st.warning("No data available. Please adjust your filters.")
     except Exception as e:
         st.error(f"Error in Recommendation Engine: {str(e)}")
 
-with tab6:
+@view(VIEWS[5])
+def render_interactive_search():
     st.header("🔍 Interactive Search & Explore")
     
     try:
@@ -752,72 +936,62 @@ with tab6:
             search_term = st.text_input("🔍 Search fan comments with AI", placeholder="e.g., 'game experience', 'parking issues', 'food quality'")
             search_submitted = st.form_submit_button("🔍 AI Search")
         
+        # Keep the last query across reruns so the result pages can be browsed
         if search_submitted and search_term:
+            st.session_state.search_query = search_term
+            st.session_state.search_page = 1
+        search_term = st.session_state.search_query
+        
+        if search_term:
             with st.spinner("🤖 AI-powered search analyzing fan comments..."):
                 try:
                     # Use the SNOWBEAR_SEARCH_ANALYSIS Cortex Search Service - Updated for DataOps
-                    search_query = f"""
-                    WITH search_results AS (
-                        SELECT SNOWFLAKE.CORTEX.SEARCH_PREVIEW(
-                            'SNOW_BEAR_DB.ANALYTICS.SNOWBEAR_SEARCH_ANALYSIS',
-                            '{{
-                                "query": "{search_term}",
-                                "columns":[
-                                    "aggregate_comment",
-                                    "aggregate_score",
-                                    "segment",
-                                    "segment_alt",
-                                    "main_theme",
-                                    "secondary_theme",
-                                    "game_experience_score",
-                                    "overall_event_score",
-                                    "parking_score",
-                                    "food_offering_score",
-                                    "id"
-                                ],
-                                "limit": 200
-                            }}'
-                        ) as search_result
-                    )
-                    SELECT 
-                        result.value:aggregate_comment::string as aggregate_comment,
-                        result.value:aggregate_score::string as aggregate_score,
-                        result.value:segment::string as segment,
-                        result.value:segment_alt::string as segment_alt,
-                        result.value:main_theme::string as main_theme,
-                        result.value:secondary_theme::string as secondary_theme,
-                        result.value:game_experience_score::string as game_experience_score,
-                        result.value:overall_event_score::string as overall_event_score,
-                        result.value:parking_score::string as parking_score,
-                        result.value:food_offering_score::string as food_offering_score,
-                        result.value:id::string as fan_id,
-                        result.index + 1 as relevance_rank
-                    FROM search_results,
-                    LATERAL FLATTEN(input => PARSE_JSON(search_results.search_result):results) as result
-                    ORDER BY result.index
-                    """
-                    
-                    search_results_df = session.sql(search_query).to_pandas()
+                    # Sidebar filters are applied by the search service, before the top 200 are picked
+                    search_filter = sb_data.search_filter(filters)
+                    try:
+                        search_results_df = run_search(search_term, limit=200, search_filter=search_filter)
+                    except Exception as e:
+                        st.warning(f"Cortex Search unavailable ({str(e)}) - using the in-app search index")
+                        search_results_df = run_local_search(search_term, limit=200, search_filter=search_filter)
                     
                     if not search_results_df.empty:
                         st.success(f"🎯 Found {len(search_results_df)} AI-powered results for '{search_term}'")
+                        st.caption(f"Filtered by the sidebar: {start_date} to {end_date}, {len(selected_segments) or 'all'} segments, {len(selected_themes) or 'all'} themes, score {score_range[0]}-{score_range[1]}")
+                        search_stats = data_cache.stats()["namespaces"].get("search", {})
+                        st.caption(f"Search cache hit rate: {search_stats.get('hit_rate', 0.0):.0%} ({search_stats.get('entries', 0)} cached queries)")
                         
-                        # Show search insights
+                        # Show search insights - computed over the full hit set, not just the visible page
                         col1, col2, col3 = st.columns(3)
                         with col1:
                             avg_score = pd.to_numeric(search_results_df['AGGREGATE_SCORE'], errors='coerce').mean()
                             st.metric("Avg Score", f"{avg_score:.1f}/5" if not pd.isna(avg_score) else "N/A")
                         with col2:
-                            top_theme = search_results_df['MAIN_THEME'].mode().iloc[0] if not search_results_df['MAIN_THEME'].empty else "N/A"
+                            top_theme = search_results_df['MAIN_THEME'].mode().iloc[0] if not search_results_df['MAIN_THEME'].dropna().empty else "N/A"
                             st.metric("Top Theme", top_theme)
                         with col3:
-                            top_segment = search_results_df['SEGMENT'].mode().iloc[0] if not search_results_df['SEGMENT'].empty else "N/A"
+                            top_segment = search_results_df['SEGMENT'].mode().iloc[0] if not search_results_df['SEGMENT'].dropna().empty else "N/A"
                             st.metric("Top Segment", top_segment)
                         
                         st.markdown("---")
                         
+                        # Only the current page of results is rendered as widgets
+                        page_count = max(1, -(-len(search_results_df) // SEARCH_PAGE_SIZE))
+                        page = min(max(1, st.session_state.search_page), page_count)
+                        page_cols = st.columns([1, 2, 1])
+                        with page_cols[0]:
+                            if st.button("◀ Previous", key="search_prev", disabled=page <= 1):
+                                page -= 1
+                        with page_cols[2]:
+                            if st.button("Next ▶", key="search_next", disabled=page >= page_count):
+                                page += 1
+                        st.session_state.search_page = page
+                        first = (page - 1) * SEARCH_PAGE_SIZE
+                        page_df = search_results_df.iloc[first:first + SEARCH_PAGE_SIZE]
+                        with page_cols[1]:
+                            st.markdown(f"Showing results {first + 1}-{first + len(page_df)} of {len(search_results_df)} (page {page} of {page_count})")
+                        
                         # Display results with better formatting
-                        for idx, row in search_results_df.iterrows():
+                        for idx, row in page_df.iterrows():
                             with st.expander(f"🏀 Fan {row.get('FAN_ID', 'Unknown')} - {row.get('SEGMENT', 'Unknown')} - Score: {row.get('AGGREGATE_SCORE', 'N/A')}/5 (Rank #{row.get('RELEVANCE_RANK', idx+1)})"):
                                 
                                 # Comment section
@@ -872,18 +1046,18 @@ with tab6:
                     
                     # Fallback to basic search
                     st.markdown("### 🔄 Falling back to basic search...")
-                    if not filtered_df.empty and 'AGGREGATE_COMMENT' in filtered_df.columns:
-                        basic_results = filtered_df[
-                            filtered_df['AGGREGATE_COMMENT'].str.contains(search_term, case=False, na=False)
-                        ]
-                        
-                        if not basic_results.empty:
-                            st.info(f"Found {len(basic_results)} basic results")
-                            for idx, row in basic_results.head(3).iterrows():
-                                with st.expander(f"Fan {row.get('ID', 'Unknown')} - Basic Result"):
-                                    st.markdown(f"**Comment:** {row.get('AGGREGATE_COMMENT', 'No comment')}")
-                        else:
-                            st.info("No basic results found either.")
+                    match_conditions = ["LOWER(AGGREGATE_COMMENT) LIKE ? ESCAPE '!'"]
+                    match_params = [sb_data.like_pattern(search_term)]
+                    match_count = int(load_filtered_data(filters, ["COUNT(*) AS ROW_COUNT"], extra_conditions=match_conditions, extra_params=match_params, order_by=None).iloc[0, 0])
+                    
+                    if match_count:
+                        basic_results = load_filtered_data(filters, sb_data.TAB_COLUMNS["search_fallback"], extra_conditions=match_conditions, extra_params=match_params, limit=3)
+                        st.info(f"Found {match_count} basic results")
+                        for idx, row in basic_results.iterrows():
+                            with st.expander(f"Fan {row.get('ID', 'Unknown')} - Basic Result"):
+                                st.markdown(f"**Comment:** {row.get('AGGREGATE_COMMENT', 'No comment')}")
+                    else:
+                        st.info("No basic results found either.")
         
         # Quick search buttons
         st.markdown("### ⚡ Quick Searches")
@@ -914,54 +1088,49 @@ with tab6:
         prompt_cc = st.text_area("Optional question for the AI about these results (leave blank for general analysis)", value="", height=80, key="sb_cc_prompt")
         if st.button("Generate Narrative", key="sb_cc_run"):
             try:
-                sample = json.loads(st.session_state["sb_last_df"].head(50).to_json(orient="records", date_format="iso") )
-                context_obj = {
-                    "columns": list(st.session_state["sb_last_df"].columns),
-                    "row_count": int(len(st.session_state["sb_last_df"])),
-                    "sample_rows": sample,
-                    "original_sql": st.session_state.get("sb_last_sql", "")
-                }
-                context_json = json.dumps(context_obj, ensure_ascii=False).replace("'","''")
-                user_text = (prompt_cc or "Provide an executive-style analysis: key trends, outliers, comparisons, and recommended next steps. Use bullet points where helpful.").replace("'","''")
-                cc_sql = f"""
-                SELECT SNOWFLAKE.CORTEX.COMPLETE(
-                    '{cc_model}',
+                # Column stats, top categories, a stratified sample and trends - not the first 50 rows
+                context_obj = sb_narrative.build_context(
+                    st.session_state["sb_last_df"], st.session_state.get("sb_last_sql", ""), token_budget=NARRATIVE_CONTEXT_TOKENS
+                )
+                context_json = sb_narrative.context_json(context_obj)
+                st.caption(f"Prompt context: about {context_obj['estimated_tokens']:,} tokens for {context_obj['row_count']:,} result rows")
+                user_text = prompt_cc or "Provide an executive-style analysis: key trends, outliers, comparisons, and recommended next steps. Use bullet points where helpful."
+                narrative_response = stream_narrative(
+                    cc_model,
                     [
-                        {{'role':'system','content':'You are a senior data analyst. Be concise and insightful.'}},
-                        {{'role':'user','content':'Context JSON: {context_json}\n\nQuestion: {user_text}'}}
+                        {'role': 'system', 'content': 'You are a senior data analyst. Be concise and insightful.'},
+                        {'role': 'user', 'content': f'Context JSON: {context_json}\n\nQuestion: {user_text}'}
                     ],
-                    {{'temperature': {cc_temp}, 'max_tokens': {int(cc_tokens)}}}
-                ):choices[0]:messages::string AS AI_RESPONSE
-                """
-                cc_df = session.sql(cc_sql).to_pandas()
-                if not cc_df.empty:
-                    st.markdown(cc_df.iloc[0]["AI_RESPONSE"])
-                else:
+                    cc_temp,
+                    int(cc_tokens),
+                    stop_key="sb_cc_stop",
+                )
+                if not narrative_response:
                     st.info("No AI response.")
             except Exception as e:
                 st.error(f"Cortex Complete error: {e}")
 
 # Tab 7: AI Assistant
-with tab7:
+@view(VIEWS[6])
+def render_ai_assistant():
     st.header("🧠 AI Assistant - Cortex Analyst")
     st.markdown("*Ask questions about your fan data in natural language*")
     
-    # Get available semantic models
-    cmd = f"""ls @{CUSTOMER_SCHEMA}.{STAGE}"""
+    # Get available semantic models - listed and validated once per TTL for all sessions
     try:
-        semantic_files = session.sql(cmd).collect()
-        list_files = []
-        for semantic_file in semantic_files:
-            filename = semantic_file["name"]
-            # Remove stage name prefix if present (e.g., "semantic_models/file.yaml" -> "file.yaml")
-            if "/" in filename:
-                filename = filename.split("/")[-1]
-            # Only include YAML files to avoid "Invalid semantic model yaml" errors
-            if filename.lower().endswith(('.yaml', '.yml')):
-                list_files.append(filename)
+        models = semantic_models.models(backend)
+        list_files = [model.name for model in models if model.valid]
+        invalid_models = [model for model in models if not model.valid]
+        if invalid_models:
+            # Rejected locally, so a broken YAML never costs an Analyst round trip
+            with st.expander(f"⚠️ {len(invalid_models)} semantic model(s) failed validation and are hidden"):
+                for model in invalid_models:
+                    st.markdown(f"**{model.name}** (modified {model.last_modified})")
+                    for error in model.errors:
+                        st.markdown(f"- {error}")
         
         if not list_files:
-            st.error("No semantic models found in the stage. Please create semantic models first.")
+            st.error("No valid semantic models found in the stage. Please create semantic models first.")
             st.stop()
     except Exception as e:
         st.error(f"Error accessing semantic models: {e}")
@@ -980,12 +1149,21 @@ with tab7:
     if FILE != st.session_state.selected_semantic_model:
         st.session_state.selected_semantic_model = FILE
         # Clear chat history when semantic model changes
-        if "analyst_messages" in st.session_state:
-            st.session_state.analyst_messages = []
+        if "analyst_conversation" in st.session_state:
+            st.session_state.analyst_conversation.clear()
         st.success(f"✅ Semantic model changed to: {FILE}")
         st.info("💡 Chat history cleared. You can now ask questions using the new semantic model.")
     
     st.info(f"Using semantic model: `{FILE}`")
+    model_cols = st.columns([3, 1])
+    with model_cols[0]:
+        listed_ago = semantic_models.listed_seconds_ago()
+        if listed_ago is not None:
+            st.caption(f"{len(list_files)} semantic models, stage listed {listed_ago / 60:.0f} min ago (refreshes every {SEMANTIC_MODEL_TTL_SECONDS // 60} min)")
+    with model_cols[1]:
+        if st.button("🔄 Reload models", key="reload_semantic_models"):
+            semantic_models.invalidate()
+            st.rerun()
     
     # Cortex Analyst Integration
     with st.form("analyst_form"):
@@ -1014,45 +1192,21 @@ with tab7:
         
         analyst_submitted = st.form_submit_button("🤖 Ask AI Assistant")
     
-    # Initialize chat history for this tab
-    if "analyst_messages" not in st.session_state:
-        st.session_state.analyst_messages = []
+    # Initialize chat history for this tab - bounded, and only a token-budgeted window is sent back to Analyst
+    if "analyst_conversation" not in st.session_state:
+        st.session_state.analyst_conversation = sb_analyst.Conversation()
+    conversation = st.session_state.analyst_conversation
     
     # Helper function to call Cortex Analyst API
     def send_analyst_message(prompt: str, semantic_model: str) -> dict:
-        """Send a message to Cortex Analyst API and return the response."""
+        """Send a message, with recent turns as context, to Cortex Analyst API and return the response (cached per model version)."""
         try:
-            import _snowflake
-            
-            request_body = {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                "semantic_model_file": semantic_model,
-            }
-            
-            resp = _snowflake.send_snow_api_request(
-                "POST",
-                f"/api/v2/cortex/analyst/message",
-                {},
-                {},
-                request_body,
-                {},
-                30000,
+            messages = conversation.request(prompt)
+            return analyst_cache.response(
+                semantic_model, get_semantic_model_hash(FILE), prompt,
+                lambda: backend.analyst_message(messages, semantic_model, timeout_ms=30000),
+                context=(conversation.context_key(),)
             )
-            
-            if resp["status"] < 400:
-                return json.loads(resp["content"])
-            else:
-                raise Exception(f"API request failed with status {resp['status']}: {resp}")
                 
         except Exception as e:
             st.error(f"Error calling Cortex Analyst API: {e}")
@@ -1071,14 +1225,8 @@ with tab7:
                     content = response["message"]["content"]
                     
                     # Add to chat history
-                    st.session_state.analyst_messages.append({
-                        "role": "user", 
-                        "content": [{"type": "text", "text": analyst_query}]
-                    })
-                    st.session_state.analyst_messages.append({
-                        "role": "assistant", 
-                        "content": content
-                    })
+                    conversation.add(analyst_query, content)
+                    st.session_state.analyst_history_page = 1
                     
                     # Store latest response for persistence
                     st.session_state["latest_analyst_response"] = content
@@ -1116,9 +1264,13 @@ with tab7:
                 if analyst_submitted and analyst_query:
                     with st.spinner("Executing generated SQL..."):
                         try:
-                            results_df = session.sql(generated_sql.strip(";")).to_pandas()
+                            # Identical generated SQL is served from the Analyst result cache
+                            results_df = analyst_cache.sql_result(
+                                generated_sql, get_semantic_model_hash(FILE), get_table_version("QUALTRICS_SCORECARD"),
+                                lambda statement: session.sql(statement).to_pandas()
+                            )
                             # Persist for explore section below
-                            st.session_state["sb_last_sql"] = generated_sql.strip(";")
+                            st.session_state["sb_last_sql"] = generated_sql
                             st.session_state["sb_last_df"] = results_df
                             if not results_df.empty:
                                 st.session_state["sql_success_message"] = f"✅ Query executed successfully! {len(results_df)} rows. See 'Explore Result' below for charts and data."
@@ -1279,30 +1431,26 @@ with tab7:
         prompt_cc = st.text_area("Optional question for the AI about these results (leave blank for general analysis)", value="", height=80, key="sb_cc_prompt_tab7")
         if st.button("Generate Narrative", key="sb_cc_run_tab7"):
             try:
-                sample = json.loads(st.session_state["sb_last_df"].head(50).to_json(orient="records", date_format="iso") )
-                context_obj = {
-                    "columns": list(st.session_state["sb_last_df"].columns),
-                    "row_count": int(len(st.session_state["sb_last_df"])),
-                    "sample_rows": sample,
-                    "original_sql": st.session_state.get("sb_last_sql", "")
-                }
-                context_json = json.dumps(context_obj, ensure_ascii=False).replace("'","''")
-                user_text = (prompt_cc or "Provide an executive-style analysis: key trends, outliers, comparisons, and recommended next steps. Use bullet points where helpful.").replace("'","''")
-                cc_sql = f"""
-                SELECT SNOWFLAKE.CORTEX.COMPLETE(
-                    '{cc_model}',
+                # Column stats, top categories, a stratified sample and trends - not the first 50 rows
+                context_obj = sb_narrative.build_context(
+                    st.session_state["sb_last_df"], st.session_state.get("sb_last_sql", ""), token_budget=NARRATIVE_CONTEXT_TOKENS
+                )
+                context_json = sb_narrative.context_json(context_obj)
+                st.caption(f"Prompt context: about {context_obj['estimated_tokens']:,} tokens for {context_obj['row_count']:,} result rows")
+                user_text = prompt_cc or "Provide an executive-style analysis: key trends, outliers, comparisons, and recommended next steps. Use bullet points where helpful."
+                narrative_response = stream_narrative(
+                    cc_model,
                     [
-                        {{'role':'system','content':'You are a senior data analyst. Be concise and insightful.'}},
-                        {{'role':'user','content':'Context JSON: {context_json}\n\nQuestion: {user_text}'}}
+                        {'role': 'system', 'content': 'You are a senior data analyst. Be concise and insightful.'},
+                        {'role': 'user', 'content': f'Context JSON: {context_json}\n\nQuestion: {user_text}'}
                     ],
-                    {{'temperature': {cc_temp}, 'max_tokens': {int(cc_tokens)}}}
-                ):choices[0]:messages::string AS AI_RESPONSE
-                """
-                cc_df = session.sql(cc_sql).to_pandas()
-                if not cc_df.empty:
-                    narrative_response = cc_df.iloc[0]["AI_RESPONSE"]
+                    cc_temp,
+                    int(cc_tokens),
+                    stop_key="sb_cc_stop_tab7",
+                    state_key="latest_narrative_tab7",
+                )
+                if narrative_response:
                     st.session_state["latest_narrative_tab7"] = narrative_response
-                    st.markdown(narrative_response)
                 else:
                     st.info("No AI response.")
             except Exception as e:
@@ -1314,25 +1462,30 @@ with tab7:
             st.markdown(st.session_state["latest_narrative_tab7"])
 
     # Display chat history
-    if st.session_state.analyst_messages:
+    if len(conversation):
         st.markdown("### 💬 Conversation History")
-        for message_index, message in enumerate(st.session_state.analyst_messages):
+        # Render one page of turns, newest first, instead of the whole history
+        history_pages = conversation.page_count(ANALYST_HISTORY_PAGE_SIZE)
+        if history_pages > 1:
+            history_page = st.number_input(
+                f"History page (1-{history_pages}, newest first)", min_value=1, max_value=history_pages,
+                value=min(st.session_state.get("analyst_history_page", 1), history_pages), step=1
+            )
+            st.session_state.analyst_history_page = history_page
+        else:
+            history_page = 1
+        for turn in conversation.page(history_page, ANALYST_HISTORY_PAGE_SIZE):
             # Use container instead of chat_message for compatibility
             message_container = st.container()
             with message_container:
-                role_emoji = "🙋‍♂️" if message["role"] == "user" else "🤖"
-                st.markdown(f"**{role_emoji} {message['role'].title()}:**")
-                
-                if message["role"] == "user":
-                    st.markdown(message["content"][0]["text"])
-                else:
-                    # Display assistant content
-                    for item in message["content"]:
-                        if item["type"] == "text":
-                            st.markdown(item["text"])
-                        elif item["type"] == "sql":
-                            with st.expander("SQL Query", expanded=False):
-                                st.code(item["statement"], language="sql")
+                st.markdown("**🙋‍♂️ User:**")
+                st.markdown(turn.question)
+                st.markdown("**🤖 Assistant:**")
+                st.markdown(turn.answer)
+                if turn.sql:
+                    with st.expander("SQL Query", expanded=False):
+                        st.code(turn.sql, language="sql")
+        st.caption(f"{len(conversation)} questions in this session; the last {len(conversation.context())} are sent as context with the next one")
     
     # Quick Insights Panel
     st.subheader("⚡ Quick Insights")
@@ -1341,67 +1494,50 @@ with tab7:
     
     with insight_cols[0]:
         if st.button("🎯 Top Pain Points"):
-            with st.spinner("Analyzing..."):
-                try:
-                    pain_points_query = f"""
-                    SELECT MAIN_THEME, AVG(AGGREGATE_SCORE) as avg_score, COUNT(*) as count
-                    FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD
-                    WHERE AGGREGATE_SCORE <= 2
-                    GROUP BY MAIN_THEME
-                    ORDER BY count DESC
-                    LIMIT 5
-                    """
-                    pain_points = session.sql(pain_points_query).to_pandas()
+            try:
+                insights = load_quick_insights()
+                pain_points = insights["pain_points"]
+                
+                st.markdown("**🔴 Top Pain Points:**")
+                for idx, row in pain_points.iterrows():
+                    st.markdown(f"• **{row['LABEL']}** - {row['FAN_COUNT']} fans (avg: {row['AVG_SCORE']:.1f}/5)")
+                st.caption(quick_insights_caption(insights))
                     
-                    st.markdown("**🔴 Top Pain Points:**")
-                    for idx, row in pain_points.iterrows():
-                        st.markdown(f"• **{row['MAIN_THEME']}** - {row['COUNT']} fans (avg: {row['AVG_SCORE']:.1f}/5)")
-                        
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
     
     with insight_cols[1]:
         if st.button("🌟 Top Highlights"):
-            with st.spinner("Analyzing..."):
-                try:
-                    highlights_query = f"""
-                    SELECT MAIN_THEME, AVG(AGGREGATE_SCORE) as avg_score, COUNT(*) as count
-                    FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD
-                    WHERE AGGREGATE_SCORE >= 4
-                    GROUP BY MAIN_THEME
-                    ORDER BY count DESC
-                    LIMIT 5
-                    """
-                    highlights = session.sql(highlights_query).to_pandas()
+            try:
+                insights = load_quick_insights()
+                highlights = insights["highlights"]
+                
+                st.markdown("**🟢 Top Highlights:**")
+                for idx, row in highlights.iterrows():
+                    st.markdown(f"• **{row['LABEL']}** - {row['FAN_COUNT']} fans (avg: {row['AVG_SCORE']:.1f}/5)")
+                st.caption(quick_insights_caption(insights))
                     
-                    st.markdown("**🟢 Top Highlights:**")
-                    for idx, row in highlights.iterrows():
-                        st.markdown(f"• **{row['MAIN_THEME']}** - {row['COUNT']} fans (avg: {row['AVG_SCORE']:.1f}/5)")
-                        
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
     
     with insight_cols[2]:
         if st.button("📈 Segment Insights"):
-            with st.spinner("Analyzing..."):
-                try:
-                    segment_query = f"""
-                    SELECT SEGMENT, AVG(AGGREGATE_SCORE) as avg_score, 
-                           AVG(AGGREGATE_SENTIMENT) as avg_sentiment,
-                           COUNT(*) as count
-                    FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD
-                    GROUP BY SEGMENT
-                    ORDER BY avg_score DESC
-                    """
-                    segments = session.sql(segment_query).to_pandas()
+            try:
+                insights = load_quick_insights()
+                segments = insights["segments"]
+                
+                st.markdown("**👥 Segment Performance:**")
+                for idx, row in segments.iterrows():
+                    st.markdown(f"• **{row['LABEL']}** - {row['FAN_COUNT']} fans")
+                    st.markdown(f"  Score: {row['AVG_SCORE']:.1f}/5, Sentiment: {row['AVG_SENTIMENT']:.2f}")
+                st.caption(quick_insights_caption(insights))
                     
-                    st.markdown("**👥 Segment Performance:**")
-                    for idx, row in segments.iterrows():
-                        st.markdown(f"• **{row['SEGMENT']}** - {row['COUNT']} fans")
-                        st.markdown(f"  Score: {row['AVG_SCORE']:.1f}/5, Sentiment: {row['AVG_SENTIMENT']:.2f}")
-                        
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+
+# Only the selected view runs its queries and builds its charts
+VIEW_RENDERERS[active_view]()
+rerun_timer.lap("view")
 
 # Footer
 st.markdown("---")
@@ -1415,6 +1551,65 @@ st.markdown("""
 # Debug information
 if st.sidebar.checkbox("🔧 Show Debug Info"):
     st.sidebar.markdown("### Debug Information")
-    st.sidebar.markdown(f"**Data Shape:** {df.shape if not df.empty else 'No data'}")
-    st.sidebar.markdown(f"**Filtered Shape:** {filtered_df.shape if not filtered_df.empty else 'No filtered data'}")
-    st.sidebar.markdown(f"**Error Count:** {st.session_state.error_count}")
\ No newline at end of file
+    st.sidebar.markdown(f"**Scorecard Rows:** {filter_options['row_count']:,}")
+    try:
+        filtered_rows = int(load_filtered_data(filters, ["COUNT(*) AS ROW_COUNT"], order_by=None).iloc[0, 0])
+        st.sidebar.markdown(f"**Filtered Rows:** {filtered_rows:,}")
+    except Exception as e:
+        st.sidebar.markdown(f"**Filtered Rows:** unavailable ({str(e)})")
+    # Memory of the filtered frame only when a view already loaded it; the panel never loads it
+    filtered_df = peek_filtered_data(filters, sb_data.TAB_COLUMNS["dashboard"])
+    compaction = filtered_df.attrs.get("compaction") if filtered_df is not None else None
+    if compaction:
+        st.sidebar.markdown(f"**Filtered Memory:** {compaction['bytes_after'] / 1024:,.0f} KB (saved {compaction['bytes_saved'] / 1024:,.0f} KB vs. fetched dtypes)")
+    cache_stats = data_cache.stats()
+    st.sidebar.markdown(f"**Data Cache:** {cache_stats['entries']} entries, {cache_stats['bytes'] / 1024 / 1024:.1f} MB, hit rate {cache_stats['hit_rate']:.0%}")
+    analyst_stats = analyst_cache.stats()
+    for namespace, counters in list(cache_stats["namespaces"].items()) + list(analyst_stats["namespaces"].items()):
+        st.sidebar.markdown(f"- `{namespace}`: {counters['hits']} hits / {counters['misses']} misses ({counters['coalesced']} coalesced, {counters['hit_rate']:.0%} hit rate)")
+    query_stats = backend.queries.stats()
+    if query_stats:
+        st.sidebar.markdown("**Query Templates:**")
+        for name, metrics in query_stats.items():
+            st.sidebar.markdown(f"- `{name}`: {metrics['runs']} runs, p50 {metrics['p50_ms']:.0f} ms, p95 {metrics['p95_ms']:.0f} ms, {metrics['errors']} errors")
+    laps = ", ".join(f"{name} {seconds * 1000:,.0f} ms" for name, seconds in rerun_timer.laps.items())
+    st.sidebar.markdown(f"**This Rerun:** {rerun_timer.total() * 1000:,.0f} ms ({laps})")
+    view_rerun = st.session_state.get("last_view_rerun")
+    if view_rerun:
+        st.sidebar.markdown(
+            f"**Last In-View Rerun:** {view_rerun['view']}, {view_rerun['total_ms']:,.0f} ms, "
+            f"{view_rerun['sql_count']} statements ({view_rerun['sql_ms']:,.0f} ms), "
+            f"cache {view_rerun['cache_hits']} hits / {view_rerun['cache_misses']} misses"
+        )
+    timing = view_timings.report(VIEWS, active_view)
+    skipped_note = f", {len(timing['unmeasured'])} not opened yet" if timing["unmeasured"] else ""
+    st.sidebar.markdown(f"**Skipped Views:** ~{timing['skipped_seconds'] * 1000:,.0f} ms saved by not rendering {len(timing['skipped'])} other views{skipped_note}")
+    run_profile = sb_telemetry.run_summary(rerun_timer)
+    st.sidebar.markdown(
+        f"**SQL This Rerun:** {run_profile['sql_count']} statements, {run_profile['sql_ms']:,.0f} ms, "
+        f"{run_profile['rows']:,} rows, {run_profile['bytes'] / 1024:,.0f} KB; "
+        f"cache {run_profile['cache_hits']} hits / {run_profile['cache_misses']} misses"
+    )
+    with st.sidebar.expander("⏱️ Profiler"):
+        st.markdown("**This rerun**")
+        st.dataframe(
+            pd.DataFrame(
+                [{"kind": e["kind"], "name": e["name"], "ms": e["ms"], "rows": e.get("rows"), "outcome": e.get("outcome")}
+                 for e in rerun_timer.events if e["kind"] != "cache"],
+                columns=["kind", "name", "ms", "rows", "outcome"],
+            ),
+            hide_index=True,
+        )
+        for kind, title in [("sql", "Slowest statements"), ("cortex", "Cortex latency"), ("view", "View render time")]:
+            summary = profiler.summary(kind)
+            if summary:
+                st.markdown(f"**{title}** (recent, all sessions)")
+                st.dataframe(pd.DataFrame(summary).head(10).round(1), hide_index=True)
+        st.toggle("Write telemetry to table", key="telemetry_to_table", help=f"Append this session's profiler events to {TELEMETRY_TABLE}")
+    st.sidebar.markdown(f"**Error Count:** {st.session_state.error_count}")
+
+# One JSON summary line per rerun, and the events in the telemetry table when enabled
+try:
+    finish_profiled_run(rerun_timer)
+except Exception as e:
+    st.sidebar.error(f"Error writing telemetry: {str(e)}")
\ No newline at end of file
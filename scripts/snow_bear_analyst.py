@@ -0,0 +1,170 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cortex Analyst helpers for the AI Assistant tab.
+
+AnalystCache keeps two levels of results in a dedicated DataCache, so
+repeated questions skip both round trips:
+
+- "analyst_response": (semantic model file, model content hash,
+  normalized question) -> the Analyst REST response
+- "analyst_sql": (normalized generated SQL, model hash, data version)
+  -> the result frame
+
+The model's stage MD5 is part of both keys. A YAML uploaded to the
+SEMANTIC_MODELS stage therefore starts a fresh set of entries, and the
+stale ones age out by TTL and LRU.
+
+Conversation keeps a session's question/answer turns in a bounded,
+compact store and builds the multi-turn request: the newest turns that
+fit a token budget, followed by the new question.
+"""
+
+import hashlib
+import re
+from collections import deque
+from dataclasses import dataclass
+
+from snow_bear_cache import DataCache
+
+RESPONSE_NAMESPACE = "analyst_response"
+SQL_NAMESPACE = "analyst_sql"
+
+# String literals are kept as written; a -- line comment keeps one line break after it
+_QUOTED_OR_SPACE = re.compile(r"('(?:[^']|'')*')|(--[^\n]*)\s*|\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Case, whitespace and trailing-punctuation insensitive form of a question"""
+    return " ".join(question.split()).lower().rstrip("?!. ")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace outside string literals and comments, and drop trailing semicolons
+
+    The result is a cache key, not a statement to run: callers execute the original SQL.
+    """
+    collapsed = _QUOTED_OR_SPACE.sub(lambda m: m.group(1) or (m.group(2) + "\n" if m.group(2) else " "), sql.strip())
+    return collapsed.rstrip("; ").strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) used for the context budget"""
+    return max(1, len(text) // 4) if text else 0
+
+
+@dataclass(frozen=True)
+class Turn:
+    """One answered question, without suggestions or result data"""
+
+    question: str
+    answer: str = ""
+    sql: str = None
+
+    def messages(self):
+        """The turn as a user/analyst message pair for the Analyst API"""
+        content = [{"type": "text", "text": self.answer}]
+        if self.sql:
+            content.append({"type": "sql", "statement": self.sql})
+        return [
+            {"role": "user", "content": [{"type": "text", "text": self.question}]},
+            {"role": "analyst", "content": content},
+        ]
+
+    def tokens(self) -> int:
+        return estimate_tokens(self.question) + estimate_tokens(self.answer) + estimate_tokens(self.sql)
+
+
+class Conversation:
+    """Bounded multi-turn Analyst history for one browser session"""
+
+    def __init__(self, max_turns: int = 100, context_turns: int = 4, token_budget: int = 2000,
+                 max_answer_chars: int = 2000):
+        self.turns = deque(maxlen=max_turns)
+        self.context_turns = context_turns
+        self.token_budget = token_budget
+        self.max_answer_chars = max_answer_chars
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def clear(self):
+        self.turns.clear()
+
+    def context(self):
+        """Newest turns, oldest first, that fit both the turn limit and the token budget"""
+        window, used = [], 0
+        for turn in reversed(self.turns):
+            if len(window) == self.context_turns or used + turn.tokens() > self.token_budget:
+                break
+            window.append(turn)
+            used += turn.tokens()
+        return window[::-1]
+
+    def context_key(self) -> str:
+        """Digest of the context window, for the Analyst response cache key"""
+        return hashlib.sha256(repr(self.context()).encode("utf-8")).hexdigest()[:16] if self.turns else ""
+
+    def request(self, question: str):
+        """Messages for the Analyst API: the context window followed by the new question"""
+        messages = [message for turn in self.context() for message in turn.messages()]
+        messages.append({"role": "user", "content": [{"type": "text", "text": question}]})
+        return messages
+
+    def add(self, question: str, content) -> Turn:
+        """Record an answered question, keeping only the text and SQL of the response"""
+        answer = " ".join(item["text"] for item in content if item.get("type") == "text")
+        statements = [item["statement"] for item in content if item.get("type") == "sql"]
+        turn = Turn(question, answer[:self.max_answer_chars], statements[0] if statements else None)
+        self.turns.append(turn)
+        return turn
+
+    def page(self, page: int, page_size: int = 5):
+        """Turns on a 1-based page of the history, newest first"""
+        newest_first = list(reversed(self.turns))
+        return newest_first[(page - 1) * page_size:page * page_size]
+
+    def page_count(self, page_size: int = 5) -> int:
+        return max(1, -(-len(self.turns) // page_size))
+
+
+class AnalystCache:
+    """Two-level Cortex Analyst cache: question -> response and generated SQL -> result frame"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, response_ttl: float = 6 * 60 * 60,
+                 sql_ttl: float = 15 * 60, cache: DataCache = None):
+        self.cache = cache or DataCache(max_bytes=max_bytes, default_ttl=sql_ttl)
+        self.response_ttl = response_ttl
+        self.sql_ttl = sql_ttl
+
+    def response(self, model_file: str, model_hash: str, question: str, loader, context=()):
+        """Analyst response for a question, calling loader() on a miss
+
+        ``context`` identifies earlier conversation turns sent with the
+        question, so a follow-up is never answered from a standalone entry.
+        """
+        key = (model_file, model_hash, normalize_question(question), tuple(context))
+        return self.cache.get_or_load(RESPONSE_NAMESPACE, key, loader, ttl=self.response_ttl)
+
+    def sql_result(self, sql: str, model_hash: str, data_version, loader):
+        """Result frame of generated SQL, keyed by its normalized text, calling loader(sql) on a miss"""
+        key = (normalize_sql(sql), model_hash, data_version)
+        return self.cache.get_or_load(SQL_NAMESPACE, key, lambda: loader(sql), ttl=self.sql_ttl)
+
+    def invalidate(self) -> int:
+        return self.cache.invalidate(RESPONSE_NAMESPACE, SQL_NAMESPACE)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -0,0 +1,368 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Data backends for the Snow Bear app.
+
+SnowflakeBackend wraps the active Snowpark session and the Cortex Search,
+Analyst and COMPLETE calls. LocalBackend serves the same interface offline:
+the survey CSV is loaded into DuckDB and run through the notebook's gold
+layer build with deterministic stub Cortex functions, so the app can be
+load-tested and profiled on a laptop::
+
+    SNOW_BEAR_BACKEND=local streamlit run snow_bear.py
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from snow_bear_query import QueryLayer
+
+BACKEND_ENV = "SNOW_BEAR_BACKEND"
+LOCAL_CSV_ENV = "SNOW_BEAR_LOCAL_CSV"
+# Seconds added to each local Cortex stand-in call, to mimic service round trips
+LOCAL_LATENCY_ENV = "SNOW_BEAR_LOCAL_LATENCY"
+
+SEARCH_SERVICE = "SNOW_BEAR_DB.ANALYTICS.SNOWBEAR_SEARCH_ANALYSIS"
+SEARCH_COLUMNS = [
+    "aggregate_comment",
+    "aggregate_score",
+    "segment",
+    "segment_alt",
+    "main_theme",
+    "secondary_theme",
+    "game_experience_score",
+    "overall_event_score",
+    "parking_score",
+    "food_offering_score",
+    "id",
+]
+
+
+def backend_name() -> str:
+    """Backend selected by the SNOW_BEAR_BACKEND environment variable"""
+    return os.environ.get(BACKEND_ENV, "snowflake").lower()
+
+
+def create_backend(name: str = None):
+    """Build the backend named by ``name`` or SNOW_BEAR_BACKEND ("snowflake" or "local")"""
+    name = (name or backend_name()).lower()
+    if name == "local":
+        return LocalBackend.from_csv(os.environ.get(LOCAL_CSV_ENV), latency=float(os.environ.get(LOCAL_LATENCY_ENV, 0)))
+    if name == "snowflake":
+        return SnowflakeBackend.from_active_session()
+    raise ValueError(f"Unknown backend '{name}', expected 'snowflake' or 'local'")
+
+
+def normalize_search_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query, used for the request and its cache key"""
+    return " ".join(query.split()).lower()
+
+
+def search_frame(rows, columns) -> pd.DataFrame:
+    """Search hits as the app expects them: upper-case columns, ID as FAN_ID, 1-based RELEVANCE_RANK"""
+    names = ["FAN_ID" if c.lower() == "id" else c.upper() for c in columns]
+    df = pd.DataFrame([[row.get(c) for c in columns] for row in rows], columns=names)
+    df["RELEVANCE_RANK"] = range(1, len(df) + 1)
+    return df
+
+
+class SnowflakeBackend:
+    """Snowpark session plus the Cortex REST and SQL functions"""
+
+    name = "snowflake"
+
+    def __init__(self, session):
+        self.session = session
+        self.queries = QueryLayer(session)
+
+    @classmethod
+    def from_active_session(cls):
+        from snowflake.snowpark.context import get_active_session
+
+        return cls(get_active_session())
+
+    def current_database(self) -> str:
+        return self.session.get_current_database()
+
+    def table_version(self, schema: str, table_name: str):
+        """LAST_ALTERED of a table, or None if it does not exist"""
+        rows = self.session.sql(
+            "SELECT LAST_ALTERED FROM SNOW_BEAR_DB.INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?",
+            params=[schema, table_name],
+        ).collect()
+        return str(rows[0]["LAST_ALTERED"]) if rows else None
+
+    def list_stage(self, stage: str):
+        """File names on a stage, e.g. 'semantic_models/snow_bear_fan_360.yaml'"""
+        return [row["name"] for row in self.session.sql(f"ls @{stage}").collect()]
+
+    def stage_file_info(self, stage: str) -> dict:
+        """{file name without stage prefix: {"md5", "last_modified"}} for the files on a stage"""
+        return {
+            row["name"].split("/")[-1]: {"md5": row["md5"], "last_modified": str(row["last_modified"])}
+            for row in self.session.sql(f"ls @{stage}").collect()
+        }
+
+    def read_stage_file(self, stage: str, name: str) -> bytes:
+        """Contents of one file on a stage"""
+        with self.session.file.get_stream(f"@{stage}/{name}") as stream:
+            return stream.read()
+
+    def search_version(self, service: str = SEARCH_SERVICE):
+        """data_timestamp of the search service's last refresh, or None if it cannot be described"""
+        rows = self.session.sql(f"DESCRIBE CORTEX SEARCH SERVICE {service}").collect()
+        return str(rows[0]["data_timestamp"]) if rows else None
+
+    def search(self, query: str, columns=SEARCH_COLUMNS, limit: int = 200, service: str = SEARCH_SERVICE,
+               filter: dict = None) -> pd.DataFrame:
+        """Cortex Search over fan comments via SEARCH_PREVIEW, with ``filter`` applied by the service"""
+        request = {"query": query, "columns": list(columns), "limit": limit}
+        if filter:
+            request["filter"] = filter
+        # Service name and request are bound, so every search shares one statement text
+        rows = self.queries.collect("search", service=service, request=json.dumps(request))
+        results = rows[0]["RESULTS"] if rows else None
+        return search_frame(json.loads(results) if results else [], columns)
+
+    def analyst_message(self, messages, semantic_model_file: str, timeout_ms: int = 30000) -> dict:
+        """POST to the Cortex Analyst REST API and return the parsed response"""
+        import _snowflake
+
+        request_body = {"messages": messages, "semantic_model_file": semantic_model_file}
+        resp = _snowflake.send_snow_api_request(
+            "POST",
+            "/api/v2/cortex/analyst/message",
+            {},
+            {},
+            request_body,
+            {},
+            timeout_ms,
+        )
+        if resp["status"] < 400:
+            return json.loads(resp["content"])
+        raise Exception(f"API request failed with status {resp['status']}: {resp}")
+
+    def complete(self, model: str, messages, temperature: float = 0.2, max_tokens: int = 1500) -> str:
+        """Cortex COMPLETE over a chat history; returns the response text"""
+        rows = self.queries.collect(
+            "narrative",
+            model=model,
+            messages=json.dumps([{"role": m["role"], "content": m["content"]} for m in messages]),
+            options=json.dumps({"temperature": float(temperature), "max_tokens": int(max_tokens)}),
+        )
+        return rows[0]["AI_RESPONSE"] if rows else None
+
+    def complete_stream(self, model: str, messages, temperature: float = 0.2, max_tokens: int = 1500):
+        """Cortex Complete as an iterator of text chunks (snowflake-ml-python, stream=True)"""
+        from snowflake.cortex import complete
+
+        return complete(
+            model,
+            [{"role": m["role"], "content": m["content"]} for m in messages],
+            options={"temperature": float(temperature), "max_tokens": int(max_tokens)},
+            session=self.session,
+            stream=True,
+        )
+
+
+class _LocalSession:
+    """DBAPISession-compatible session; every thread gets its own DuckDB cursor"""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._local = threading.local()
+
+    def _session(self):
+        from snow_bear_data import DBAPISession
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = DBAPISession(self._connection.cursor())
+        return session
+
+    def sql(self, query: str, params=None):
+        return self._session().sql(query, params)
+
+    def get_current_database(self) -> str:
+        return "SNOW_BEAR_DB"
+
+
+# Canned Analyst answers for the local backend: (keywords, explanation, SQL)
+_LOCAL_ANALYST_ANSWERS = [
+    (("segment", "engaged", "loyal"), "Fan count, average score and sentiment by segment.", """
+SELECT SEGMENT, COUNT(*) AS FAN_COUNT, ROUND(AVG(AGGREGATE_SCORE), 2) AS AVG_SCORE,
+       ROUND(AVG(AGGREGATE_SENTIMENT), 3) AS AVG_SENTIMENT
+FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD
+GROUP BY SEGMENT
+ORDER BY FAN_COUNT DESC"""),
+    (("trend", "month", "over time", "date"), "Monthly fan count and average score.", """
+SELECT DATE_TRUNC('month', REVIEW_DATE) AS REVIEW_MONTH, COUNT(*) AS FAN_COUNT,
+       ROUND(AVG(AGGREGATE_SCORE), 2) AS AVG_SCORE
+FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD
+GROUP BY 1
+ORDER BY 1"""),
+    (("food", "parking", "seat", "merchandise", "game", "drive", "satisfaction"),
+     "Average category sentiment for satisfied versus other fans.", """
+SELECT CASE WHEN AGGREGATE_SCORE >= 4 THEN 'Satisfied' ELSE 'Not satisfied' END AS SATISFACTION,
+       COUNT(*) AS FAN_COUNT,
+       ROUND(AVG(FOOD_OFFERING_SENTIMENT), 3) AS FOOD_SENTIMENT,
+       ROUND(AVG(GAME_EXPERIENCE_SENTIMENT), 3) AS GAME_SENTIMENT,
+       ROUND(AVG(PARKING_SENTIMENT), 3) AS PARKING_SENTIMENT,
+       ROUND(AVG(SEAT_LOCATION_SENTIMENT), 3) AS SEAT_SENTIMENT,
+       ROUND(AVG(MERCHANDISE_PRICING_SENTIMENT), 3) AS MERCH_PRICING_SENTIMENT
+FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD
+GROUP BY 1
+ORDER BY 1"""),
+]
+_LOCAL_ANALYST_DEFAULT = ("Fan count and average score by main theme.", """
+SELECT MAIN_THEME, COUNT(*) AS FAN_COUNT, ROUND(AVG(AGGREGATE_SCORE), 2) AS AVG_SCORE
+FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD
+GROUP BY MAIN_THEME
+ORDER BY FAN_COUNT DESC""")
+
+
+def _local_narrative(model: str, messages) -> str:
+    prompt = messages[-1]["content"] if messages else ""
+    return (f"**Local {model} narrative** ({len(prompt):,} prompt characters)\n\n"
+            f"- Review the largest groups in the result first.\n"
+            f"- Compare averages across groups for outliers.\n"
+            f"- Follow up on the lowest-scoring themes.")
+
+
+class LocalBackend:
+    """Offline stand-in: DuckDB gold layer, keyword search and canned Analyst/COMPLETE answers"""
+
+    name = "local"
+
+    def __init__(self, session, stage_dir: str = None, latency: float = 0.0):
+        self.session = session
+        self.queries = QueryLayer(session)
+        self.stage_dir = stage_dir or os.path.dirname(os.path.abspath(__file__))
+        # Optional delay added to the Cortex stand-ins, to mimic service round trips
+        self.latency = latency
+        self._version = str(time.time())
+        self._search_index = None
+        # Removed with the backend; each table version's index is saved and memory-mapped from here
+        self._index_dir = tempfile.TemporaryDirectory(prefix="snow_bear_index_")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_csv(cls, csv_path: str = None, **kwargs):
+        import duckdb
+
+        from snow_bear_pipeline import SURVEY_CSV, build_local_gold
+
+        if csv_path is None:
+            csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), SURVEY_CSV)
+        connection = duckdb.connect()
+        build_local_gold(csv_path, connection)
+        return cls(_LocalSession(connection), **kwargs)
+
+    def current_database(self) -> str:
+        return "SNOW_BEAR_DB"
+
+    def table_version(self, schema: str, table_name: str):
+        rows = self.session.sql(
+            "SELECT 1 FROM information_schema.tables WHERE table_catalog = 'SNOW_BEAR_DB' "
+            "AND table_schema = ? AND table_name = ?",
+            params=[schema, table_name],
+        ).collect()
+        return self._version if rows else None
+
+    def touch(self):
+        """Bump every table version, as a reload of the gold layer would"""
+        self._version = str(time.time())
+        self._search_index = None
+
+    def list_stage(self, stage: str):
+        """Semantic model YAMLs shipped next to the app, named as the stage would list them"""
+        prefix = stage.split(".")[-1].lower()
+        return sorted(f"{prefix}/{f}" for f in os.listdir(self.stage_dir) if f.lower().endswith(".yaml"))
+
+    def stage_file_info(self, stage: str) -> dict:
+        info = {}
+        for name in self.list_stage(stage):
+            path = os.path.join(self.stage_dir, name.split("/")[-1])
+            with open(path, "rb") as f:
+                md5 = hashlib.md5(f.read()).hexdigest()
+            info[name.split("/")[-1]] = {"md5": md5, "last_modified": time.ctime(os.path.getmtime(path))}
+        return info
+
+    def read_stage_file(self, stage: str, name: str) -> bytes:
+        with open(os.path.join(self.stage_dir, name.split("/")[-1]), "rb") as f:
+            return f.read()
+
+    def _index(self):
+        from snow_bear_search import INDEX_QUERY, SearchIndex, open_saved_index
+
+        with self._lock:
+            if self._search_index is None:
+                self._search_index = open_saved_index(
+                    self._index_dir.name, self._version,
+                    lambda path: SearchIndex.from_frame(self.session.sql(INDEX_QUERY).to_pandas()).save(path),
+                )
+            return self._search_index
+
+    def search_version(self, service: str = SEARCH_SERVICE):
+        return self._version
+
+    def search(self, query: str, columns=SEARCH_COLUMNS, limit: int = 200, service: str = SEARCH_SERVICE,
+               filter: dict = None) -> pd.DataFrame:
+        """Hybrid BM25 + vector ranking over the local gold table (snow_bear_search)"""
+        time.sleep(self.latency)
+        index = self._index()
+        doc_ids, _ = index.search(query, limit=limit, filter=filter)
+        return search_frame(index.rows(doc_ids, columns), columns)
+
+    def analyst_message(self, messages, semantic_model_file: str, timeout_ms: int = 30000) -> dict:
+        """Keyword-matched SQL over the local gold table, shaped like a Cortex Analyst response"""
+        time.sleep(self.latency)
+        question = " ".join(
+            item.get("text", "") for item in messages[-1]["content"] if item.get("type") == "text"
+        ).lower()
+        explanation, statement = _LOCAL_ANALYST_DEFAULT
+        for keywords, text, sql in _LOCAL_ANALYST_ANSWERS:
+            if any(keyword in question for keyword in keywords):
+                explanation, statement = text, sql
+                break
+        return {
+            "request_id": f"local-{uuid.uuid4()}",
+            "message": {
+                "role": "analyst",
+                "content": [
+                    {"type": "text", "text": f"{explanation} (local backend, {os.path.basename(semantic_model_file)})"},
+                    {"type": "sql", "statement": statement.strip()},
+                ],
+            },
+        }
+
+    def complete(self, model: str, messages, temperature: float = 0.2, max_tokens: int = 1500) -> str:
+        """Deterministic stand-in for a COMPLETE response"""
+        time.sleep(self.latency)
+        return _local_narrative(model, messages)
+
+    def complete_stream(self, model: str, messages, temperature: float = 0.2, max_tokens: int = 1500):
+        """The local COMPLETE text streamed word by word, first token after ``latency``"""
+        from snow_bear_narrative import FakeStreamingLLM
+
+        llm = FakeStreamingLLM(_local_narrative(model, messages), time_to_first_token=self.latency)
+        return llm.stream(model, messages, temperature, max_tokens)
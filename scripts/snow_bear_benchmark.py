@@ -0,0 +1,366 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Headless benchmark of the dashboard views' data paths.
+
+The gold layer is built from the bundled survey CSV, then resampled into
+synthetic scorecards of each requested size, with fresh IDs, in a DuckDB
+file. The summary tables are rebuilt on top with the notebook's
+statements. Each view's pipeline then runs without Streamlit, split into
+four stages:
+
+- load: the view's SQL and ``compact_frame``
+- filter: in-memory narrowing of the loaded rows or rollup
+- aggregate: ``rollup_metrics`` / ``group_metrics``
+- chart: the view's Altair specs, serialized with ``to_dict()``
+
+Nothing is cached between views, so every view pays its own load, as it
+would on a cold app. The search and AI Assistant views are left out: their
+cost is in Cortex, and the local search index has its own benchmark in
+snow_bear_search.py.
+
+Each stage reports its median wall time over ``--repeats`` runs, after
+one warm-up run, plus the peak Python memory it allocated, measured with
+tracemalloc on a separate run so tracing does not skew the timings.
+
+Before each timed run, a fixed reference workload (pandas and DuckDB over
+the bundled sample rows, no app code) is timed too, and each stage also
+reports its median time relative to that reference. Shared and throttled
+machines drift in speed by tens of percent, within a run and between
+runs; the relative times cancel that drift out, so the baseline check
+compares them rather than raw milliseconds. A run fails, exiting with 1,
+when a stage is slower, relative to the reference, or larger than the
+baseline by more than the tolerance and by more than the noise floors::
+
+    python snow_bear_benchmark.py --rows 10000 100000 1000000 --save-baseline snow_bear_benchmark_baseline.json
+    python snow_bear_benchmark.py --rows 10000 100000 1000000 --baseline snow_bear_benchmark_baseline.json
+
+The reference only corrects for overall speed; cache sizes, core counts and
+library versions still move individual stages. Record the baseline on
+the machine that runs the check (the JSON notes where it was recorded),
+and re-record it there whenever that machine changes.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import snow_bear_charts as sb_charts
+import snow_bear_data as sb_data
+import snow_bear_metrics as sb_metrics
+from snow_bear_pipeline import SURVEY_CSV, build_local_gold, run_statements, summary_table_statements
+
+BENCH_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+STAGES = ["load", "filter", "aggregate", "chart"]
+
+# Scorecard columns the benchmarked views read; the synthetic tables hold only these
+BENCH_COLUMNS = list(dict.fromkeys(
+    sb_data.TAB_COLUMNS["dashboard"] + sb_data.TAB_COLUMNS["fan_journey"] + sb_data.TAB_COLUMNS["recommendations"]
+))
+SAMPLE_TABLE = "SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD_SAMPLE"
+
+# Differences below these floors are noise, whatever the tolerance
+MIN_REGRESSION_MS = 20.0
+MIN_REGRESSION_MB = 2.0
+
+
+class StageTimer:
+    """Wall time and peak traced memory of each stage of one pipeline run"""
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.seconds = {}
+        self.peak_bytes = {}
+
+    @contextmanager
+    def __call__(self, name: str):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - started
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                self.peak_bytes[name] = max(self.peak_bytes.get(name, 0), peak)
+
+
+def load_dashboard_rows(session, filters) -> pd.DataFrame:
+    """The dashboard columns for the sidebar filters, as load_dashboard_data fetches them"""
+    return sb_data.compact_frame(sb_data.fetch_filtered(session, filters, sb_data.TAB_COLUMNS["dashboard"]))
+
+
+def load_scatter_rows(session, filters):
+    """The scatter's rows as the app fetches them: a COUNT(*), then 500 rows only under 1,000 matches"""
+    row_count = int(sb_data.fetch_filtered(session, filters, ["COUNT(*) AS ROW_COUNT"], order_by=None).iloc[0, 0])
+    if row_count == 0 or row_count >= 1000:
+        return None
+    return sb_data.compact_frame(sb_data.fetch_filtered(session, filters, sb_data.TAB_COLUMNS["dashboard"], limit=500))
+
+
+def executive_dashboard(session, filters, stage):
+    with stage("load"):
+        rollup = sb_data.load_rollup(session)
+        scatter_rows = load_scatter_rows(session, filters)
+    with stage("filter"):
+        dashboard_rollup = sb_data.filter_rollup(rollup, filters)
+    with stage("aggregate"):
+        overall = sb_data.rollup_metrics(dashboard_rollup).iloc[0]
+        score_counts = sb_data.rollup_metrics(dashboard_rollup, by='AGGREGATE_SCORE')['FAN_COUNT'].sort_index()
+        segment_metrics = sb_data.rollup_metrics(dashboard_rollup, by='SEGMENT')
+    with stage("chart"):
+        specs = [sb_charts.score_distribution_chart(score_counts).to_dict()]
+        if scatter_rows is not None and not scatter_rows.empty:
+            specs.append(sb_charts.sentiment_score_scatter(scatter_rows).to_dict())
+    return {"fans": int(overall["FAN_COUNT"]), "segments": len(segment_metrics), "charts": len(specs)}
+
+
+def fan_journey(session, filters, stage):
+    with stage("load"):
+        filtered_df = load_dashboard_rows(session, filters)
+    with stage("filter"):
+        available_fans = filtered_df['ID'].unique()[:100]
+    with stage("load"):
+        fan = sb_data.load_fan_details(session, available_fans[0]) if len(available_fans) else pd.DataFrame()
+    return {"fans": len(filtered_df), "selected": len(fan)}
+
+
+def sentiment_deep_dive(session, filters, stage):
+    with stage("load"):
+        filtered_df = load_dashboard_rows(session, filters)
+    with stage("filter"):
+        sentiment_cols = [col for col in sb_data.SENTIMENT_COLUMNS if col in filtered_df.columns]
+        histogram_rows = filtered_df.head(1000)
+    with stage("aggregate"):
+        sentiment_data = sb_metrics.group_metrics(filtered_df, category_cols=sentiment_cols)[sentiment_cols].iloc[0].to_frame('Average Sentiment')
+        sentiment_data.index = [col.replace('_SENTIMENT', '').replace('_', ' ').title() for col in sentiment_cols]
+        daily_sentiment = sb_metrics.group_metrics(filtered_df, 'REVIEW_DATE')['AVG_SENTIMENT'].rename('AGGREGATE_SENTIMENT').reset_index()
+        segment_sentiment = sb_metrics.group_metrics(filtered_df, 'SEGMENT', category_cols=sentiment_cols)[sentiment_cols].round(2)
+    with stage("chart"):
+        specs = [
+            sb_charts.category_sentiment_chart(sentiment_data).to_dict(),
+            sb_charts.sentiment_trend_chart(daily_sentiment).to_dict(),
+            sb_charts.sentiment_histogram(histogram_rows).to_dict(),
+        ]
+    return {"fans": len(filtered_df), "days": len(daily_sentiment), "segments": len(segment_sentiment), "charts": len(specs)}
+
+
+def theme_segment_analysis(session, filters, stage):
+    with stage("load"):
+        rollup = sb_data.load_rollup(session)
+    with stage("filter"):
+        dashboard_rollup = sb_data.filter_rollup(rollup, filters)
+    with stage("aggregate"):
+        overall = sb_data.rollup_metrics(dashboard_rollup).iloc[0]
+        theme_counts = sb_data.rollup_metrics(dashboard_rollup, by='MAIN_THEME')['FAN_COUNT'].sort_values(ascending=False).head(10)
+        segment_counts = sb_data.rollup_metrics(dashboard_rollup, by='SEGMENT')['FAN_COUNT'].sort_values(ascending=False).head(10)
+        theme_metrics = sb_data.rollup_metrics(dashboard_rollup, by='MAIN_THEME')
+    with stage("chart"):
+        specs = [
+            sb_charts.ranked_count_chart(theme_counts, 'Theme', 'Primary Themes Distribution').to_dict(),
+            sb_charts.ranked_count_chart(segment_counts, 'Segment', 'Fan Segments Distribution', sb_charts.NAVY).to_dict(),
+        ]
+    return {"fans": int(overall["FAN_COUNT"]), "themes": len(theme_metrics), "charts": len(specs)}
+
+
+def recommendation_engine(session, filters, stage):
+    rec_conditions = ["BUSINESS_RECOMMENDATION IS NOT NULL"]
+    with stage("load"):
+        rec_count = int(sb_data.fetch_filtered(session, filters, ["COUNT(*) AS ROW_COUNT"], extra_conditions=rec_conditions, order_by=None).iloc[0, 0])
+        # The view counts the filtered rows only when there is nothing to recommend
+        has_rows = rec_count > 0 or int(sb_data.fetch_filtered(session, filters, ["COUNT(*) AS ROW_COUNT"], order_by=None).iloc[0, 0]) > 0
+        business_recs = sb_data.fetch_filtered(session, filters, sb_data.TAB_COLUMNS["recommendations"], extra_conditions=rec_conditions, limit=3) if rec_count else pd.DataFrame()
+    return {"has_rows": has_rows, "recommendations": rec_count, "samples": len(business_recs)}
+
+
+VIEW_PIPELINES = {
+    "Executive Dashboard": executive_dashboard,
+    "Fan Journey Explorer": fan_journey,
+    "Sentiment Deep Dive": sentiment_deep_dive,
+    "Theme & Segment Analysis": theme_segment_analysis,
+    "Recommendation Engine": recommendation_engine,
+}
+
+
+def default_filters(session) -> sb_data.FilterState:
+    """The sidebar's initial selection: the full date range and the first five segments"""
+    options = sb_data.load_filter_options(session)
+    segments = options["segments"]
+    return sb_data.FilterState(
+        start_date=options["min_date"],
+        end_date=options["max_date"],
+        segments=tuple(segments[:5] if len(segments) > 5 else segments),
+    )
+
+
+def open_bench_database(path: str, csv_path: str = SURVEY_CSV, memory_limit: str = None):
+    """A DuckDB file attached as SNOW_BEAR_DB, holding the CSV's gold rows as the resampling source"""
+    import duckdb
+
+    sample = build_local_gold(csv_path).sql(
+        f"SELECT {', '.join(BENCH_COLUMNS)} FROM {sb_data.SCORECARD_TABLE} ORDER BY ID"
+    ).to_pandas()
+    connection = duckdb.connect()
+    if memory_limit:
+        connection.execute(f"SET memory_limit = '{memory_limit}'")
+    # A file database is compressed, so the resampled text columns stay small
+    connection.execute(f"ATTACH '{path}' AS SNOW_BEAR_DB")
+    for schema in ("GOLD_LAYER", "ANALYTICS"):
+        connection.execute(f"CREATE SCHEMA IF NOT EXISTS SNOW_BEAR_DB.{schema}")
+    connection.register("gold_sample", sample)
+    connection.execute(f"CREATE TABLE {SAMPLE_TABLE} AS SELECT *, ROW_NUMBER() OVER () - 1 AS SAMPLE_ROW FROM gold_sample")
+    connection.unregister("gold_sample")
+    return sb_data.DBAPISession(connection), len(sample)
+
+
+def build_synthetic_scorecard(session, rows: int, sample_rows: int, seed: int = 0):
+    """Replace QUALTRICS_SCORECARD with ``rows`` resampled gold rows and rebuild the summary tables"""
+    session.sql(f"""CREATE OR REPLACE TABLE {sb_data.SCORECARD_TABLE} AS
+SELECT S.* EXCLUDE (SAMPLE_ROW) REPLACE (printf('SYN%010d', R.range) AS ID)
+FROM range({int(rows)}) R
+JOIN {SAMPLE_TABLE} S ON S.SAMPLE_ROW = hash(R.range + {int(seed)}) % {int(sample_rows)}""").collect()
+    run_statements(session, summary_table_statements())
+
+
+def reference_seconds(session) -> float:
+    """Wall time of a fixed workload that does not touch the app code, to time the stages against"""
+    started = time.perf_counter()
+    sample = session.sql(f"SELECT * FROM {SAMPLE_TABLE}").to_pandas()
+    sample.groupby("SEGMENT")["AGGREGATE_SENTIMENT"].agg(["mean", "count"])
+    sample.sort_values(["REVIEW_DATE", "ID"]).to_json(date_format="iso")
+    return time.perf_counter() - started
+
+
+def run_view(session, filters, pipeline, repeats: int) -> dict:
+    """{stage: {"ms", "relative", "peak_mb"}} of one view's pipeline
+
+    ``ms`` is the median wall time, ``relative`` the median of each run's
+    time over the reference workload's, timed just before it.
+    """
+    # Warm-up: the first run pays for imports, DuckDB's plan cache and Altair's schema
+    reference_seconds(session)
+    pipeline(session, filters, StageTimer())
+    runs, references = [], []
+    for _ in range(repeats):
+        references.append(reference_seconds(session))
+        stage = StageTimer()
+        pipeline(session, filters, stage)
+        runs.append(stage.seconds)
+    stage = StageTimer(trace_memory=True)
+    tracemalloc.start()
+    try:
+        pipeline(session, filters, stage)
+    finally:
+        tracemalloc.stop()
+    return {
+        name: {
+            "ms": round(float(np.median([run[name] for run in runs])) * 1000, 2),
+            "relative": round(float(np.median([run[name] / reference for run, reference in zip(runs, references)])), 5),
+            "peak_mb": round(stage.peak_bytes[name] / 1024 / 1024, 2),
+        }
+        for name in STAGES if name in stage.seconds
+    }
+
+
+def run_benchmark(sizes, csv_path: str = SURVEY_CSV, repeats: int = 9, views=None, memory_limit: str = None) -> dict:
+    """{"rows": {size: {view: {stage: ms, relative, peak_mb}}}} for each synthetic scorecard size"""
+    results = {}
+    views = views or list(VIEW_PIPELINES)
+    with tempfile.TemporaryDirectory() as directory:
+        session, sample_rows = open_bench_database(os.path.join(directory, "snow_bear_bench.duckdb"), csv_path, memory_limit)
+        for rows in sizes:
+            started = time.perf_counter()
+            build_synthetic_scorecard(session, rows, sample_rows)
+            print(f"{rows:>12,} rows  scorecard built in {time.perf_counter() - started:6.1f} s")
+            filters = default_filters(session)
+            results[str(rows)] = {}
+            for name in views:
+                stages = run_view(session, filters, VIEW_PIPELINES[name], repeats)
+                results[str(rows)][name] = stages
+                print(f"{'':<12}  {name:<26}" + "".join(
+                    f"  {stage} {timing['ms']:9.1f} ms {timing['peak_mb']:7.1f} MB" for stage, timing in stages.items()
+                ))
+        session.connection.close()
+    return {"rows": results}
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+    """Stages slower or larger than the baseline by more than ``tolerance`` (and the noise floors)
+
+    Times are compared relative to the reference workload: the baseline's
+    relative time is turned back into milliseconds at this run's speed.
+    Memory is compared as recorded.
+    """
+    regressions = []
+    for rows, views in results["rows"].items():
+        for view, stages in views.items():
+            for stage, current in stages.items():
+                recorded = baseline.get("rows", {}).get(rows, {}).get(view, {}).get(stage)
+                if recorded is None:
+                    continue
+                expected = dict(recorded)
+                if recorded.get("relative") and current.get("relative"):
+                    # This run's reference time, as the stage's runs saw it
+                    expected["ms"] = recorded["relative"] * current["ms"] / current["relative"]
+                for metric, floor in (("ms", MIN_REGRESSION_MS), ("peak_mb", MIN_REGRESSION_MB)):
+                    if current[metric] > expected[metric] * (1 + tolerance) and current[metric] - expected[metric] > floor:
+                        regressions.append(
+                            f"{int(rows):,} rows  {view} / {stage}: {metric} {current[metric]:.1f} > "
+                            f"baseline {expected[metric]:.1f} (+{tolerance:.0%})"
+                        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard views' load, filter, aggregate and chart stages")
+    parser.add_argument("--rows", type=int, nargs="+", default=BENCH_SIZES, help="synthetic scorecard sizes")
+    parser.add_argument("--csv", default=SURVEY_CSV, help="survey export the synthetic rows are sampled from")
+    parser.add_argument("--views", nargs="+", choices=list(VIEW_PIPELINES), default=None)
+    parser.add_argument("--repeats", type=int, default=9, help="timed runs per view, after a warm-up run; the median is reported")
+    parser.add_argument("--memory-limit", default=None, help="DuckDB memory_limit, e.g. 2GB")
+    parser.add_argument("--baseline", default=None, help="fail if a stage regresses against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown or growth, as a fraction")
+    parser.add_argument("--save-baseline", default=None, help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.csv, args.repeats, args.views, args.memory_limit)
+    if args.save_baseline:
+        results["machine"] = {
+            "node": platform.node(), "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+        }
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"baseline written to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if baseline.get("machine", {}).get("node") not in (None, platform.node()):
+            print(f"warning: {args.baseline} was recorded on {baseline['machine']['node']}, not this machine")
+        for regression in regressions:
+            print(f"REGRESSION  {regression}")
+        print(f"{len(regressions)} regressions against {args.baseline}")
+        sys.exit(1 if regressions else 0)
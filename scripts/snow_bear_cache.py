@@ -0,0 +1,218 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide data cache shared by every Snow Bear dashboard session.
+
+Entries live in namespaces (e.g. "scorecard", "themes") so the app can
+invalidate one kind of data without dropping everything else. Values are
+shared between browser sessions and must be treated as read-only.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def estimate_nbytes(value) -> int:
+    """Best-effort memory footprint of a cached value"""
+    if hasattr(value, "memory_usage"):
+        # pandas DataFrame / Series
+        try:
+            usage = value.memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+        except Exception:
+            pass
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items()
+        )
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "expires_at")
+
+    def __init__(self, value, nbytes, expires_at):
+        self.value = value
+        self.nbytes = nbytes
+        self.expires_at = expires_at
+
+
+class _Flight:
+    """A load in progress that other callers can wait on"""
+
+    __slots__ = ("event", "value", "error", "generation")
+
+    def __init__(self, generation):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self.generation = generation
+
+
+class DataCache:
+    """TTL cache with max-bytes LRU eviction and single-flight loading"""
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024, default_ttl: float = 900, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._generations = {}
+        self._bytes = 0
+        self._stats = {}
+        # Optional listener(namespace, outcome) called after each lookup ("hit", "miss" or "coalesced")
+        self.listener = None
+
+    def _counters(self, namespace):
+        if namespace not in self._stats:
+            self._stats[namespace] = {
+                "hits": 0,
+                "misses": 0,
+                "coalesced": 0,
+                "evictions": 0,
+                "expirations": 0,
+                "invalidations": 0,
+            }
+        return self._stats[namespace]
+
+    def _drop(self, full_key):
+        entry = self._entries.pop(full_key)
+        self._bytes -= entry.nbytes
+
+    def get_or_load(self, namespace: str, key, loader, ttl: float = None):
+        """Return the cached value for (namespace, key), calling loader() at most once per miss.
+
+        Concurrent callers asking for the same missing key wait for the
+        in-flight load instead of starting their own. Loader errors are
+        raised to every waiter and nothing is cached.
+        """
+        full_key = (namespace, key)
+        with self._lock:
+            counters = self._counters(namespace)
+            entry = self._entries.get(full_key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._drop(full_key)
+                counters["expirations"] += 1
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(full_key)
+                counters["hits"] += 1
+                outcome = "hit"
+            elif full_key in self._inflight:
+                flight = self._inflight[full_key]
+                counters["coalesced"] += 1
+                outcome = "coalesced"
+            else:
+                flight = _Flight(self._generations.get(namespace, 0))
+                self._inflight[full_key] = flight
+                counters["misses"] += 1
+                outcome = "miss"
+
+        if self.listener is not None:
+            self.listener(namespace, outcome)
+        if outcome == "hit":
+            return entry.value
+        if outcome == "coalesced":
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._inflight.pop(full_key, None)
+            flight.event.set()
+            raise
+
+        with self._lock:
+            self._inflight.pop(full_key, None)
+            # Skip storing results that were invalidated while loading
+            if flight.generation == self._generations.get(namespace, 0):
+                self._store(full_key, value, self.default_ttl if ttl is None else ttl)
+        flight.value = value
+        flight.event.set()
+        return value
+
+    def peek(self, namespace: str, key):
+        """The cached value for (namespace, key) if present and fresh, else None; never loads or counts"""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None or entry.expires_at <= self._clock():
+                return None
+            return entry.value
+
+    def _store(self, full_key, value, ttl):
+        nbytes = estimate_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        if full_key in self._entries:
+            self._drop(full_key)
+        self._entries[full_key] = _Entry(value, nbytes, self._clock() + ttl)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._drop(oldest_key)
+            self._counters(oldest_key[0])["evictions"] += 1
+
+    def invalidate(self, *namespaces: str) -> int:
+        """Drop every entry in the given namespaces and return how many were removed"""
+        removed = 0
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+                self._counters(namespace)["invalidations"] += 1
+                for full_key in [k for k in self._entries if k[0] == namespace]:
+                    self._drop(full_key)
+                    removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Drop every entry in every namespace"""
+        with self._lock:
+            namespaces = {k[0] for k in self._entries} | set(self._stats)
+        return self.invalidate(*namespaces)
+
+    def stats(self) -> dict:
+        """Per-namespace counters plus overall size, for the debug panel"""
+        with self._lock:
+            per_namespace = {}
+            for namespace, counters in self._stats.items():
+                keys = [k for k in self._entries if k[0] == namespace]
+                namespace_lookups = counters["hits"] + counters["coalesced"] + counters["misses"]
+                per_namespace[namespace] = dict(
+                    counters,
+                    hit_rate=(counters["hits"] + counters["coalesced"]) / namespace_lookups if namespace_lookups else 0.0,
+                    entries=len(keys),
+                    bytes=sum(self._entries[k].nbytes for k in keys),
+                )
+            hits = sum(c["hits"] + c["coalesced"] for c in self._stats.values())
+            lookups = hits + sum(c["misses"] for c in self._stats.values())
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "namespaces": per_namespace,
+            }
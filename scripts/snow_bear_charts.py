@@ -0,0 +1,108 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Altair chart specs for the Snow Bear dashboard views.
+
+Each function takes the rows or metrics a view has already aggregated and
+returns the chart it shows. The views and the headless benchmark
+(snow_bear_benchmark.py) share these builders, so the benchmark times the
+same specs the app sends to the browser.
+"""
+
+import altair as alt
+import pandas as pd
+
+SNOW_BLUE = '#29B5E8'
+NAVY = '#1E3A8A'
+
+
+def score_distribution_chart(score_counts: pd.Series) -> alt.Chart:
+    """Fan count per aggregate score"""
+    score_df = pd.DataFrame({'Score': score_counts.index, 'Count': score_counts.values})
+    return alt.Chart(score_df).mark_bar(color=SNOW_BLUE).encode(
+        x=alt.X('Score:O', title='Score'),
+        y=alt.Y('Count:Q', title='Number of Fans'),
+        tooltip=['Score', 'Count']
+    ).properties(
+        title='Fan Satisfaction Scores',
+        width=300,
+        height=250
+    )
+
+
+def sentiment_score_scatter(rows: pd.DataFrame) -> alt.Chart:
+    """One point per fan: sentiment against score, colored by segment"""
+    return alt.Chart(rows).mark_circle(size=60).encode(
+        x=alt.X('AGGREGATE_SENTIMENT:Q', title='Sentiment'),
+        y=alt.Y('AGGREGATE_SCORE:Q', title='Score'),
+        color=alt.Color('SEGMENT:N', title='Segment'),
+        tooltip=['SEGMENT', 'MAIN_THEME', 'SECONDARY_THEME', 'AGGREGATE_SENTIMENT', 'AGGREGATE_SCORE']
+    ).properties(
+        title='Sentiment vs Satisfaction Score',
+        width=300,
+        height=250
+    )
+
+
+def category_sentiment_chart(sentiment_data: pd.DataFrame) -> alt.Chart:
+    """Average sentiment per experience category, from a one-column frame indexed by category label"""
+    sentiment_chart_df = sentiment_data.reset_index()
+    sentiment_chart_df.columns = ['Category', 'Average_Sentiment']
+    return alt.Chart(sentiment_chart_df).mark_bar().encode(
+        x=alt.X('Category:N', title='Category'),
+        y=alt.Y('Average_Sentiment:Q', title='Average Sentiment'),
+        color=alt.Color('Average_Sentiment:Q', scale=alt.Scale(scheme='blues'), title='Sentiment'),
+        tooltip=['Category', 'Average_Sentiment']
+    ).properties(
+        title='Average Sentiment by Category',
+        height=300
+    )
+
+
+def sentiment_trend_chart(daily_sentiment: pd.DataFrame) -> alt.Chart:
+    """Average sentiment per review date"""
+    return alt.Chart(daily_sentiment).mark_line(color=SNOW_BLUE).encode(
+        x=alt.X('REVIEW_DATE:T', title='Date'),
+        y=alt.Y('AGGREGATE_SENTIMENT:Q', title='Average Sentiment'),
+        tooltip=['REVIEW_DATE', 'AGGREGATE_SENTIMENT']
+    ).properties(
+        title='Daily Sentiment Trends',
+        height=250
+    )
+
+
+def sentiment_histogram(rows: pd.DataFrame) -> alt.Chart:
+    """Binned distribution of aggregate sentiment"""
+    return alt.Chart(rows).mark_bar(color=SNOW_BLUE).encode(
+        alt.X('AGGREGATE_SENTIMENT:Q', bin=alt.Bin(maxbins=20), title='Sentiment'),
+        y=alt.Y('count()', title='Count'),
+        tooltip=['count()']
+    ).properties(
+        title='Sentiment Distribution',
+        height=250
+    )
+
+
+def ranked_count_chart(counts: pd.Series, label: str, title: str, color: str = SNOW_BLUE) -> alt.Chart:
+    """Horizontal bars of fan counts, largest first"""
+    count_df = pd.DataFrame({label: counts.index, 'Count': counts.values})
+    return alt.Chart(count_df).mark_bar(color=color).encode(
+        x=alt.X('Count:Q', title='Count'),
+        y=alt.Y(f'{label}:N', sort='-x', title=label),
+        tooltip=[label, 'Count']
+    ).properties(
+        title=title,
+        height=300
+    )
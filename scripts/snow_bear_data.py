@@ -0,0 +1,384 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Scorecard data access for the Snow Bear dashboard.
+
+Sidebar filters are compiled into a parameterized WHERE clause so the
+warehouse only returns matching rows and the columns a tab needs. Every
+function takes a Snowpark-style session (anything with
+``session.sql(query, params=...).to_pandas()``), so the same code runs
+against a local SQLite or DuckDB connection wrapped in ``DBAPISession``.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from snow_bear_metrics import group_codes, group_sums
+
+SCORECARD_TABLE = "SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD"
+ROLLUP_TABLE = "SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD_ROLLUP"
+QUICK_INSIGHTS_TABLE = "SNOW_BEAR_DB.GOLD_LAYER.QUICK_INSIGHTS_SNAPSHOT"
+
+# Quick Insights lists: themes of low (pain points) and high (highlights) scores, and every segment
+QUICK_INSIGHTS = ["pain_points", "highlights", "segments"]
+QUICK_INSIGHTS_MAX_PAIN_SCORE = 2
+QUICK_INSIGHTS_MIN_HIGHLIGHT_SCORE = 4
+QUICK_INSIGHTS_TOP_N = 5
+
+# Grain and additive measures of the dashboard rollup built by the notebook
+ROLLUP_DIMENSIONS = ["REVIEW_DAY", "SEGMENT", "MAIN_THEME", "AGGREGATE_SCORE"]
+ROLLUP_MEASURES = ["FAN_COUNT", "SENTIMENT_COUNT", "SENTIMENT_SUM"]
+
+EXPERIENCE_CATEGORIES = [
+    'FOOD_OFFERING', 'GAME_EXPERIENCE', 'MERCHANDISE_OFFERING',
+    'MERCHANDISE_PRICING', 'OVERALL_EVENT', 'PARKING',
+    'SEAT_LOCATION', 'STADIUM_ACCESS'
+]
+SENTIMENT_COLUMNS = [f"{cat}_SENTIMENT" for cat in EXPERIENCE_CATEGORIES]
+
+# Columns each part of the app reads from QUALTRICS_SCORECARD
+TAB_COLUMNS = {
+    # Executive Dashboard, Sentiment Deep Dive, Theme & Segment Analysis
+    "dashboard": [
+        "ID", "REVIEW_DATE", "SEGMENT", "MAIN_THEME", "SECONDARY_THEME",
+        "AGGREGATE_SCORE", "AGGREGATE_SENTIMENT",
+    ] + SENTIMENT_COLUMNS,
+    # Fan Journey Explorer, fetched one fan at a time
+    "fan_journey": [
+        "ID", "SEGMENT", "SEGMENT_ALT", "MAIN_THEME", "SECONDARY_THEME",
+        "AGGREGATE_SCORE", "AGGREGATE_SENTIMENT",
+    ] + [f"{cat}_SCORE" for cat in EXPERIENCE_CATEGORIES] + SENTIMENT_COLUMNS + [
+        "FOOD_OFFERING_COMMENT", "GAME_EXPERIENCE_COMMENT", "MERCHANDISE_OFFERING_COMMENT",
+        "MERCHANDISE_PRICING_COMMENT", "OVERALL_EVENT_COMMENT", "PARKING_COMMENT",
+        "SEAT_LOCATION_COMMENT", "STADIUM_COMMENT",
+        "BUSINESS_RECOMMENDATION", "COMPLEX_RECOMMENDATION",
+    ],
+    "recommendations": ["ID", "BUSINESS_RECOMMENDATION"],
+    "search_fallback": ["ID", "AGGREGATE_COMMENT"],
+}
+
+# Low-cardinality labels stored as pandas categoricals
+CATEGORY_COLUMNS = ["SEGMENT", "SEGMENT_ALT", "MAIN_THEME", "SECONDARY_THEME", "ID"]
+
+
+@dataclass(frozen=True)
+class FilterState:
+    """Sidebar filter selections; hashable so it can be part of a cache key"""
+
+    start_date: date
+    end_date: date
+    segments: tuple = ()
+    themes: tuple = ()
+    sentiment_range: tuple = (-1.0, 1.0)
+    score_range: tuple = (1, 5)
+
+
+def _as_date(value) -> date:
+    return pd.Timestamp(value).date()
+
+
+def _placeholders(values) -> str:
+    return ", ".join("?" for _ in values)
+
+
+def like_pattern(term: str) -> str:
+    """Case-insensitive LIKE pattern for a literal substring, escaped with '!'"""
+    escaped = term.lower().replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return f"%{escaped}%"
+
+
+def compile_filters(filters: FilterState):
+    """Turn sidebar selections into a WHERE clause body and its bind parameters"""
+    conditions = [
+        "REVIEW_DATE >= ?",
+        "REVIEW_DATE < ?",
+        "AGGREGATE_SENTIMENT BETWEEN ? AND ?",
+        "AGGREGATE_SCORE BETWEEN ? AND ?",
+    ]
+    # End date is inclusive in the sidebar, so compare against the following day
+    params = [
+        _as_date(filters.start_date),
+        _as_date(filters.end_date) + timedelta(days=1),
+        float(filters.sentiment_range[0]),
+        float(filters.sentiment_range[1]),
+        int(filters.score_range[0]),
+        int(filters.score_range[1]),
+    ]
+    if filters.segments:
+        conditions.append(f"SEGMENT IN ({_placeholders(filters.segments)})")
+        params.extend(filters.segments)
+    if filters.themes:
+        conditions.append(f"MAIN_THEME IN ({_placeholders(filters.themes)})")
+        params.extend(filters.themes)
+    return " AND ".join(conditions), params
+
+
+def search_filter(filters: FilterState) -> dict:
+    """Sidebar selections as a Cortex Search attribute filter
+
+    Score and sentiment bounds are only sent when narrowed, so comments
+    without a score or sentiment stay searchable under the default ranges.
+    """
+    clauses = [
+        {"@gte": {"review_date": _as_date(filters.start_date).isoformat()}},
+        {"@lte": {"review_date": _as_date(filters.end_date).isoformat()}},
+    ]
+    if tuple(filters.score_range) != FilterState.score_range:
+        clauses.append({"@gte": {"aggregate_score": int(filters.score_range[0])}})
+        clauses.append({"@lte": {"aggregate_score": int(filters.score_range[1])}})
+    if tuple(filters.sentiment_range) != FilterState.sentiment_range:
+        clauses.append({"@gte": {"aggregate_sentiment": float(filters.sentiment_range[0])}})
+        clauses.append({"@lte": {"aggregate_sentiment": float(filters.sentiment_range[1])}})
+    if filters.segments:
+        clauses.append({"@or": [{"@eq": {"segment": segment}} for segment in filters.segments]})
+    if filters.themes:
+        clauses.append({"@or": [{"@eq": {"main_theme": theme}} for theme in filters.themes]})
+    return {"@and": clauses}
+
+
+def build_filtered_query(filters: FilterState, columns, table: str = SCORECARD_TABLE,
+                         extra_conditions=(), extra_params=(), order_by: str = "REVIEW_DATE DESC",
+                         limit: int = None):
+    """Build the projected, filtered SELECT for one tab"""
+    where_sql, params = compile_filters(filters)
+    for condition in extra_conditions:
+        where_sql += f" AND {condition}"
+    params = params + list(extra_params)
+    query = f"SELECT {', '.join(columns)} FROM {table} WHERE {where_sql}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    return query, params
+
+
+def fetch_filtered(session, filters: FilterState, columns, **query_options) -> pd.DataFrame:
+    """Fetch only the matching rows and requested columns"""
+    query, params = build_filtered_query(filters, columns, **query_options)
+    return session.sql(query, params=params).to_pandas()
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast a scorecard frame: categorical labels, int8 scores, float32 sentiments.
+
+    Scores arrive as VARCHAR from the bronze layer ('N/A' for missing) and
+    become nullable Int8. A label column is only converted to a categorical
+    when that is actually smaller (unique IDs usually are not). The memory
+    before and after is recorded in ``df.attrs["compaction"]``.
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if col in CATEGORY_COLUMNS:
+            as_category = values.astype("category")
+            if as_category.memory_usage(deep=True) < values.memory_usage(deep=True):
+                values = as_category
+        elif col.endswith("_SCORE"):
+            values = pd.to_numeric(values, errors="coerce").round().astype("Int8")
+        elif col.endswith("_SENTIMENT") or col.endswith("_SENTIMENT_SPREAD"):
+            values = pd.to_numeric(values, errors="coerce").astype("float32")
+        columns[col] = values
+    compact = pd.DataFrame(columns, index=df.index)
+    before, after = _frame_bytes(df), _frame_bytes(compact)
+    compact.attrs["compaction"] = {
+        "rows": len(compact),
+        "bytes_before": before,
+        "bytes_after": after,
+        "bytes_saved": before - after,
+    }
+    return compact
+
+
+def load_filter_options(session, table: str = SCORECARD_TABLE) -> dict:
+    """Date bounds, row count and distinct segments/themes for the sidebar widgets"""
+    bounds = session.sql(
+        f"SELECT MIN(REVIEW_DATE) AS MIN_DATE, MAX(REVIEW_DATE) AS MAX_DATE, COUNT(*) AS ROW_COUNT FROM {table}"
+    ).to_pandas()
+    segments = session.sql(
+        f"SELECT DISTINCT SEGMENT FROM {table} WHERE SEGMENT IS NOT NULL ORDER BY SEGMENT"
+    ).to_pandas()
+    themes = session.sql(
+        f"SELECT DISTINCT MAIN_THEME FROM {table} WHERE MAIN_THEME IS NOT NULL ORDER BY MAIN_THEME"
+    ).to_pandas()
+    return {
+        "min_date": bounds["MIN_DATE"].iloc[0],
+        "max_date": bounds["MAX_DATE"].iloc[0],
+        "row_count": int(bounds["ROW_COUNT"].iloc[0]),
+        "segments": segments["SEGMENT"].tolist(),
+        "themes": themes["MAIN_THEME"].tolist(),
+    }
+
+
+def load_fan_details(session, fan_id, table: str = SCORECARD_TABLE) -> pd.DataFrame:
+    """Scores, comments and recommendations for a single fan, fetched only when the fan is displayed"""
+    return session.sql(
+        f"SELECT {', '.join(TAB_COLUMNS['fan_journey'])} FROM {table} WHERE ID = ?", params=[fan_id]
+    ).to_pandas()
+
+
+def load_rollup(session, table: str = ROLLUP_TABLE) -> pd.DataFrame:
+    """The precomputed dashboard rollup (a few rows per day, segment, theme and score)"""
+    rollup = session.sql(
+        f"SELECT {', '.join(ROLLUP_DIMENSIONS + ROLLUP_MEASURES)} FROM {table}"
+    ).to_pandas()
+    rollup["REVIEW_DAY"] = pd.to_datetime(rollup["REVIEW_DAY"])
+    return rollup
+
+
+def quick_insights_select(scorecard: str = SCORECARD_TABLE, max_score=QUICK_INSIGHTS_MAX_PAIN_SCORE,
+                          min_score=QUICK_INSIGHTS_MIN_HIGHLIGHT_SCORE, top_n: int = QUICK_INSIGHTS_TOP_N) -> str:
+    """All three Quick Insights lists in one statement, one row per (INSIGHT, INSIGHT_RANK)
+
+    ``max_score`` and ``min_score`` are rendered as SQL: literals for the
+    snapshot table, or bind placeholders for a live query.
+    """
+    return f"""WITH THEME_INSIGHTS AS (
+    SELECT 'pain_points' AS INSIGHT, MAIN_THEME AS LABEL, AVG(AGGREGATE_SCORE) AS AVG_SCORE,
+           AVG(AGGREGATE_SENTIMENT) AS AVG_SENTIMENT, COUNT(*) AS FAN_COUNT
+    FROM {scorecard}
+    WHERE AGGREGATE_SCORE <= {max_score}
+    GROUP BY MAIN_THEME
+    UNION ALL
+    SELECT 'highlights', MAIN_THEME, AVG(AGGREGATE_SCORE), AVG(AGGREGATE_SENTIMENT), COUNT(*)
+    FROM {scorecard}
+    WHERE AGGREGATE_SCORE >= {min_score}
+    GROUP BY MAIN_THEME
+),
+RANKED AS (
+    SELECT INSIGHT, ROW_NUMBER() OVER (PARTITION BY INSIGHT ORDER BY FAN_COUNT DESC, LABEL) AS INSIGHT_RANK,
+           LABEL, AVG_SCORE, AVG_SENTIMENT, FAN_COUNT
+    FROM THEME_INSIGHTS
+    UNION ALL
+    SELECT 'segments', ROW_NUMBER() OVER (ORDER BY AVG(AGGREGATE_SCORE) DESC, SEGMENT), SEGMENT,
+           AVG(AGGREGATE_SCORE), AVG(AGGREGATE_SENTIMENT), COUNT(*)
+    FROM {scorecard}
+    GROUP BY SEGMENT
+)
+SELECT INSIGHT, INSIGHT_RANK, LABEL, AVG_SCORE, AVG_SENTIMENT, FAN_COUNT,
+       CAST(CURRENT_TIMESTAMP AS TIMESTAMP) AS COMPUTED_AT
+FROM RANKED
+WHERE INSIGHT = 'segments' OR INSIGHT_RANK <= {int(top_n)}"""
+
+
+def split_quick_insights(rows: pd.DataFrame) -> dict:
+    """{insight: ranked rows} plus "computed_at", from the snapshot table or a live quick_insights_select"""
+    rows = rows.sort_values(["INSIGHT", "INSIGHT_RANK"])
+    insights = {
+        insight: rows.loc[rows["INSIGHT"] == insight, ["LABEL", "AVG_SCORE", "AVG_SENTIMENT", "FAN_COUNT"]]
+        .reset_index(drop=True)
+        for insight in QUICK_INSIGHTS
+    }
+    insights["computed_at"] = pd.Timestamp(rows["COMPUTED_AT"].max()) if len(rows) else None
+    return insights
+
+
+def rollup_supports(filters: FilterState) -> bool:
+    """The rollup has no sentiment dimension, so it only answers the default sentiment range"""
+    return tuple(float(v) for v in filters.sentiment_range) == (-1.0, 1.0)
+
+
+def build_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Rollup-shaped counts built from already filtered scorecard rows"""
+    if df.empty:
+        return pd.DataFrame(columns=ROLLUP_DIMENSIONS + ROLLUP_MEASURES)
+    rows = df.assign(REVIEW_DAY=pd.to_datetime(df["REVIEW_DATE"]).dt.normalize())
+    codes, index = group_codes(rows, ROLLUP_DIMENSIONS, dropna=False)
+    fan_count = np.bincount(codes, minlength=len(index))
+    sentiment_sum, sentiment_count = group_sums(
+        codes, len(index), pd.to_numeric(rows["AGGREGATE_SENTIMENT"]).to_numpy(dtype=np.float64, na_value=np.nan), fan_count
+    )
+    rollup = index.to_frame(index=False)
+    rollup["FAN_COUNT"] = fan_count
+    rollup["SENTIMENT_COUNT"] = sentiment_count
+    rollup["SENTIMENT_SUM"] = sentiment_sum
+    return rollup
+
+
+def filter_rollup(rollup: pd.DataFrame, filters: FilterState) -> pd.DataFrame:
+    """Apply the sidebar filters to rollup rows"""
+    mask = (
+        (rollup["REVIEW_DAY"] >= pd.Timestamp(_as_date(filters.start_date)))
+        & (rollup["REVIEW_DAY"] <= pd.Timestamp(_as_date(filters.end_date)))
+        & rollup["AGGREGATE_SCORE"].between(filters.score_range[0], filters.score_range[1])
+    )
+    if filters.segments:
+        mask &= rollup["SEGMENT"].isin(filters.segments)
+    if filters.themes:
+        mask &= rollup["MAIN_THEME"].isin(filters.themes)
+    return rollup[mask]
+
+
+def rollup_metrics(rollup: pd.DataFrame, by: str = None) -> pd.DataFrame:
+    """Re-aggregate rollup rows into fan count, average score/sentiment and satisfaction %"""
+    score = rollup["AGGREGATE_SCORE"]
+    counts = rollup["FAN_COUNT"]
+    parts = pd.DataFrame({
+        "FAN_COUNT": counts,
+        "SCORED_COUNT": counts.where(score.notna(), 0),
+        "SCORE_SUM": (score * counts).fillna(0),
+        "SATISFIED_COUNT": counts.where(score >= 4, 0),
+        "SENTIMENT_COUNT": rollup["SENTIMENT_COUNT"],
+        "SENTIMENT_SUM": rollup["SENTIMENT_SUM"],
+    })
+    if by:
+        parts[by] = rollup[by]
+        totals = parts.groupby(by).sum()
+    else:
+        totals = parts.sum().to_frame().T
+    totals = totals.astype("float64")
+    return pd.DataFrame({
+        "FAN_COUNT": totals["FAN_COUNT"].astype("int64"),
+        "AVG_SCORE": totals["SCORE_SUM"] / totals["SCORED_COUNT"],
+        "AVG_SENTIMENT": totals["SENTIMENT_SUM"] / totals["SENTIMENT_COUNT"],
+        "SATISFACTION_PCT": totals["SATISFIED_COUNT"] / totals["FAN_COUNT"] * 100,
+    })
+
+
+class _DBAPIResult:
+    def __init__(self, connection, query, params):
+        self._connection = connection
+        self._query = query
+        self._params = list(params or [])
+
+    def _execute(self):
+        # Connection.execute keeps statements on one transaction for both sqlite3 and duckdb
+        cursor = self._connection.execute(self._query, self._params)
+        columns = [d[0].upper() for d in cursor.description] if cursor.description else []
+        return columns, cursor.fetchall() if columns else []
+
+    def to_pandas(self) -> pd.DataFrame:
+        columns, rows = self._execute()
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    def collect(self):
+        columns, rows = self._execute()
+        return [dict(zip(columns, row)) for row in rows]
+
+
+class DBAPISession:
+    """Snowpark-style ``sql(...).to_pandas()`` over a DB-API connection such as sqlite3 or duckdb"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def sql(self, query: str, params=None):
+        return _DBAPIResult(self.connection, query, params)
@@ -0,0 +1,546 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Load test of the Snow Bear app with concurrent simulated users.
+
+Every simulated user is its own browser session: an AppTest instance of
+snow_bear.py on a thread of a worker process. Users on a worker share the
+app's cache_resource backend and data cache, the way sessions share one
+Streamlit server. Users replay interaction scripts: filter changes, view
+switches, searches and Analyst questions, with a random think time
+between steps. Each script starts with the page load. Requests go to the
+local backend, with ``--cortex-latency`` seconds added to each Cortex
+stand-in call.
+
+AppTest swaps process-global Streamlit state (the runtime and config
+options) on every run, so script runs on one worker take turns: with more
+than one user per worker the app mode measures queueing for that turn,
+not contention in the app. The queue wait is reported apart from the
+latency and the service time. Use ``--processes`` to spread the users
+over several workers, like several server replicas, each with its own
+backend.
+
+``--mode backend`` replays the same scenarios without Streamlit: users on
+a worker call the views' data pipelines (snow_bear_benchmark), search and
+Analyst concurrently through one shared backend and DataCache, as the
+app's sessions do, so lock and single-flight contention in the cache and
+backend is actually exercised. It has no session state to measure.
+
+The report covers throughput (steps and script runs per second), step
+latency percentiles by kind, the growth of each user's session state
+between the page load and the last step, and each worker's resident
+memory (current RSS from /proc, on Linux). RSS is read after a garbage
+collection before the users start and again once they are done, and a
+background thread samples it during the run: the peak is the highest
+sample, the steady state the median of the samples taken after the
+ramp-up, when every user is active::
+
+    python snow_bear_loadtest.py --users 50 --processes 4 --duration 300 --cortex-latency 0.5
+    python snow_bear_loadtest.py --mode backend --users 50 --duration 300 --cortex-latency 0.5
+"""
+
+import argparse
+import dataclasses
+import gc
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+import snow_bear_benchmark as sb_benchmark
+from snow_bear_backend import BACKEND_ENV, LOCAL_LATENCY_ENV, create_backend, normalize_search_query
+from snow_bear_cache import DataCache, estimate_nbytes
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snow_bear.py")
+# Semantic model the backend mode's Analyst questions name
+SEMANTIC_MODEL_FILE = "snow_bear_fan_360.yaml"
+
+# AppTest runs are not safe to overlap within a process
+_RUN_LOCK = threading.Lock()
+
+# Interaction scripts: (step kind, argument) pairs replayed after the page load
+SCENARIOS = {
+    "executive": [
+        ("view", "Executive Dashboard"),
+        ("score_filter", (3, 5)),
+        ("view", "Sentiment Deep Dive"),
+        ("segment_filter", 2),
+        ("view", "Theme & Segment Analysis"),
+        ("score_filter", (1, 5)),
+        ("view", "Fan Journey Explorer"),
+    ],
+    "search": [
+        ("view", "Interactive Search"),
+        ("search", "parking issues"),
+        ("search", "food quality"),
+        ("segment_filter", 3),
+        ("search", "long lines at the concourse"),
+        ("view", "Recommendation Engine"),
+    ],
+    "analyst": [
+        ("view", "AI Assistant"),
+        ("ask", "What drives fan satisfaction?"),
+        ("ask", "Which segments are most engaged?"),
+        ("ask", "Fan count and average score by main theme"),
+        ("view", "Executive Dashboard"),
+    ],
+}
+DEFAULT_MIX = ["executive", "executive", "search", "analyst"]
+
+
+def _widget(widgets, label: str):
+    return next(widget for widget in widgets if widget.label.startswith(label))
+
+
+def _view(at, name: str):
+    radio = at.radio(key="active_view")
+    radio.set_value(next(option for option in radio.options if option.endswith(name)))
+
+
+def _score_filter(at, score_range):
+    _widget(at.sidebar.slider, "Satisfaction Score").set_range(*score_range)
+
+
+def _segment_filter(at, count: int):
+    segments = _widget(at.sidebar.multiselect, "Fan Segments")
+    segments.set_value(segments.options[:count])
+
+
+def _search(at, query: str):
+    # Fill the form first, then submit: the rerun sends both together
+    _widget(at.text_input, "🔍 Search fan comments").input(query)
+    _widget(at.button, "🔍 AI Search").click()
+
+
+def _ask(at, question: str):
+    _widget(at.text_area, "Ask your Snowbear fan data").input(question)
+    _widget(at.button, "🤖 Ask AI Assistant").click()
+
+
+STEPS = {
+    "view": _view,
+    "score_filter": _score_filter,
+    "segment_filter": _segment_filter,
+    "search": _search,
+    "ask": _ask,
+}
+
+
+RSS_SAMPLE_INTERVAL = 0.25
+
+# Session state entries holding the backend, whose memory is outside Python or shared by every session
+SHARED_STATE_KEYS = {"backend"}
+
+
+def _object_nbytes(value, seen: set) -> int:
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        return sys.getsizeof(value) + sum(_object_nbytes(item, seen) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_object_nbytes(k, seen) + _object_nbytes(v, seen) for k, v in value.items())
+    if hasattr(value, "__dict__") and not hasattr(value, "memory_usage"):
+        return sys.getsizeof(value) + _object_nbytes(vars(value), seen)
+    return estimate_nbytes(value)
+
+
+def session_state_bytes(at) -> int:
+    """Best-effort size of one user's session state, following plain objects' attributes"""
+    seen = set()
+    return sum(_object_nbytes(value, seen) for key, value in at.session_state.items() if key not in SHARED_STATE_KEYS)
+
+
+def rss_bytes():
+    """Current resident set size of this process, or None where /proc is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+class RssSampler(threading.Thread):
+    """Samples this process's current RSS every ``interval`` seconds until stopped"""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.samples = []
+        self._interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            self.samples.append((time.monotonic(), rss_bytes()))
+            self._stopped.wait(self._interval)
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    def summary(self, before: int, after: int, steady_from: float) -> dict:
+        """{"before", "peak", "steady", "after"} in bytes; steady is the median sample from ``steady_from`` on"""
+        values = [rss for _, rss in self.samples] + [before, after]
+        steady = [rss for at, rss in self.samples if at >= steady_from] or values
+        return {"before": before, "peak": max(values), "steady": int(np.median(steady)), "after": after}
+
+
+class UserResult:
+    """Step timings (kind, latency, service time), errors and session-state sizes of one simulated user"""
+
+    def __init__(self, user: int, scenario: str):
+        self.user = user
+        self.scenario = scenario
+        self.steps = []
+        self.errors = []
+        self.state_bytes = []
+        self.runs = 0
+
+
+class SimulatedUser(threading.Thread):
+    """One browser session replaying a scenario until the deadline"""
+
+    def __init__(self, user: int, scenario: str, deadline: float, start_delay: float,
+                 think_time: float, timeout: float, seed: int = 0):
+        super().__init__(name=f"user-{user}", daemon=True)
+        self.result = UserResult(user, scenario)
+        self._deadline = deadline
+        self._start_delay = start_delay
+        self._think_time = think_time
+        self._timeout = timeout
+        self._rng = random.Random(seed * 1000 + user)
+
+    def _step(self, at, kind: str, argument=None):
+        from streamlit.testing.v1 import AppTest
+
+        started = time.perf_counter()
+        with _RUN_LOCK:
+            served = time.perf_counter()
+            try:
+                if kind == "open":
+                    at = AppTest.from_file(APP_SCRIPT, default_timeout=self._timeout)
+                else:
+                    STEPS[kind](at, argument)
+                at.run()
+                if at.exception:
+                    self.result.errors.append(f"{kind}: {at.exception[0].value}")
+            except Exception as e:
+                self.result.errors.append(f"{kind}: {type(e).__name__}: {str(e)}")
+            finished = time.perf_counter()
+        self.result.steps.append((kind, finished - started, finished - served))
+        return at
+
+    def run(self):
+        time.sleep(self._start_delay)
+        while time.monotonic() < self._deadline:
+            at = self._step(None, "open")
+            with _RUN_LOCK:
+                self.result.state_bytes.append(session_state_bytes(at))
+            for kind, argument in SCENARIOS[self.result.scenario]:
+                if time.monotonic() >= self._deadline:
+                    break
+                time.sleep(self._rng.expovariate(1 / self._think_time) if self._think_time else 0)
+                at = self._step(at, kind, argument)
+            with _RUN_LOCK:
+                self.result.state_bytes.append(session_state_bytes(at))
+            self.result.runs += 1
+
+
+class _CachedResult:
+    def __init__(self, cache: DataCache, key, result):
+        self._cache = cache
+        self._key = key
+        self._result = result
+
+    def to_pandas(self):
+        return self._cache.get_or_load("scorecard", self._key + ("to_pandas",), self._result.to_pandas)
+
+    def collect(self):
+        return self._cache.get_or_load("scorecard", self._key + ("collect",), self._result.collect)
+
+
+class CachedSession:
+    """Session whose results go through a shared DataCache keyed on the statement, as the app caches them"""
+
+    def __init__(self, backend, cache: DataCache):
+        self._backend = backend
+        self._cache = cache
+
+    def sql(self, query: str, params=None):
+        version = self._backend.table_version("GOLD_LAYER", "QUALTRICS_SCORECARD")
+        return _CachedResult(self._cache, (query, tuple(params or ()), version), self._backend.session.sql(query, params=params))
+
+
+class BackendUser(SimulatedUser):
+    """A session replaying a scenario straight against the worker's shared backend and data cache"""
+
+    def __init__(self, user: int, scenario: str, deadline: float, start_delay: float,
+                 think_time: float, backend, cache: DataCache, filters, seed: int = 0):
+        super().__init__(user, scenario, deadline, start_delay, think_time, timeout=0, seed=seed)
+        self._backend = backend
+        self._cache = cache
+        self._session = CachedSession(backend, cache)
+        self._default_filters = filters
+
+    def _render(self, state):
+        pipeline = sb_benchmark.VIEW_PIPELINES.get(state["view"])
+        if pipeline:
+            pipeline(self._session, state["filters"], sb_benchmark.StageTimer())
+
+    def _search(self, query: str):
+        query = normalize_search_query(query)
+        version = self._backend.search_version()
+        return self._cache.get_or_load("search", (query, version), lambda: self._backend.search(query))
+
+    def _ask(self, question: str):
+        response = self._backend.analyst_message(
+            [{"role": "user", "content": [{"type": "text", "text": question}]}], SEMANTIC_MODEL_FILE
+        )
+        statement = next(item["statement"] for item in response["message"]["content"] if item["type"] == "sql")
+        return self._session.sql(statement).to_pandas()
+
+    def _step(self, state, kind: str, argument=None):
+        started = time.perf_counter()
+        try:
+            if kind == "open":
+                state = {"view": "Executive Dashboard", "filters": self._default_filters}
+                self._render(state)
+            elif kind == "view":
+                state["view"] = argument
+                self._render(state)
+            elif kind == "score_filter":
+                state["filters"] = dataclasses.replace(state["filters"], score_range=tuple(argument))
+                self._render(state)
+            elif kind == "segment_filter":
+                options = sb_benchmark.sb_data.load_filter_options(self._session)["segments"]
+                state["filters"] = dataclasses.replace(state["filters"], segments=tuple(options[:argument]))
+                self._render(state)
+            elif kind == "search":
+                self._search(argument)
+            elif kind == "ask":
+                self._ask(argument)
+        except Exception as e:
+            self.result.errors.append(f"{kind}: {type(e).__name__}: {str(e)}")
+        # Nothing to queue for: the whole step is service time
+        seconds = time.perf_counter() - started
+        self.result.steps.append((kind, seconds, seconds))
+        return state
+
+    def run(self):
+        time.sleep(self._start_delay)
+        while time.monotonic() < self._deadline:
+            state = self._step(None, "open")
+            for kind, argument in SCENARIOS[self.result.scenario]:
+                if time.monotonic() >= self._deadline:
+                    break
+                time.sleep(self._rng.expovariate(1 / self._think_time) if self._think_time else 0)
+                state = self._step(state, kind, argument)
+            self.result.runs += 1
+
+
+def _percentiles(seconds) -> dict:
+    ms = np.asarray(seconds) * 1000
+    return {
+        "count": len(ms),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def summarize(results, elapsed: float, rss: dict = None) -> dict:
+    """Throughput, latency percentiles by step kind, and memory growth per session
+
+    ``rss`` is the workers' summed RSS summary, or None where RSS cannot be read.
+    """
+    steps = [step for result in results for step in result.steps]
+    by_kind = {}
+    for kind, latency, _ in steps:
+        by_kind.setdefault(kind, []).append(latency)
+    # Growth of each page load's session state by the end of its script
+    growth = [
+        after - before
+        for result in results
+        for before, after in zip(result.state_bytes[::2], result.state_bytes[1::2])
+    ]
+    return {
+        "users": len(results),
+        "elapsed_s": elapsed,
+        "steps": len(steps),
+        "scripts": sum(result.runs for result in results),
+        "steps_per_s": len(steps) / elapsed if elapsed else 0.0,
+        "errors": [f"user {result.user} ({result.scenario}) {error}" for result in results for error in result.errors],
+        "latency": {"all": _percentiles([latency for _, latency, _ in steps]), **{
+            kind: _percentiles(latencies) for kind, latencies in sorted(by_kind.items())
+        }} if steps else {},
+        "service": _percentiles([service for _, _, service in steps]) if steps else {},
+        # Time spent waiting for a turn on the worker's AppTest lock
+        "queue_wait": _percentiles([latency - service for _, latency, service in steps]) if steps else {},
+        "session_growth_bytes": {
+            "p50": float(np.percentile(growth, 50)),
+            "max": float(np.max(growth)),
+        } if growth else {},
+        "rss_bytes": rss,
+        "rss_growth_bytes": {
+            "peak": rss["peak"] - rss["before"],
+            "steady": rss["steady"] - rss["before"],
+            "after": rss["after"] - rss["before"],
+        } if rss else {},
+        "rss_per_user_bytes": (rss["steady"] - rss["before"]) / len(results) if rss and results else 0,
+    }
+
+
+def run_users(assignments, users: int, duration: float, ramp_up: float, think_time: float,
+              timeout: float, seed: int, mode: str = "app") -> dict:
+    """One worker: a warm-up page load, then a thread per (user, scenario) assignment"""
+    # Build the shared backend and caches once, as the first visitor of a fresh server would
+    started = time.perf_counter()
+    if mode == "backend":
+        backend = create_backend()
+        cache = DataCache()
+        filters = sb_benchmark.default_filters(CachedSession(backend, cache))
+        BackendUser(-1, "executive", 0, 0, 0, backend, cache, filters)._step(None, "open")
+    else:
+        from streamlit.testing.v1 import AppTest
+
+        AppTest.from_file(APP_SCRIPT, default_timeout=timeout).run()
+    warm_up = time.perf_counter() - started
+
+    # Collect the warm-up's garbage so it is neither counted nor freed during the run
+    gc.collect()
+    rss_before = rss_bytes()
+    sampler = RssSampler() if rss_before is not None else None
+    steady_from = time.monotonic() + ramp_up
+    deadline = steady_from + duration
+    if mode == "backend":
+        threads = [
+            BackendUser(user, scenario, deadline, ramp_up * user / users, think_time, backend, cache, filters, seed)
+            for user, scenario in assignments
+        ]
+    else:
+        threads = [
+            SimulatedUser(user, scenario, deadline, ramp_up * user / users, think_time, timeout, seed)
+            for user, scenario in assignments
+        ]
+    started = time.perf_counter()
+    if sampler:
+        sampler.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    rss = None
+    if sampler:
+        sampler.stop()
+        gc.collect()
+        rss = sampler.summary(rss_before, rss_bytes(), steady_from)
+    return {
+        "results": [thread.result for thread in threads],
+        "elapsed_s": elapsed,
+        "warm_up_s": warm_up,
+        "rss_bytes": rss,
+    }
+
+
+def run_load_test(users: int, duration: float, ramp_up: float = 10.0, think_time: float = 1.0,
+                  mix=None, timeout: float = 120.0, seed: int = 0, processes: int = 1, mode: str = "app") -> dict:
+    """Run ``users`` simulated sessions for ``duration`` seconds, spread over ``processes`` workers"""
+    mix = mix or DEFAULT_MIX
+    assignments = [(user, mix[user % len(mix)]) for user in range(users)]
+    chunks = [assignments[i::processes] for i in range(min(processes, users))]
+    users_per_process = max(len(chunk) for chunk in chunks)
+    if mode == "app" and users_per_process > 1:
+        print(f"WARNING: up to {users_per_process} users per worker take turns on one AppTest lock; their "
+              f"latency is mostly queue wait, not contention in the app. Use --processes {users} or --mode backend.")
+    arguments = [(chunk, users, duration, ramp_up, think_time, timeout, seed, mode) for chunk in chunks]
+    if len(chunks) == 1:
+        workers = [run_users(*arguments[0])]
+    else:
+        # Fresh interpreters, so no worker inherits another's Streamlit state
+        with multiprocessing.get_context("spawn").Pool(len(chunks)) as pool:
+            workers = pool.starmap(run_users, arguments)
+    for i, worker in enumerate(workers):
+        print(f"worker {i}: {len(chunks[i])} users, warm-up page load {worker['warm_up_s']:6.1f} s")
+    # Workers are separate processes: their RSS adds up (peaks are summed as an upper bound)
+    rss = None
+    if all(worker["rss_bytes"] for worker in workers):
+        rss = {key: sum(worker["rss_bytes"][key] for worker in workers) for key in workers[0]["rss_bytes"]}
+    report = summarize(
+        [result for worker in workers for result in worker["results"]],
+        max(worker["elapsed_s"] for worker in workers),
+        rss,
+    )
+    report["processes"] = len(workers)
+    report["users_per_process"] = users_per_process
+    report["mode"] = mode
+    return report
+
+
+def print_report(report: dict):
+    print(f"{report['users']} users on {report['processes']} workers ({report['mode']} mode)  {report['elapsed_s']:.1f} s  "
+          f"{report['steps']} steps  {report['scripts']} scripts  {report['steps_per_s']:.2f} steps/s  "
+          f"{len(report['errors'])} errors")
+    rows = list(report["latency"].items())
+    if report["service"]:
+        rows += [("service time", report["service"]), ("queue wait", report["queue_wait"])]
+    for kind, stats in rows:
+        print(f"  {kind:<15} n {stats['count']:>6}  p50 {stats['p50_ms']:8.1f} ms  p95 {stats['p95_ms']:8.1f} ms  "
+              f"p99 {stats['p99_ms']:8.1f} ms  max {stats['max_ms']:8.1f} ms")
+    if report["session_growth_bytes"]:
+        print(f"  session state growth per script  p50 {report['session_growth_bytes']['p50'] / 1024:8.1f} KB  "
+              f"max {report['session_growth_bytes']['max'] / 1024:8.1f} KB")
+    if report["rss_bytes"]:
+        growth = {key: value / 1024 / 1024 for key, value in report["rss_growth_bytes"].items()}
+        print(f"  RSS {report['rss_bytes']['before'] / 1024 / 1024:.1f} MB before the users, growth: "
+              f"peak {growth['peak']:+.1f} MB  steady {growth['steady']:+.1f} MB  after {growth['after']:+.1f} MB  "
+              f"({report['rss_per_user_bytes'] / 1024 / 1024:.1f} MB per user at steady state)")
+    else:
+        print("  RSS not available on this platform")
+    if report["mode"] == "app" and report["users_per_process"] > 1:
+        print(f"  WARNING: {report['users_per_process']} users per worker were serialized; see the queue wait")
+    for error in report["errors"][:10]:
+        print(f"  ERROR {error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay concurrent user sessions against the app on the local backend")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--mode", choices=["app", "backend"], default="app",
+                        help="replay through AppTest script runs, or straight against the shared backend and cache")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes the users are spread over")
+    parser.add_argument("--duration", type=float, default=120.0, help="seconds of load after the ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="seconds over which users arrive")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean pause between a user's steps")
+    parser.add_argument("--mix", nargs="+", choices=list(SCENARIOS), default=DEFAULT_MIX,
+                        help="scenarios assigned to users round-robin")
+    parser.add_argument("--cortex-latency", type=float, default=0.0, help="seconds added to each local Cortex call")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed for one script run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Inherited by the spawned workers
+    os.environ[BACKEND_ENV] = "local"
+    os.environ[LOCAL_LATENCY_ENV] = str(args.cortex_latency)
+    report = run_load_test(args.users, args.duration, args.ramp_up, args.think_time, args.mix, args.timeout,
+                           args.seed, args.processes, args.mode)
+    print_report(report)
+    sys.exit(1 if report["errors"] else 0)
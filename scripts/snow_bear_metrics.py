@@ -0,0 +1,226 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Vectorized dashboard aggregations.
+
+Rows are mapped to integer group codes once (categorical codes or
+pd.factorize), then every metric is a NumPy bincount over those codes.
+This replaces pandas groupby().apply(lambda ...) and repeated groupby
+passes over the same frame.
+
+tests/test_snow_bear_metrics.py pins the results to the previous pandas
+implementation. Run ``python snow_bear_metrics.py`` to time both on
+synthetic data.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+# Dense product-space codes are used up to this many possible groups
+_MAX_DENSE_GROUPS = 1 << 24
+
+
+def _factorize(series: pd.Series, dropna: bool):
+    """Sorted labels and codes for one key column; missing keys get -1, or their own group when dropna is False"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        labels = series.cat.categories
+    else:
+        codes, labels = pd.factorize(series, sort=True)
+        codes = codes.astype(np.int64)
+    if not dropna and (codes < 0).any():
+        codes = np.where(codes < 0, len(labels), codes)
+        labels = labels.append(pd.Index([np.nan]))
+    return codes, pd.Index(labels, name=series.name)
+
+
+def group_codes(df: pd.DataFrame, by, dropna: bool = True):
+    """Map every row to a group code; returns (codes, index of observed groups).
+
+    Rows whose key is missing get code -1 when dropna is True, matching
+    pandas groupby defaults. Unobserved categories are not returned.
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    parts = [_factorize(df[key], dropna) for key in keys]
+    sizes = [len(labels) for _, labels in parts]
+
+    valid = np.ones(len(df), dtype=bool)
+    dense = np.zeros(len(df), dtype=np.int64)
+    for codes, labels in parts:
+        valid &= codes >= 0
+        dense = dense * len(labels) + np.maximum(codes, 0)
+
+    total = int(np.prod(sizes, dtype=np.int64)) if sizes else 0
+    if total <= _MAX_DENSE_GROUPS:
+        present = np.bincount(dense[valid], minlength=total)
+        observed = np.flatnonzero(present)
+        remap = np.full(total, -1, dtype=np.int64)
+        remap[observed] = np.arange(len(observed))
+        codes = np.where(valid, remap[dense], -1)
+    else:
+        observed, inverse = np.unique(dense[valid], return_inverse=True)
+        codes = np.full(len(df), -1, dtype=np.int64)
+        codes[valid] = inverse
+
+    if len(parts) == 1:
+        index = parts[0][1][observed]
+    else:
+        level_codes = np.unravel_index(observed, sizes)
+        levels, final_codes = [], []
+        for (_, labels), level_code in zip(parts, level_codes):
+            # MultiIndex levels cannot hold NaN, so missing keys use code -1
+            if labels.hasnans:
+                level_code = np.where(level_code == len(labels) - 1, -1, level_code)
+                labels = labels[:-1]
+            levels.append(labels)
+            final_codes.append(level_code)
+        index = pd.MultiIndex(levels=levels, codes=final_codes, names=keys)
+    return codes, index
+
+
+def group_sums(codes: np.ndarray, n_groups: int, values, group_sizes=None) -> tuple:
+    """NaN-skipping per-group sums and non-null counts; rows with code -1 are ignored.
+
+    ``group_sizes`` (the bincount of ``codes``) is reused as the count when
+    the column has no missing values, saving a pass.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if (codes < 0).any():
+        keep = codes >= 0
+        codes, values = codes[keep], values[keep]
+    missing = np.isnan(values)
+    if missing.any():
+        sums = np.bincount(codes, weights=np.where(missing, 0.0, values), minlength=n_groups)
+        counts = np.bincount(codes, weights=~missing, minlength=n_groups).astype(np.int64)
+    else:
+        sums = np.bincount(codes, weights=values, minlength=n_groups)
+        counts = group_sizes if group_sizes is not None else np.bincount(codes, minlength=n_groups)
+    return sums, counts
+
+
+def _as_float(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _mean(sums, counts):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def group_metrics(df: pd.DataFrame, by=None, score_col: str = "AGGREGATE_SCORE",
+                  sentiment_col: str = "AGGREGATE_SENTIMENT", category_cols=(),
+                  satisfied_at: int = 4, dropna: bool = True) -> pd.DataFrame:
+    """Fan count, mean score, mean sentiment, satisfaction % and per-category means in one pass.
+
+    Satisfaction % is the share of rows in the group with a score of at
+    least ``satisfied_at`` (missing scores count as not satisfied), the
+    same as ``groupby(...)[score].apply(lambda x: (x >= 4).mean() * 100)``.
+    With ``by=None`` a single row summarizing the whole frame is returned.
+    """
+    if by is None:
+        codes = np.zeros(len(df), dtype=np.int64)
+        index = pd.RangeIndex(1)
+    else:
+        codes, index = group_codes(df, by, dropna=dropna)
+    n_groups = len(index)
+
+    # Drop rows with missing keys once, then every metric is a single bincount
+    keep = codes >= 0 if (codes < 0).any() else slice(None)
+    codes = codes[keep]
+
+    def column(name):
+        return _as_float(df[name])[keep]
+
+    fan_count = np.bincount(codes, minlength=n_groups)
+    score = column(score_col)
+    score_sums, score_counts = group_sums(codes, n_groups, score, fan_count)
+    with np.errstate(invalid="ignore"):
+        satisfied = np.bincount(codes, weights=score >= satisfied_at, minlength=n_groups)
+    sentiment_sums, sentiment_counts = group_sums(codes, n_groups, column(sentiment_col), fan_count)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        satisfaction = np.where(fan_count > 0, satisfied / np.maximum(fan_count, 1) * 100, np.nan)
+    result = {
+        "FAN_COUNT": fan_count.astype(np.int64),
+        "AVG_SCORE": _mean(score_sums, score_counts),
+        "AVG_SENTIMENT": _mean(sentiment_sums, sentiment_counts),
+        "SATISFACTION_PCT": satisfaction,
+    }
+    for col in category_cols:
+        result[col] = _mean(*group_sums(codes, n_groups, column(col), fan_count))
+    return pd.DataFrame(result, index=index)
+
+
+def _pandas_metrics(df: pd.DataFrame, by: str, category_cols) -> pd.DataFrame:
+    """Previous dashboard implementation, kept here as the reference for checks"""
+    metrics = df.groupby(by).agg({
+        'AGGREGATE_SCORE': 'mean',
+        'AGGREGATE_SENTIMENT': 'mean',
+        'ID': 'count'
+    })
+    metrics.columns = ['AVG_SCORE', 'AVG_SENTIMENT', 'FAN_COUNT']
+    metrics['SATISFACTION_PCT'] = df.groupby(by)['AGGREGATE_SCORE'].apply(lambda x: (x >= 4).mean() * 100)
+    category_means = df.groupby(by)[list(category_cols)].mean()
+    return metrics.join(category_means)
+
+
+def synthetic_scorecard(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Scorecard-shaped frame with the value ranges of the gold layer"""
+    from snow_bear_data import SENTIMENT_COLUMNS
+
+    rng = np.random.default_rng(seed)
+    segments = ['Premium Experience Seeker', 'Loyal Supporter', 'Convenience-Driven Fan',
+                'Value-Conscious Fan', 'Experience Critic', 'Occasional Attendee']
+    themes = ['Food & Concessions', 'Game Experience', 'Parking', 'Stadium Access',
+              'Seat Location', 'Overall Event', 'Merchandise Quality']
+    df = pd.DataFrame({
+        "ID": np.arange(rows).astype(str),
+        "SEGMENT": rng.choice(segments, rows),
+        "MAIN_THEME": rng.choice(themes, rows),
+        "AGGREGATE_SCORE": rng.integers(1, 6, rows).astype(np.float64),
+        "AGGREGATE_SENTIMENT": rng.uniform(-1, 1, rows).round(2),
+    })
+    for col in SENTIMENT_COLUMNS:
+        df[col] = rng.uniform(-1, 1, rows).round(2)
+    # Sprinkle missing values the way the bronze 'N/A' scores produce them
+    df.loc[df.sample(frac=0.01, random_state=seed).index, "AGGREGATE_SCORE"] = np.nan
+    return df
+
+
+def _time_metrics(rows: int):
+    from snow_bear_data import SENTIMENT_COLUMNS
+
+    df = synthetic_scorecard(rows)
+    for by in ("SEGMENT", "MAIN_THEME"):
+        start = time.perf_counter()
+        _pandas_metrics(df, by, SENTIMENT_COLUMNS)
+        pandas_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        group_metrics(df, by, category_cols=SENTIMENT_COLUMNS)
+        vectorized_seconds = time.perf_counter() - start
+
+        print(f"{rows:>12,} rows  by {by:<10}  pandas {pandas_seconds * 1000:9.1f} ms  "
+              f"vectorized {vectorized_seconds * 1000:9.1f} ms  speedup {pandas_seconds / vectorized_seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized dashboard metrics against pandas groupby")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    for rows in parser.parse_args().rows:
+        _time_metrics(rows)
@@ -0,0 +1,363 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming AI narratives for the Snow Bear app.
+
+NarrativeStream reads text chunks from a streaming Cortex Complete call on
+a worker thread, so the page can render tokens as they arrive while the
+reader enforces a first-token and a total timeout. It stops early when
+cancelled, including when Streamlit interrupts the script because the user
+clicked Stop. FakeStreamingLLM stands in for Cortex so time to first token
+can be measured offline::
+
+    python snow_bear_narrative.py --ttft 1.5 --tokens-per-second 30
+
+build_context() summarizes an Analyst result for the prompt. Instead of
+the first 50 rows, it sends per-column statistics, top categories, a
+stratified sample and trend deltas, shrunk to fit a token budget::
+
+    python snow_bear_narrative.py --context-report
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from snow_bear_analyst import estimate_tokens
+
+_DONE = object()
+
+DEFAULT_NARRATIVE = (
+    "Fans in the largest segments drive most of the volume, so start with them. "
+    "Average scores are stable across most themes, with parking and food pricing as the clear outliers. "
+    "The lowest-scoring theme deserves a follow-up survey and a targeted fix before the next home stand."
+)
+
+
+def _round(value, digits: int = 4):
+    """JSON-friendly number with a few significant digits"""
+    if value is None or pd.isna(value):
+        return None
+    value = float(value)
+    return int(value) if value.is_integer() else float(f"{value:.{digits}g}")
+
+
+def _json_value(value):
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, (np.integer, np.floating, int, float)):
+        return _round(value)
+    return str(value)
+
+
+def _time_column(df: pd.DataFrame):
+    """First datetime column, or a date-named column that parses as dates"""
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            return column
+    for column in df.columns:
+        if any(word in column.upper() for word in ("DATE", "MONTH", "DAY", "WEEK")):
+            parsed = pd.to_datetime(df[column], errors="coerce")
+            if parsed.notna().mean() > 0.9:
+                return column
+    return None
+
+
+def column_stats(df: pd.DataFrame, top_k: int = 5) -> dict:
+    """Per-column summary: numeric spread, category frequencies or date range"""
+    stats = {}
+    for column in df.columns:
+        series = df[column]
+        entry = {"nulls": int(series.isna().sum())}
+        if pd.api.types.is_bool_dtype(series):
+            entry["true"] = int(series.sum())
+        elif pd.api.types.is_numeric_dtype(series):
+            described = series.describe()
+            entry.update(
+                min=_round(described.get("min")), max=_round(described.get("max")),
+                mean=_round(described.get("mean")), median=_round(series.median()),
+            )
+            if series.count():
+                entry["sum"] = _round(series.sum())
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            entry.update(min=_json_value(series.min()), max=_json_value(series.max()))
+        else:
+            counts = series.astype("string").value_counts()
+            entry["distinct"] = int(len(counts))
+            entry["top"] = {str(k): int(v) for k, v in counts.head(top_k).items()}
+        stats[column] = entry
+    return stats
+
+
+def stratified_sample(df: pd.DataFrame, rows: int, seed: int = 7) -> pd.DataFrame:
+    """Up to ``rows`` rows covering every group of the first low-cardinality text column
+
+    Falls back to evenly spaced rows, so the sample spans the whole
+    result instead of its head.
+    """
+    if len(df) <= rows:
+        return df
+    text_columns = [c for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])
+                    and not pd.api.types.is_datetime64_any_dtype(df[c])]
+    strata = next((c for c in text_columns if 1 < df[c].nunique(dropna=False) <= rows), None)
+    if strata is None:
+        return df.iloc[np.linspace(0, len(df) - 1, rows).round().astype(int)]
+    groups = df.groupby(strata, dropna=False, sort=False)
+    # Every group gets one row; the rest are shared in proportion to group size
+    extra = (groups.size() / len(df) * (rows - groups.ngroups)).astype(int)
+    picked = [
+        group.sample(n=min(len(group), 1 + int(extra.get(key, 0))), random_state=seed)
+        for key, group in groups
+    ]
+    return pd.concat(picked).sort_index()
+
+
+def trend_deltas(df: pd.DataFrame, max_measures: int = 3) -> dict:
+    """First-to-last change and the largest step for numeric columns over the time column"""
+    time_column = _time_column(df)
+    measures = [c for c in df.columns if c != time_column and pd.api.types.is_numeric_dtype(df[c])
+                and not pd.api.types.is_bool_dtype(df[c])][:max_measures]
+    if time_column is None or not measures:
+        return {}
+    series = df.assign(**{time_column: pd.to_datetime(df[time_column], errors="coerce")})
+    series = series.dropna(subset=[time_column]).groupby(time_column)[measures].mean().sort_index()
+    if len(series) < 2:
+        return {}
+    trends = {"time_column": time_column, "periods": int(len(series)), "measures": {}}
+    for measure in measures:
+        values = series[measure].dropna()
+        if len(values) < 2:
+            continue
+        steps = values.diff().dropna()
+        biggest = steps.abs().idxmax()
+        trends["measures"][measure] = {
+            "first": _round(values.iloc[0]), "last": _round(values.iloc[-1]),
+            "change": _round(values.iloc[-1] - values.iloc[0]),
+            "largest_step": {"at": _json_value(biggest), "change": _round(steps[biggest])},
+        }
+    return trends
+
+
+def build_context(df: pd.DataFrame, sql: str = "", token_budget: int = 1500,
+                  sample_rows: int = 20, top_k: int = 5) -> dict:
+    """Compact, budgeted summary of a result frame for the narrative prompt
+
+    Results that fit in ``sample_rows`` are sent whole (plus trends), since
+    statistics would only repeat them.
+    """
+    trends = trend_deltas(df)
+    while True:
+        context = {"row_count": int(len(df))}
+        if len(df) > sample_rows:
+            context["stats"] = column_stats(df, top_k)
+        if trends:
+            context["trends"] = trends
+        rows = df if len(df) <= sample_rows else stratified_sample(df, sample_rows)
+        context["rows" if len(df) <= sample_rows else "sample_rows"] = [
+            {str(k): _json_value(v) for k, v in row.items()} for row in rows.to_dict(orient="records")
+        ]
+        context["original_sql"] = sql
+        tokens = estimate_tokens(context_json(context))
+        if tokens <= token_budget or (sample_rows == 0 and top_k == 1):
+            context["estimated_tokens"] = tokens
+            return context
+        # Drop sample rows first, then shorten the category lists
+        if sample_rows:
+            sample_rows //= 2
+        else:
+            top_k = max(1, top_k // 2)
+
+
+def context_json(context: dict) -> str:
+    return json.dumps(context, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def raw_sample_json(df: pd.DataFrame, sql: str = "", rows: int = 50) -> str:
+    """The previous prompt context - the first rows as JSON - kept for size comparisons"""
+    sample = json.loads(df.head(rows).to_json(orient="records", date_format="iso"))
+    return json.dumps({"columns": list(df.columns), "row_count": int(len(df)), "sample_rows": sample,
+                       "original_sql": sql}, ensure_ascii=False)
+
+
+class NarrativeStream:
+    """Iterate the chunks of a streaming completion with timeouts and cancellation
+
+    ``chunks`` is a zero-argument callable returning an iterator of text
+    chunks; it is called on the worker thread. After iteration, ``status``
+    is "completed", "cancelled", "timed_out" or "error", and ``text``
+    holds whatever was received.
+    """
+
+    def __init__(self, chunks, first_token_timeout: float = 30.0, total_timeout: float = 180.0,
+                 clock=time.monotonic):
+        self._chunks = chunks
+        self.first_token_timeout = first_token_timeout
+        self.total_timeout = total_timeout
+        self._clock = clock
+        self._queue = queue.Queue()
+        self._cancel = threading.Event()
+        self.parts = []
+        self.status = None
+        self.error = None
+        self.started_at = None
+        self.time_to_first_token = None
+        self.elapsed = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _produce(self):
+        iterator = None
+        try:
+            iterator = iter(self._chunks())
+            for chunk in iterator:
+                if self._cancel.is_set():
+                    break
+                if chunk:
+                    self._queue.put(chunk)
+        except Exception as e:
+            self._queue.put(e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            self._queue.put(_DONE)
+
+    def __iter__(self):
+        self.started_at = self._clock()
+        threading.Thread(target=self._produce, daemon=True).start()
+        try:
+            while True:
+                now = self._clock()
+                if self.time_to_first_token is None:
+                    wait = self.first_token_timeout - (now - self.started_at)
+                else:
+                    wait = self.total_timeout - (now - self.started_at)
+                if self._cancel.is_set():
+                    self.status = "cancelled"
+                    return
+                try:
+                    item = self._queue.get(timeout=max(wait, 0))
+                except queue.Empty:
+                    self.status = "timed_out"
+                    return
+                if item is _DONE:
+                    self.status = "cancelled" if self._cancel.is_set() else "completed"
+                    return
+                if isinstance(item, Exception):
+                    self.status, self.error = "error", item
+                    return
+                if self.time_to_first_token is None:
+                    self.time_to_first_token = self._clock() - self.started_at
+                self.parts.append(item)
+                yield item
+        finally:
+            # Also reached when the consumer stops early (e.g. Streamlit reruns mid-stream)
+            if self.status is None:
+                self.status = "cancelled"
+            self._cancel.set()
+            self.elapsed = self._clock() - self.started_at
+
+    def summary(self) -> str:
+        """One-line timing report for the page"""
+        first = "n/a" if self.time_to_first_token is None else f"{self.time_to_first_token:.2f} s"
+        return f"{self.status}: first token {first}, {len(self.text):,} characters in {self.elapsed or 0:.2f} s"
+
+
+class FakeStreamingLLM:
+    """Streams a fixed text word by word after a configurable time to first token"""
+
+    def __init__(self, text: str = DEFAULT_NARRATIVE, time_to_first_token: float = 0.5,
+                 tokens_per_second: float = 40.0, sleep=time.sleep):
+        self.text = text
+        self.time_to_first_token = time_to_first_token
+        self.tokens_per_second = tokens_per_second
+        self._sleep = sleep
+
+    def stream(self, model: str, messages, temperature: float = 0.2, max_tokens: int = 1500):
+        words = self.text.split(" ")[:max_tokens]
+        self._sleep(self.time_to_first_token)
+        for i, word in enumerate(words):
+            if i:
+                self._sleep(1.0 / self.tokens_per_second)
+            yield word if i == len(words) - 1 else word + " "
+
+    def complete(self, model: str, messages, temperature: float = 0.2, max_tokens: int = 1500) -> str:
+        """Blocking equivalent: the caller sees nothing until the last token"""
+        return "".join(self.stream(model, messages, temperature, max_tokens))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare blocking and streaming narrative latency with a fake LLM")
+    parser.add_argument("--ttft", type=float, default=1.0, help="fake time to first token, seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    parser.add_argument("--words", type=int, default=300, help="narrative length in words")
+    parser.add_argument("--context-report", action="store_true",
+                        help="compare prompt context sizes on local Analyst-style results instead")
+    args = parser.parse_args()
+
+    if args.context_report:
+        from snow_bear_backend import _LOCAL_ANALYST_ANSWERS, _LOCAL_ANALYST_DEFAULT
+        from snow_bear_pipeline import build_local_gold
+
+        session = build_local_gold()
+        queries = [sql for _, _, sql in _LOCAL_ANALYST_ANSWERS] + [_LOCAL_ANALYST_DEFAULT[1]] + [
+            "SELECT CAST(REVIEW_DATE AS DATE) AS REVIEW_DAY, SEGMENT, COUNT(*) AS FAN_COUNT, "
+            "AVG(AGGREGATE_SCORE) AS AVG_SCORE FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD GROUP BY 1, 2 ORDER BY 1, 2",
+            "SELECT * FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD WHERE AGGREGATE_SCORE <= 2",
+        ]
+        for sql in queries:
+            df = session.sql(sql).to_pandas()
+            raw = estimate_tokens(raw_sample_json(df, sql))
+            compact = build_context(df, sql)["estimated_tokens"]
+            print(f"{len(df):>6} rows x {len(df.columns):>2} cols  head(50) {raw:>7,} tokens  "
+                  f"context {compact:>5,} tokens  ({1 - compact / raw:.0%} smaller)")
+        raise SystemExit(0)
+
+    text = " ".join((DEFAULT_NARRATIVE.split(" ") * (args.words // 40 + 1))[:args.words])
+    llm = FakeStreamingLLM(text, args.ttft, args.tokens_per_second)
+    messages = [{"role": "user", "content": "Summarize the result"}]
+
+    started = time.perf_counter()
+    llm.complete("fake", messages)
+    blocking = time.perf_counter() - started
+    print(f"blocking   first visible text after {blocking:.2f} s")
+
+    stream = NarrativeStream(lambda: llm.stream("fake", messages))
+    for _ in stream:
+        pass
+    print(f"streaming  {stream.summary()}")
+
+    stream = NarrativeStream(lambda: llm.stream("fake", messages))
+    for i, _ in enumerate(stream):
+        if i == 9:
+            stream.cancel()
+    print(f"cancel     {stream.summary()}")
+
+    stream = NarrativeStream(lambda: llm.stream("fake", messages), first_token_timeout=args.ttft / 2)
+    for _ in stream:
+        pass
+    print(f"timeout    {stream.summary()}")
@@ -0,0 +1,634 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Gold layer build statements for the Snow Bear notebook.
+
+The SQL the notebook runs is rendered here from one column list, for
+either Snowflake (Cortex functions) or a local engine such as DuckDB with
+deterministic stub functions registered by ``register_stub_functions``.
+
+Theme assignment, scoring and segmentation are declared once as Rule lists
+and rendered both into the single CREATE TABLE AS SELECT that builds the
+gold table and into pandas (``apply_gold_rules``) for local checks.
+
+The incremental refresh enriches only survey rows that are new or whose
+CREATED_TIMESTAMP is newer than the gold copy, then swaps them into
+QUALTRICS_SCORECARD, so a daily batch costs Cortex calls for the delta only.
+
+Cortex SENTIMENT and EXTRACT_ANSWER results are memoized in
+CORTEX_ENRICHMENT_CACHE, keyed on (function, model, hash of the
+whitespace-normalized text). Each build first sends only the distinct texts
+missing from the cache to Cortex, then joins the results in. Run
+``python snow_bear_pipeline.py dedup-report`` to measure the savings on the
+bundled survey CSV.
+"""
+
+import argparse
+import re
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from snow_bear_data import QUICK_INSIGHTS_TABLE, ROLLUP_TABLE, SCORECARD_TABLE, quick_insights_select
+
+BRONZE_TABLE = "SNOW_BEAR_DB.BRONZE_LAYER.GENERATED_DATA_MAJOR_LEAGUE_BASKETBALL_STRUCTURED"
+THEMES_TABLE = "SNOW_BEAR_DB.GOLD_LAYER.EXTRACTED_THEMES_STRUCTURED"
+DELTA_TABLE = "SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD_DELTA"
+CORTEX_CACHE_TABLE = "SNOW_BEAR_DB.GOLD_LAYER.CORTEX_ENRICHMENT_CACHE"
+SURVEY_CSV = "basketball_fan_survey_data.csv.gz"
+
+BRONZE_COLUMNS = [
+    "ID", "FOOD_OFFERING_COMMENT", "FOOD_OFFERING_SCORE", "GAME_EXPERIENCE_COMMENT",
+    "GAME_EXPERIENCE_SCORE", "MERCHANDISE_OFFERING_COMMENT", "MERCHANDISE_OFFERING_SCORE",
+    "MERCHANDISE_PRICING_COMMENT", "MERCHANDISE_PRICING_SCORE", "OVERALL_EVENT_COMMENT",
+    "OVERALL_EVENT_SCORE", "PARKING_COMMENT", "PARKING_SCORE", "SEAT_LOCATION_COMMENT",
+    "SEAT_LOCATION_SCORE", "STADIUM_ACCESS_SCORE", "STADIUM_COMMENT", "TICKET_PRICE_COMMENT",
+    "TICKET_PRICE_SCORE", "COMPANY_NAME", "TOPIC", "CREATED_TIMESTAMP",
+]
+
+# Comment fields concatenated into AGGREGATE_COMMENT
+AGGREGATE_COMMENT_SOURCES = [
+    "FOOD_OFFERING_COMMENT", "GAME_EXPERIENCE_COMMENT", "MERCHANDISE_OFFERING_COMMENT",
+    "MERCHANDISE_PRICING_COMMENT", "OVERALL_EVENT_COMMENT", "PARKING_COMMENT",
+    "SEAT_LOCATION_COMMENT",
+]
+
+# (output column, comment column) pairs scored by Cortex
+SENTIMENT_SOURCES = [
+    ("FOOD_OFFERING_SENTIMENT", "FOOD_OFFERING_COMMENT"),
+    ("GAME_EXPERIENCE_SENTIMENT", "GAME_EXPERIENCE_COMMENT"),
+    ("MERCHANDISE_OFFERING_SENTIMENT", "MERCHANDISE_OFFERING_COMMENT"),
+    ("MERCHANDISE_PRICING_SENTIMENT", "MERCHANDISE_PRICING_COMMENT"),
+    ("OVERALL_EVENT_SENTIMENT", "OVERALL_EVENT_COMMENT"),
+    ("PARKING_SENTIMENT", "PARKING_COMMENT"),
+    ("SEAT_LOCATION_SENTIMENT", "SEAT_LOCATION_COMMENT"),
+    ("STADIUM_ACCESS_SENTIMENT", "STADIUM_COMMENT"),
+]
+SUMMARY_SOURCES = [
+    ("FOOD_SUMMARY", "FOOD_OFFERING_COMMENT"),
+    ("GAME_EXPERIENCE_SUMMARY", "GAME_EXPERIENCE_COMMENT"),
+    ("MERCHANDISE_OFFERING_SUMMARY", "MERCHANDISE_OFFERING_COMMENT"),
+    ("MERCHANDISE_PRICING_SUMMARY", "MERCHANDISE_PRICING_COMMENT"),
+    ("OVERALL_EVENT_SUMMARY", "OVERALL_EVENT_COMMENT"),
+    ("PARKING_SUMMARY", "PARKING_COMMENT"),
+    ("SEAT_LOCATION_SUMMARY", "SEAT_LOCATION_COMMENT"),
+    ("STADIUM_ACCESS_SUMMARY", "STADIUM_COMMENT"),
+]
+SCORE_COLUMNS = [
+    "FOOD_OFFERING_SCORE", "GAME_EXPERIENCE_SCORE", "MERCHANDISE_OFFERING_SCORE",
+    "MERCHANDISE_PRICING_SCORE", "OVERALL_EVENT_SCORE", "PARKING_SCORE",
+    "SEAT_LOCATION_SCORE", "STADIUM_ACCESS_SCORE",
+]
+# Cached Cortex calls as (FUNCTION_NAME, MODEL); EXTRACT_ANSWER stores its question as the model
+SENTIMENT_CALL = ("SENTIMENT", "")
+EXTRACT_THEME_CALL = ("EXTRACT_ANSWER", "ASSIGN A THEME")
+
+THEME_FLAG_COLUMNS = ["FOOD", "PARKING", "SEATING", "MERCHANDISE", "GAME", "TICKET", "NO_THEME", "VIP"]
+
+
+@dataclass(frozen=True)
+class SqlDialect:
+    """SQL snippets that differ between Snowflake and a local test engine"""
+
+    sentiment: str
+    extract_theme: str
+    review_date: str
+    normalize: str
+    text_hash: str
+    transient: str = ""
+
+
+SNOWFLAKE_DIALECT = SqlDialect(
+    sentiment="SNOWFLAKE.CORTEX.SENTIMENT({text})",
+    extract_theme="SNOWFLAKE.CORTEX.EXTRACT_ANSWER({text},'ASSIGN A THEME')[0]:answer::string",
+    review_date="DATEADD(DAY, UNIFORM(1, 365, RANDOM()), '2024-06-01')",
+    normalize="TRIM(REGEXP_REPLACE({text}, '\\\\s+', ' '))",
+    text_hash="SHA2({text}, 256)",
+    transient="TRANSIENT ",
+)
+
+# DuckDB with the functions from register_stub_functions()
+LOCAL_DIALECT = SqlDialect(
+    sentiment="STUB_SENTIMENT({text})",
+    extract_theme="STUB_EXTRACT_THEME({text})",
+    review_date="CAST(DATE '2024-06-01' + CAST(1 + FLOOR(RANDOM() * 365) AS INTEGER) AS TIMESTAMP)",
+    normalize="TRIM(REGEXP_REPLACE({text}, '\\s+', ' ', 'g'))",
+    text_hash="SHA256({text})",
+)
+
+
+def normalize_text(text):
+    """Python equivalent of SqlDialect.normalize: trim and collapse whitespace runs"""
+    if text is None or (isinstance(text, float) and text != text):
+        return None
+    return " ".join(str(text).split())
+
+
+def _aggregate_comment(col) -> str:
+    return "||' '||\n       ".join(col(c) for c in AGGREGATE_COMMENT_SOURCES)
+
+
+def _text_key(dialect: SqlDialect, text: str) -> str:
+    return dialect.text_hash.format(text=dialect.normalize.format(text=text))
+
+
+class _CacheLookups:
+    """LEFT JOINs against CORTEX_ENRICHMENT_CACHE, one alias per looked-up text"""
+
+    def __init__(self, dialect: SqlDialect):
+        self.dialect = dialect
+        self.joins = []
+
+    def result(self, call, text: str) -> str:
+        alias = f"C{len(self.joins) + 1}"
+        function_name, model = call
+        self.joins.append(
+            f"LEFT JOIN {CORTEX_CACHE_TABLE} {alias}\n"
+            f"       ON {alias}.FUNCTION_NAME = '{function_name}' AND {alias}.MODEL = '{model}'\n"
+            f"      AND {alias}.TEXT_HASH = {_text_key(self.dialect, text)}"
+        )
+        return f"{alias}.RESULT"
+
+    def sentiment(self, text: str) -> str:
+        return f"ROUND(CAST({self.result(SENTIMENT_CALL, text)} AS DOUBLE), 2)"
+
+    def extract_theme(self, text: str) -> str:
+        return self.result(EXTRACT_THEME_CALL, text)
+
+
+@dataclass(frozen=True)
+class Condition:
+    """``column <op> value``; op is one of >=, >, <, <= or abs>= (ABS(column) >= value)"""
+
+    column: str
+    op: str
+    value: object
+
+
+def _greater_or_equal_all(column, others):
+    """column >= each of others (NULL anywhere fails, as GREATEST() does in Snowflake)"""
+    return tuple(Condition(column, ">=", other) for other in others if other != column)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """First matching rule wins; every condition must hold. ``value`` may name another column."""
+
+    label: str
+    when: tuple = ()
+
+
+# MAIN_THEME: the strongest category sentiment wins when it is clear enough
+_THEME_CANDIDATES = [
+    ("FOOD_OFFERING_SENTIMENT", "Food & Concessions"),
+    ("GAME_EXPERIENCE_SENTIMENT", "Game Experience"),
+    ("PARKING_SENTIMENT", "Parking"),
+    ("STADIUM_ACCESS_SENTIMENT", "Stadium Access"),
+    ("SEAT_LOCATION_SENTIMENT", "Seat Location"),
+]
+_THEME_COMPARED = [c for c, _ in _THEME_CANDIDATES] + ["OVERALL_EVENT_SENTIMENT"]
+THEME_RULES = [
+    Rule(theme, _greater_or_equal_all(column, _THEME_COMPARED) + (Condition(column, "abs>=", 0.3),))
+    for column, theme in _THEME_CANDIDATES
+] + [
+    Rule("Overall Event", (Condition("OVERALL_EVENT_SENTIMENT", "abs>=", 0.5),)),
+    Rule("Merchandise Quality"),
+]
+
+SEGMENT_RULES = [
+    Rule("Premium Experience Seeker", (Condition("AGGREGATE_SCORE", ">=", 4), Condition("MERCHANDISE_PRICING_SENTIMENT", ">", 0))),
+    Rule("Loyal Supporter", (Condition("AGGREGATE_SCORE", ">=", 4),)),
+    Rule("Convenience-Driven Fan", (Condition("AGGREGATE_SCORE", ">=", 3), Condition("PARKING_SENTIMENT", "<", -0.3))),
+    Rule("Value-Conscious Fan", (Condition("AGGREGATE_SCORE", ">=", 3),)),
+    Rule("Experience Critic", (Condition("AGGREGATE_SCORE", "<", 3),)),
+    Rule("Occasional Attendee"),
+]
+
+SEGMENT_ALT_RULES = [
+    Rule("High-Value Critic", (Condition("AGGREGATE_SCORE", ">=", 4), Condition("MERCHANDISE_PRICING_SENTIMENT", "<", -0.3))),
+    Rule("Budget-Conscious Loyalist", (Condition("AGGREGATE_SCORE", ">=", 3), Condition("MERCHANDISE_PRICING_SENTIMENT", "<", -0.3))),
+    Rule("Premium Experience Seeker", (Condition("AGGREGATE_SCORE", ">=", 4),)),
+    Rule("Happy Regular"),
+]
+
+# Columns computed from other gold columns, in dependency order
+DERIVED_COLUMNS = ["AGGREGATE_SCORE", "ALT_AGGREGATE_SENTIMENT", "MAIN_THEME",
+                   "AGGREGATE_SENTIMENT_SPREAD", "SEGMENT", "SEGMENT_ALT"]
+
+
+def _sql_value(value) -> str:
+    if isinstance(value, str):
+        return value
+    return repr(value)
+
+
+def _sql_condition(condition: Condition) -> str:
+    if condition.op == "abs>=":
+        return f"ABS({condition.column}) >= {_sql_value(condition.value)}"
+    return f"{condition.column} {condition.op} {_sql_value(condition.value)}"
+
+
+def rules_to_sql(rules, indent: str = "        ") -> str:
+    """Render rules as a CASE expression"""
+    lines = ["CASE"]
+    for rule in rules:
+        label = rule.label.replace("'", "''")
+        if rule.when:
+            lines.append(f"{indent}WHEN {' AND '.join(_sql_condition(c) for c in rule.when)} THEN '{label}'")
+        else:
+            lines.append(f"{indent}ELSE '{label}'")
+            break
+    lines.append(indent[:-4] + "END")
+    return "\n".join(lines)
+
+
+def _score_value(column: str) -> str:
+    return f"CAST(NULLIF({column}, 'N/A') AS DOUBLE)"
+
+
+def derived_expressions():
+    """(column, SQL expression) for DERIVED_COLUMNS; later ones may use earlier ones"""
+    score_sum = " +\n                       ".join(_score_value(c) for c in SCORE_COLUMNS)
+    sentiment_sum = " + ".join(name for name, _ in SENTIMENT_SOURCES)
+    return [
+        ("AGGREGATE_SCORE", f"CAST(TRUNC(({score_sum}) / 8) AS INTEGER)"),
+        ("ALT_AGGREGATE_SENTIMENT", f"({sentiment_sum}) / 8"),
+        ("MAIN_THEME", f"CAST({rules_to_sql(THEME_RULES)} AS VARCHAR(1000))"),
+        ("AGGREGATE_SENTIMENT_SPREAD", "ALT_AGGREGATE_SENTIMENT - AGGREGATE_SENTIMENT"),
+        ("SEGMENT", f"CAST({rules_to_sql(SEGMENT_RULES)} AS VARCHAR(1000))"),
+        ("SEGMENT_ALT", f"CAST({rules_to_sql(SEGMENT_ALT_RULES)} AS VARCHAR(1000))"),
+    ]
+
+
+def _pandas_condition(df: pd.DataFrame, condition: Condition) -> np.ndarray:
+    left = pd.to_numeric(df[condition.column], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    if isinstance(condition.value, str):
+        right = pd.to_numeric(df[condition.value], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        right = condition.value
+    # NaN compares False, like NULL in a WHEN clause
+    with np.errstate(invalid="ignore"):
+        if condition.op == "abs>=":
+            return np.abs(left) >= right
+        return {">=": np.greater_equal, ">": np.greater, "<": np.less, "<=": np.less_equal}[condition.op](left, right)
+
+
+def rules_to_pandas(df: pd.DataFrame, rules) -> np.ndarray:
+    """Evaluate rules row-wise with np.select"""
+    conditions, labels, default = [], [], None
+    for rule in rules:
+        if not rule.when:
+            default = rule.label
+            break
+        mask = np.ones(len(df), dtype=bool)
+        for condition in rule.when:
+            mask &= _pandas_condition(df, condition)
+        conditions.append(mask)
+        labels.append(rule.label)
+    return np.select(conditions, labels, default=default).astype(object)
+
+
+def apply_gold_rules(df: pd.DataFrame) -> pd.DataFrame:
+    """pandas version of derived_expressions() for a frame with the bronze scores and Cortex columns"""
+    out = df.copy()
+    scores = np.column_stack([
+        pd.to_numeric(out[c].replace("N/A", np.nan), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        for c in SCORE_COLUMNS
+    ])
+    # Sum left to right so NaN propagates like NULL in SQL addition
+    out["AGGREGATE_SCORE"] = pd.array(np.trunc(scores.sum(axis=1) / 8), dtype="Int64")
+    sentiments = out[[name for name, _ in SENTIMENT_SOURCES]].to_numpy(dtype=np.float64, na_value=np.nan)
+    out["ALT_AGGREGATE_SENTIMENT"] = sentiments.sum(axis=1) / 8
+    out["MAIN_THEME"] = rules_to_pandas(out, THEME_RULES)
+    out["AGGREGATE_SENTIMENT_SPREAD"] = out["ALT_AGGREGATE_SENTIMENT"] - out["AGGREGATE_SENTIMENT"]
+    out["SEGMENT"] = rules_to_pandas(out, SEGMENT_RULES)
+    out["SEGMENT_ALT"] = rules_to_pandas(out, SEGMENT_ALT_RULES)
+    return out
+
+
+def gold_columns(dialect: SqlDialect, source: str = "A", review_date: str = None):
+    """(column, expression) pairs of QUALTRICS_SCORECARD and the cache joins they need.
+
+    Columns in DERIVED_COLUMNS are given as None; gold_select() computes
+    them. Cortex results are read from CORTEX_ENRICHMENT_CACHE, so
+    ``cache_fill_statements`` must run first.
+    """
+    def col(name):
+        return f"{source}.{name}"
+
+    cache = _CacheLookups(dialect)
+    aggregate_comment = _aggregate_comment(col)
+    columns = [("REVIEW_DATE", review_date or dialect.review_date)]
+    columns += [(c, col(c)) for c in BRONZE_COLUMNS]
+    columns += [
+        ("AGGREGATE_SCORE", None),
+        ("AGGREGATE_COMMENT", aggregate_comment),
+        ("AGGREGATE_SENTIMENT", cache.sentiment(aggregate_comment)),
+        ("ALT_AGGREGATE_SENTIMENT", None),
+        ("AGGREGATE_SENTIMENT_SPREAD", None),
+    ]
+    columns += [(name, cache.sentiment(col(comment))) for name, comment in SENTIMENT_SOURCES]
+    columns.append(("AGGREGATE_SUMMARY", cache.extract_theme(aggregate_comment)))
+    columns += [(name, cache.extract_theme(col(comment))) for name, comment in SUMMARY_SOURCES]
+    columns += [
+        ("MAIN_THEME", None),
+        ("SECONDARY_THEME", "CAST(NULL AS VARCHAR(1000))"),
+    ]
+    columns += [(flag, "CAST(0 AS INTEGER)") for flag in THEME_FLAG_COLUMNS]
+    columns += [
+        ("SEGMENT", None),
+        ("SEGMENT_ALT", None),
+        ("BUSINESS_RECOMMENDATION", "CAST(NULL AS VARCHAR(8000))"),
+        ("COMPLEX_RECOMMENDATION", "CAST(NULL AS VARCHAR(8000))"),
+    ]
+    return columns, cache.joins
+
+
+def gold_select(dialect: SqlDialect, source: str, review_date: str = None, where: str = "", extra_joins=()):
+    """Single SELECT producing finished QUALTRICS_SCORECARD rows from ``source`` (aliased A).
+
+    Each CTE adds the derived columns whose inputs the previous one
+    provides, so the gold table is written once instead of being rewritten
+    by a chain of full-table UPDATEs.
+    """
+    columns, joins = gold_columns(dialect, review_date=review_date)
+    base = [(name, expr) for name, expr in columns if expr is not None]
+    derived = dict(derived_expressions())
+    stages = [["AGGREGATE_SCORE", "ALT_AGGREGATE_SENTIMENT", "MAIN_THEME"],
+              ["AGGREGATE_SENTIMENT_SPREAD", "SEGMENT", "SEGMENT_ALT"]]
+    joins = "\n".join([*extra_joins, *joins])
+    sql = f"WITH BASE AS (\nSELECT {_select_list(base)}\nFROM {source} A\n{joins}\n{where}\n)"
+    previous = "BASE"
+    for number, stage in enumerate(stages[:-1], start=1):
+        name = f"STAGE_{number}"
+        sql += f",\n{name} AS (\nSELECT {previous}.*,\n       {_select_list((c, derived[c]) for c in stage)}\nFROM {previous}\n)"
+        previous = name
+    final = [(name, derived[name] if name in stages[-1] else name) for name, _ in columns]
+    return sql + f"\nSELECT {_select_list(final)}\nFROM {previous}"
+
+
+def cache_fill_statements(dialect: SqlDialect = SNOWFLAKE_DIALECT, source: str = BRONZE_TABLE):
+    """Create CORTEX_ENRICHMENT_CACHE and run Cortex once per distinct uncached comment text"""
+    comment_columns = sorted({comment for _, comment in SENTIMENT_SOURCES + SUMMARY_SOURCES})
+    texts = [f"SELECT {c} AS TEXT FROM {source}" for c in comment_columns]
+    texts.append(f"SELECT {_aggregate_comment(str)} AS TEXT FROM {source}")
+    all_texts = "\n         UNION ALL ".join(texts)
+    distinct_texts = (
+        f"(SELECT DISTINCT {_text_key(dialect, 'TEXT')} AS TEXT_HASH, {dialect.normalize.format(text='TEXT')} AS TEXT\n"
+        f"   FROM ({all_texts})\n"
+        f"  WHERE TEXT IS NOT NULL)"
+    )
+    statements = [
+        f"""CREATE TABLE IF NOT EXISTS {CORTEX_CACHE_TABLE} (
+    FUNCTION_NAME VARCHAR(100),
+    MODEL VARCHAR(200),
+    TEXT_HASH VARCHAR(64),
+    RESULT VARCHAR,
+    CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)"""
+    ]
+    for (function_name, model), call in ((SENTIMENT_CALL, dialect.sentiment), (EXTRACT_THEME_CALL, dialect.extract_theme)):
+        statements.append(f"""INSERT INTO {CORTEX_CACHE_TABLE} (FUNCTION_NAME, MODEL, TEXT_HASH, RESULT)
+SELECT '{function_name}', '{model}', T.TEXT_HASH, CAST({call.format(text="T.TEXT")} AS VARCHAR)
+FROM {distinct_texts} T
+WHERE NOT EXISTS (SELECT 1 FROM {CORTEX_CACHE_TABLE} C
+                   WHERE C.FUNCTION_NAME = '{function_name}' AND C.MODEL = '{model}'
+                     AND C.TEXT_HASH = T.TEXT_HASH)""")
+    return statements
+
+
+def _select_list(columns) -> str:
+    return ",\n       ".join(expr if expr == name else f"{expr} AS {name}" for name, expr in columns)
+
+
+def summary_table_statements(scorecard: str = SCORECARD_TABLE):
+    """Rebuild the small tables derived from the scorecard (no Cortex calls)"""
+    return [
+        f"""CREATE OR REPLACE TABLE {THEMES_TABLE} AS
+SELECT
+    ROW_NUMBER() OVER (ORDER BY COUNT(*) DESC) AS THEME_NUMBER,
+    MAIN_THEME,
+    CASE
+        WHEN AVG(AGGREGATE_SENTIMENT) > 0.2 THEN 'Positive'
+        WHEN AVG(AGGREGATE_SENTIMENT) < -0.2 THEN 'Negative'
+        ELSE 'Neutral'
+    END AS SENTIMENT_CATEGORY,
+    'Theme extracted from fan feedback analysis using Cortex AI' AS THEME_DESCRIPTION,
+    COUNT(*) AS RESPONSE_COUNT
+FROM {scorecard}
+WHERE MAIN_THEME IS NOT NULL
+GROUP BY MAIN_THEME
+ORDER BY COUNT(*) DESC""",
+        f"""CREATE OR REPLACE TABLE {ROLLUP_TABLE} AS
+SELECT
+    CAST(REVIEW_DATE AS DATE) AS REVIEW_DAY,
+    SEGMENT,
+    MAIN_THEME,
+    AGGREGATE_SCORE,
+    COUNT(*) AS FAN_COUNT,
+    COUNT(AGGREGATE_SENTIMENT) AS SENTIMENT_COUNT,
+    SUM(AGGREGATE_SENTIMENT) AS SENTIMENT_SUM
+FROM {scorecard}
+WHERE AGGREGATE_SENTIMENT BETWEEN -1 AND 1
+GROUP BY 1, 2, 3, 4""",
+        f"CREATE OR REPLACE TABLE {QUICK_INSIGHTS_TABLE} AS\n{quick_insights_select(scorecard)}",
+    ]
+
+
+def full_build_statements(dialect: SqlDialect = SNOWFLAKE_DIALECT):
+    """Rebuild QUALTRICS_SCORECARD from every bronze row (notebook steps 2, 3 and 3b)"""
+    return [
+        *cache_fill_statements(dialect),
+        f"CREATE OR REPLACE TABLE {SCORECARD_TABLE}\nAS\n{gold_select(dialect, BRONZE_TABLE)}",
+        *summary_table_statements(),
+    ]
+
+
+def incremental_statements(dialect: SqlDialect = SNOWFLAKE_DIALECT):
+    """Enrich only new or changed survey rows and swap them into QUALTRICS_SCORECARD.
+
+    A bronze row is part of the delta when its ID is not in the gold table
+    yet or its CREATED_TIMESTAMP is newer than the gold copy. Only the
+    latest bronze version of each ID is used, and existing rows keep their
+    REVIEW_DATE.
+    """
+    latest_bronze = (
+        f"(SELECT {', '.join(BRONZE_COLUMNS)},\n"
+        f"        ROW_NUMBER() OVER (PARTITION BY ID ORDER BY CREATED_TIMESTAMP DESC) AS VERSION_RANK\n"
+        f"   FROM {BRONZE_TABLE})"
+    )
+    select = gold_select(
+        dialect, latest_bronze,
+        review_date=f"COALESCE(G.REVIEW_DATE, {dialect.review_date})",
+        where="WHERE A.VERSION_RANK = 1\n  AND (G.ID IS NULL OR A.CREATED_TIMESTAMP > G.CREATED_TIMESTAMP)",
+        extra_joins=[f"LEFT JOIN {SCORECARD_TABLE} G ON G.ID = A.ID"],
+    )
+    column_names = ", ".join(name for name, _ in gold_columns(dialect)[0])
+    return [
+        # Texts of unchanged rows are already cached, so only the delta reaches Cortex
+        *cache_fill_statements(dialect),
+        f"CREATE OR REPLACE {dialect.transient}TABLE {DELTA_TABLE}\nAS\n{select}",
+        "BEGIN TRANSACTION",
+        f"DELETE FROM {SCORECARD_TABLE} WHERE ID IN (SELECT ID FROM {DELTA_TABLE})",
+        f"INSERT INTO {SCORECARD_TABLE} ({column_names})\nSELECT {column_names} FROM {DELTA_TABLE}",
+        "COMMIT",
+        *summary_table_statements(),
+        f"DROP TABLE IF EXISTS {DELTA_TABLE}",
+    ]
+
+
+def run_statements(session, statements):
+    """Execute statements in order on a Snowpark session (or DBAPISession)"""
+    for statement in statements:
+        session.sql(statement).collect()
+
+
+_POSITIVE_WORDS = {
+    "amazing", "great", "love", "loved", "excellent", "good", "fantastic", "friendly",
+    "clean", "easy", "perfect", "comfortable", "fun", "best", "energized", "awesome",
+    "delicious", "quick", "helpful", "enjoyed", "exciting", "convenient", "affordable",
+}
+_NEGATIVE_WORDS = {
+    "bad", "terrible", "expensive", "long", "poor", "slow", "overpriced", "crowded",
+    "dirty", "difficult", "worst", "limited", "rude", "confusing", "hard", "cold",
+    "disappointing", "awful", "boring", "far", "nightmare", "lacking", "pricey",
+}
+
+
+def stub_sentiment(text):
+    """Deterministic stand-in for CORTEX.SENTIMENT: word-list polarity in [-1, 1]"""
+    if text is None:
+        return None
+    words = re.findall(r"[a-z']+", str(text).lower())
+    positive = sum(word in _POSITIVE_WORDS for word in words)
+    negative = sum(word in _NEGATIVE_WORDS for word in words)
+    return (positive - negative) / (positive + negative + 1)
+
+
+def stub_extract_theme(text):
+    """Deterministic stand-in for EXTRACT_ANSWER(text, 'ASSIGN A THEME'): the leading words"""
+    if text is None:
+        return None
+    return " ".join(str(text).split()[:4])
+
+
+def register_stub_functions(connection):
+    """Register STUB_SENTIMENT and STUB_EXTRACT_THEME on a duckdb connection"""
+    from duckdb.sqltypes import DOUBLE, VARCHAR
+
+    connection.create_function("STUB_SENTIMENT", stub_sentiment, [VARCHAR], DOUBLE)
+    connection.create_function("STUB_EXTRACT_THEME", stub_extract_theme, [VARCHAR], VARCHAR)
+
+
+def build_local_gold(csv_path: str = SURVEY_CSV, connection=None):
+    """Build the bronze and gold tables in DuckDB from the survey CSV; returns a DBAPISession"""
+    import duckdb
+
+    from snow_bear_data import DBAPISession
+
+    connection = connection or duckdb.connect()
+    connection.execute("ATTACH ':memory:' AS SNOW_BEAR_DB")
+    for schema in ("BRONZE_LAYER", "GOLD_LAYER", "ANALYTICS"):
+        connection.execute(f"CREATE SCHEMA IF NOT EXISTS SNOW_BEAR_DB.{schema}")
+    register_stub_functions(connection)
+    connection.register("survey_csv", read_survey_csv(csv_path)[BRONZE_COLUMNS])
+    connection.execute(f"""CREATE TABLE {BRONZE_TABLE} AS
+SELECT * REPLACE (CAST(CREATED_TIMESTAMP AS TIMESTAMP) AS CREATED_TIMESTAMP) FROM survey_csv""")
+    connection.unregister("survey_csv")
+    session = DBAPISession(connection)
+    run_statements(session, full_build_statements(LOCAL_DIALECT))
+    return session
+
+
+def read_survey_csv(path: str = SURVEY_CSV) -> pd.DataFrame:
+    """Load the bundled survey export as strings; the .gz file may or may not be gzipped"""
+    with open(path, "rb") as f:
+        compression = "gzip" if f.read(2) == b"\x1f\x8b" else None
+    return pd.read_csv(path, compression=compression, dtype=str, keep_default_na=False, na_values=[""])
+
+
+def dedup_report(df: pd.DataFrame) -> dict:
+    """Cortex calls made per row versus once per distinct normalized text"""
+    comment_columns = sorted({comment for _, comment in SENTIMENT_SOURCES + SUMMARY_SOURCES})
+    texts = [df[c] for c in comment_columns]
+    # Concatenation is NULL when any part is NULL, as in SQL
+    parts = df[AGGREGATE_COMMENT_SOURCES]
+    aggregate = parts.fillna("").agg(" ".join, axis=1).where(parts.notna().all(axis=1))
+    texts.append(aggregate)
+    texts = pd.concat(texts, ignore_index=True).dropna()
+    distinct = texts.map(normalize_text).nunique()
+
+    # Cortex is not called on NULL comments, so a row only costs a call per non-null text
+    sources = {SENTIMENT_CALL[0]: SENTIMENT_SOURCES, EXTRACT_THEME_CALL[0]: SUMMARY_SOURCES}
+    report = {"rows": len(df), "functions": {}}
+    for function_name, function_sources in sources.items():
+        per_row_calls = int(sum(df[comment].notna().sum() for _, comment in function_sources) + aggregate.notna().sum())
+        report["functions"][function_name] = {
+            "per_row_calls": per_row_calls,
+            "distinct_texts": int(distinct),
+            "calls_avoided": per_row_calls - int(distinct),
+            "dedup_ratio": per_row_calls / distinct if distinct else 0.0,
+        }
+    report["per_row_calls"] = sum(f["per_row_calls"] for f in report["functions"].values())
+    report["cached_calls"] = sum(f["distinct_texts"] for f in report["functions"].values())
+    report["calls_avoided"] = report["per_row_calls"] - report["cached_calls"]
+    return report
+
+
+def check_rules(session) -> dict:
+    """Compare the derived columns of the built gold table with apply_gold_rules(); returns mismatch counts"""
+    gold = session.sql(f"SELECT * FROM {SCORECARD_TABLE} ORDER BY ID").to_pandas()
+    expected = apply_gold_rules(gold.drop(columns=DERIVED_COLUMNS))
+    mismatches = {}
+    for column in DERIVED_COLUMNS:
+        actual, wanted = gold[column], expected[column]
+        if column in ("ALT_AGGREGATE_SENTIMENT", "AGGREGATE_SENTIMENT_SPREAD"):
+            same = np.isclose(actual.astype(float), wanted.astype(float), equal_nan=True)
+        else:
+            same = (actual.astype(object) == wanted.astype(object)) | (actual.isna() & wanted.isna())
+        mismatches[column] = int((~np.asarray(same)).sum())
+    return mismatches
+
+
+def _print_dedup_report(report: dict):
+    print(f"{report['rows']:,} survey rows")
+    for function_name, stats in report["functions"].items():
+        print(f"  {function_name:<15} per-row calls {stats['per_row_calls']:>8,}  distinct texts {stats['distinct_texts']:>7,}  "
+              f"avoided {stats['calls_avoided']:>8,}  dedup ratio {stats['dedup_ratio']:6.1f}x")
+    print(f"  {'TOTAL':<15} per-row calls {report['per_row_calls']:>8,}  cortex calls   {report['cached_calls']:>7,}  "
+          f"avoided {report['calls_avoided']:>8,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print the Snow Bear gold layer build statements")
+    parser.add_argument("mode", choices=["full", "incremental", "dedup-report", "check-rules"])
+    parser.add_argument("--local", action="store_true", help="render for DuckDB with stub functions")
+    parser.add_argument("--csv", default=SURVEY_CSV, help="survey export used by dedup-report")
+    args = parser.parse_args()
+    if args.mode == "dedup-report":
+        _print_dedup_report(dedup_report(read_survey_csv(args.csv)))
+    elif args.mode == "check-rules":
+        # Build locally with the single CTAS, then recompute the rules in pandas
+        started = time.perf_counter()
+        local_session = build_local_gold(args.csv)
+        print(f"local gold build: {time.perf_counter() - started:.2f} s")
+        for column, count in check_rules(local_session).items():
+            print(f"  {column:<28} {'ok' if count == 0 else f'{count} mismatches'}")
+    else:
+        dialect = LOCAL_DIALECT if args.local else SNOWFLAKE_DIALECT
+        statements = full_build_statements(dialect) if args.mode == "full" else incremental_statements(dialect)
+        print(";\n\n".join(statements) + ";")
@@ -0,0 +1,148 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Named statement templates with bind parameters for the Snow Bear app.
+
+Templates are written with ``:name`` placeholders and compiled once to
+the qmark style that Snowpark and DBAPISession accept. Values are always
+bound, never spliced into the text, so every run of a template has the
+same query text. That lets Snowflake reuse compiled plans and result
+caches, and large JSON payloads need no quote escaping. QueryLayer runs
+templates on a session and keeps per-template latency metrics.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from snow_bear_data import QUICK_INSIGHTS_TABLE, SCORECARD_TABLE, quick_insights_select
+
+# A string literal, a '::' cast, or a :name placeholder. A colon right after an
+# identifier, ']' or ')' is a semi-structured path (result:field), not a bind.
+_PLACEHOLDER = re.compile(r"('(?:[^'\\]|\\.|'')*')|(::)|(?<![\w\])\]]):([A-Za-z_][A-Za-z0-9_]*)")
+
+
+@dataclass(frozen=True)
+class QueryTemplate:
+    """A SQL statement with :name placeholders, compiled to positional binds"""
+
+    name: str
+    text: str
+    sql: str = field(init=False)
+    param_names: tuple = field(init=False)
+
+    def __post_init__(self):
+        names = []
+
+        def replace(match):
+            if match.group(3) is None:
+                return match.group(0)
+            names.append(match.group(3))
+            return "?"
+
+        object.__setattr__(self, "sql", _PLACEHOLDER.sub(replace, self.text))
+        object.__setattr__(self, "param_names", tuple(names))
+
+    def bind(self, params: dict) -> list:
+        """Positional bind values in placeholder order"""
+        missing = set(self.param_names) - set(params)
+        if missing:
+            raise KeyError(f"Template '{self.name}' is missing parameters: {', '.join(sorted(missing))}")
+        unused = set(params) - set(self.param_names)
+        if unused:
+            raise KeyError(f"Template '{self.name}' got unknown parameters: {', '.join(sorted(unused))}")
+        return [params[name] for name in self.param_names]
+
+
+TEMPLATES = {
+    t.name: t for t in [
+        QueryTemplate("search", """
+        SELECT PARSE_JSON(SNOWFLAKE.CORTEX.SEARCH_PREVIEW(:service, :request)):results AS RESULTS
+        """),
+        QueryTemplate("narrative", """
+        SELECT SNOWFLAKE.CORTEX.COMPLETE(
+            :model,
+            PARSE_JSON(:messages)::ARRAY,
+            PARSE_JSON(:options)::OBJECT
+        ):choices[0]:messages::string AS AI_RESPONSE
+        """),
+        QueryTemplate("quick_insights", quick_insights_select(SCORECARD_TABLE, ":max_score", ":min_score")),
+        QueryTemplate("quick_insights_snapshot", f"""
+        SELECT INSIGHT, INSIGHT_RANK, LABEL, AVG_SCORE, AVG_SENTIMENT, FAN_COUNT, COMPUTED_AT
+        FROM {QUICK_INSIGHTS_TABLE}
+        """),
+    ]
+}
+
+
+class QueryLayer:
+    """Runs named templates on a Snowpark-style session and records their latency"""
+
+    def __init__(self, session, templates: dict = None, window: int = 512):
+        self.session = session
+        self.templates = dict(TEMPLATES if templates is None else templates)
+        self._window = window
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._counts = {}
+
+    def register(self, template: QueryTemplate):
+        self.templates[template.name] = template
+
+    def _record(self, name: str, seconds: float, ok: bool):
+        with self._lock:
+            if name not in self._latencies:
+                self._latencies[name] = deque(maxlen=self._window)
+                self._counts[name] = {"runs": 0, "errors": 0}
+            self._latencies[name].append(seconds)
+            self._counts[name]["runs"] += 1
+            self._counts[name]["errors"] += 0 if ok else 1
+
+    def _run(self, name: str, params: dict, fetch):
+        template = self.templates[name]
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = fetch(self.session.sql(template.sql, params=template.bind(params)))
+            ok = True
+            return result
+        finally:
+            self._record(name, time.perf_counter() - started, ok)
+
+    def to_pandas(self, name: str, **params):
+        """Run a template and return its rows as a DataFrame"""
+        return self._run(name, params, lambda result: result.to_pandas())
+
+    def collect(self, name: str, **params):
+        """Run a template and return its rows as Row objects"""
+        return self._run(name, params, lambda result: result.collect())
+
+    def stats(self) -> dict:
+        """{template: runs, errors, p50_ms, p95_ms, max_ms} over the recent window"""
+        with self._lock:
+            report = {}
+            for name, latencies in self._latencies.items():
+                ms = np.asarray(latencies) * 1000
+                report[name] = dict(
+                    self._counts[name],
+                    p50_ms=float(np.percentile(ms, 50)),
+                    p95_ms=float(np.percentile(ms, 95)),
+                    max_ms=float(ms.max()),
+                )
+            return report
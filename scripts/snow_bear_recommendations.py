@@ -0,0 +1,360 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Batched generation of BUSINESS_RECOMMENDATION and COMPLEX_RECOMMENDATION.
+
+Pending rows are turned into prompts, identical prompts are collapsed, and
+the distinct prompts are sent to the LLM in batches through a bounded
+thread pool with rate limiting and retry/backoff. Every finished batch is
+written back with one UPDATE, so the NULL recommendation columns act as the
+checkpoint: rerunning after a failure only processes what is still missing.
+
+Run ``python snow_bear_recommendations.py`` to exercise the worker offline
+against a local DuckDB gold table and a fake LLM.
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from snow_bear_data import SCORECARD_TABLE
+
+DEFAULT_MODEL = "snowflake-arctic"
+
+PENDING_QUERY = f"""
+SELECT ID, AGGREGATE_SCORE, AGGREGATE_COMMENT, MAIN_THEME, SEGMENT,
+       BUSINESS_RECOMMENDATION IS NULL AS NEEDS_BUSINESS,
+       COMPLEX_RECOMMENDATION IS NULL AND SEGMENT IS NOT NULL AS NEEDS_COMPLEX
+FROM {SCORECARD_TABLE}
+WHERE AGGREGATE_COMMENT IS NOT NULL
+  AND (BUSINESS_RECOMMENDATION IS NULL
+       OR (COMPLEX_RECOMMENDATION IS NULL AND SEGMENT IS NOT NULL))
+ORDER BY ID
+"""
+
+
+def _concat(*parts):
+    """SQL CONCAT semantics: NULL if any part is NULL"""
+    if any(part is None for part in parts):
+        return None
+    return "".join(str(part) for part in parts)
+
+
+def _score(value):
+    if value is None or value != value:
+        return None
+    return int(value)
+
+
+def business_job(row):
+    """(prompt, static_value) for BUSINESS_RECOMMENDATION, matching the notebook's CASE"""
+    score = _score(row["AGGREGATE_SCORE"])
+    comment, theme = row["AGGREGATE_COMMENT"], row["MAIN_THEME"]
+    if score is not None and score <= 2:
+        return _concat('Based on this negative fan feedback: "', comment,
+                       '", provide a specific business recommendation to improve the fan experience. '
+                       'Focus on actionable steps for: ', theme, '. Keep response under 100 words.'), None
+    if score is not None and score >= 4:
+        return _concat('Based on this positive fan feedback: "', comment,
+                       '", provide a business recommendation on how to maintain and expand on these '
+                       'successful aspects of: ', theme, '. Keep response under 100 words.'), None
+    return None, _concat('Focus on improving ', theme, ' experience based on mixed feedback. '
+                         'Consider surveying fans for specific improvement ideas.')
+
+
+def complex_prompt(row):
+    """COMPLEX_RECOMMENDATION prompt for one fan profile"""
+    return _concat('Fan Profile: Score=', _score(row["AGGREGATE_SCORE"]), ', Segment=', row["SEGMENT"],
+                   ', Theme=', row["MAIN_THEME"], '. Comment: "', row["AGGREGATE_COMMENT"],
+                   '". Provide a comprehensive business strategy recommendation for this fan profile. '
+                   'Include retention strategy, upsell opportunities, and experience personalization. '
+                   'Limit to 150 words.')
+
+
+def plan_jobs(rows):
+    """Group pending work by distinct prompt.
+
+    Returns (prompts, static, skipped): ``prompts`` maps each distinct prompt
+    to the (ID, column) targets that receive its response, ``static`` holds
+    the (ID, column, value) results that need no LLM call and ``skipped``
+    counts targets whose prompt is NULL (as CONCAT would make it in SQL).
+    """
+    prompts, static, skipped = {}, [], 0
+    for row in rows:
+        if row["NEEDS_BUSINESS"]:
+            prompt, value = business_job(row)
+            if prompt is not None:
+                prompts.setdefault(prompt, []).append((row["ID"], "BUSINESS_RECOMMENDATION"))
+            elif value is not None:
+                static.append((row["ID"], "BUSINESS_RECOMMENDATION", value))
+            else:
+                skipped += 1
+        if row["NEEDS_COMPLEX"]:
+            prompt = complex_prompt(row)
+            if prompt is not None:
+                prompts.setdefault(prompt, []).append((row["ID"], "COMPLEX_RECOMMENDATION"))
+            else:
+                skipped += 1
+    return prompts, static, skipped
+
+
+class RateLimiter:
+    """Token bucket shared by the worker threads (LLM calls per second)"""
+
+    def __init__(self, rate: float, burst: int = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1):
+        """Block until ``tokens`` calls may start
+
+        A request above the burst size waits for a full bucket and is still
+        charged every token: the balance goes negative and later callers
+        wait for it to refill, so the long-run rate never exceeds ``rate``.
+        """
+        needed = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # Refills are floats: a balance a hair short of ``needed`` counts as enough
+                if self._tokens >= needed - 1e-9:
+                    self._tokens -= tokens
+                    return
+                wait_seconds = (needed - self._tokens) / self.rate
+            self._sleep(wait_seconds)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+
+    def __init__(self, attempts: int = 5, base_delay: float = 1.0, max_delay: float = 30.0,
+                 sleep=time.sleep, rng=None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    def call(self, fn, on_retry=None):
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.attempts:
+                    raise
+                if on_retry:
+                    on_retry(attempt, e)
+                self._sleep(self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))))
+
+
+class CortexCompleteLLM:
+    """SNOWFLAKE.CORTEX.COMPLETE over a batch of prompts in one query"""
+
+    def __init__(self, session, model: str = DEFAULT_MODEL):
+        self.session = session
+        self.model = model
+
+    def complete_many(self, prompts):
+        values = ", ".join(["(?, ?)"] * len(prompts))
+        params = [self.model]
+        for i, prompt in enumerate(prompts):
+            params += [i, prompt]
+        rows = self.session.sql(
+            f"SELECT column1 AS IDX, SNOWFLAKE.CORTEX.COMPLETE(?, column2) AS RESPONSE FROM VALUES {values}",
+            params=params,
+        ).collect()
+        responses = [None] * len(prompts)
+        for row in rows:
+            responses[int(row["IDX"])] = row["RESPONSE"]
+        return responses
+
+
+class FakeLLM:
+    """Offline stand-in for Cortex COMPLETE with configurable latency and transient failures"""
+
+    def __init__(self, latency: float = 0.05, per_prompt_latency: float = 0.002, failure_rate: float = 0.0,
+                 seed: int = 0, sleep=time.sleep):
+        self.latency = latency
+        self.per_prompt_latency = per_prompt_latency
+        self.failure_rate = failure_rate
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompts = 0
+
+    def complete_many(self, prompts):
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.failure_rate
+        self._sleep(self.latency + self.per_prompt_latency * len(prompts))
+        if fail:
+            raise RuntimeError("fake LLM: transient failure")
+        with self._lock:
+            self.prompts += len(prompts)
+        return [f"Recommendation #{abs(hash(prompt)) % 100000}: act on '{prompt[:40]}'" for prompt in prompts]
+
+
+def write_batch(session, results, table: str = SCORECARD_TABLE):
+    """Write {ID: {column: value}} with one UPDATE ... FROM; only NULL columns are filled"""
+    if not results:
+        return
+    selects, params = [], []
+    for fan_id, values in results.items():
+        selects.append("SELECT ? AS ID, ? AS BUSINESS_RECOMMENDATION, ? AS COMPLEX_RECOMMENDATION")
+        params += [fan_id, values.get("BUSINESS_RECOMMENDATION"), values.get("COMPLEX_RECOMMENDATION")]
+    session.sql(
+        f"""UPDATE {table} S
+SET BUSINESS_RECOMMENDATION = COALESCE(S.BUSINESS_RECOMMENDATION, R.BUSINESS_RECOMMENDATION),
+    COMPLEX_RECOMMENDATION = COALESCE(S.COMPLEX_RECOMMENDATION, R.COMPLEX_RECOMMENDATION)
+FROM ({' UNION ALL '.join(selects)}) R
+WHERE S.ID = R.ID""",
+        params=params,
+    ).collect()
+
+
+def _merge(results, targets, value):
+    for fan_id, column in targets:
+        results.setdefault(fan_id, {})[column] = value
+
+
+def generate_recommendations(session, llm, batch_size: int = 50, max_workers: int = 4,
+                             rate_limiter: RateLimiter = None, retry: RetryPolicy = None,
+                             max_batches: int = None, table: str = SCORECARD_TABLE, log=print) -> dict:
+    """Fill missing recommendations and return a run report.
+
+    LLM calls run on the thread pool; UPDATEs run on the calling thread so
+    the session is never shared between writers. A batch that still fails
+    after its retries is left NULL for the next run. ``max_batches`` stops
+    the run early (used to simulate an interrupted job).
+    """
+    retry = retry or RetryPolicy()
+    started = time.perf_counter()
+    rows = session.sql(PENDING_QUERY.replace(SCORECARD_TABLE, table)).collect()
+    prompts, static, skipped = plan_jobs(rows)
+    report = {
+        "pending_rows": len(rows),
+        "prompt_targets": sum(len(t) for t in prompts.values()),
+        "distinct_prompts": len(prompts),
+        "static_values": len(static),
+        "skipped_null_prompts": skipped,
+        "batches_written": 0,
+        "batches_failed": 0,
+        "prompts_completed": 0,
+        "retries": 0,
+    }
+
+    # Values that need no LLM call are written up front
+    static_results = {}
+    for fan_id, column, value in static:
+        _merge(static_results, [(fan_id, column)], value)
+    write_batch(session, static_results, table)
+
+    distinct = list(prompts)
+    batches = [distinct[i:i + batch_size] for i in range(0, len(distinct), batch_size)]
+    if max_batches is not None:
+        batches = batches[:max_batches]
+    retry_lock = threading.Lock()
+
+    def on_retry(attempt, error):
+        with retry_lock:
+            report["retries"] += 1
+
+    def run_batch(batch):
+        # Every attempt, retries included, goes through the rate limiter
+        def attempt():
+            if rate_limiter:
+                rate_limiter.acquire(len(batch))
+            return llm.complete_many(batch)
+        return retry.call(attempt, on_retry)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Keep at most 2x max_workers batches queued so memory stays bounded
+        batch_iter = iter(batches)
+        in_flight = {}
+        for batch in batch_iter:
+            in_flight[pool.submit(run_batch, batch)] = batch
+            if len(in_flight) >= max_workers * 2:
+                break
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = in_flight.pop(future)
+                try:
+                    responses = future.result()
+                except Exception as e:
+                    report["batches_failed"] += 1
+                    log(f"Batch of {len(batch)} prompts failed after retries: {str(e)}")
+                else:
+                    results = {}
+                    for prompt, response in zip(batch, responses):
+                        _merge(results, prompts[prompt], response)
+                    write_batch(session, results, table)
+                    report["batches_written"] += 1
+                    report["prompts_completed"] += len(batch)
+                next_batch = next(batch_iter, None)
+                if next_batch is not None:
+                    in_flight[pool.submit(run_batch, next_batch)] = next_batch
+
+    report["seconds"] = time.perf_counter() - started
+    report["prompts_per_second"] = report["prompts_completed"] / report["seconds"] if report["seconds"] else 0.0
+    return report
+
+
+def _remaining(session, table: str = SCORECARD_TABLE) -> int:
+    return len(session.sql(PENDING_QUERY.replace(SCORECARD_TABLE, table)).collect())
+
+
+if __name__ == "__main__":
+    from snow_bear_pipeline import build_local_gold
+
+    parser = argparse.ArgumentParser(description="Run the recommendation worker offline with a fake LLM")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--rate", type=float, default=2000, help="LLM prompts per second")
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake LLM seconds per call")
+    args = parser.parse_args()
+
+    retry = RetryPolicy(base_delay=0.01, max_delay=0.1)
+    for workers in args.workers:
+        session = build_local_gold()
+        report = generate_recommendations(
+            session, FakeLLM(latency=args.latency, failure_rate=args.failure_rate), args.batch_size, workers,
+            RateLimiter(args.rate), retry, log=lambda message: None,
+        )
+        print(f"workers {workers:>2}: {report['distinct_prompts']:,} distinct prompts for "
+              f"{report['prompt_targets']:,} targets, {report['retries']} retries, "
+              f"{report['seconds']:.2f} s, {report['prompts_per_second']:,.0f} prompts/s, "
+              f"{_remaining(session):,} rows left ({report['skipped_null_prompts']} with NULL prompt inputs)")
+
+    # Interrupted run followed by a resume
+    session = build_local_gold()
+    first = generate_recommendations(session, FakeLLM(latency=0.0), args.batch_size, 4, max_batches=10,
+                                     log=lambda message: None)
+    left = _remaining(session)
+    llm = FakeLLM(latency=0.0)
+    second = generate_recommendations(session, llm, args.batch_size, 4, log=lambda message: None)
+    print(f"resume: first run wrote {first['batches_written']} batches ({left:,} rows left), "
+          f"second run sent {llm.prompts:,} prompts and left {_remaining(session):,} rows")
@@ -0,0 +1,504 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-process hybrid (BM25 + hashed vector) search over AGGREGATE_COMMENT.
+
+A fallback for the SNOWBEAR_SEARCH_ANALYSIS Cortex Search service and the
+search engine of the local backend. The index is a set of flat numpy
+arrays: CSR postings with precomputed BM25 weights (float16), an int8
+matrix of hashed character-trigram vectors per distinct comment,
+categorical codes and float32 scores for the attribute filters, and UTF-8
+blobs for the returned text. Lexical and vector rankings are merged with
+reciprocal rank fusion, after the filter, so the filtered top-k never
+needs over-fetching. ``save()`` writes them to a directory and ``load()``
+memory-maps them back, so a large index opens instantly and is shared
+through the page cache. Filters use the Cortex Search syntax
+(``@eq``, ``@gte``, ``@lte``, ``@and``, ``@or``, ``@not``).
+
+Saved indexes are keyed by the scorecard's table version. Notebook step
+5b builds one with ``publish_index()`` and uploads it to INDEX_STAGE; the
+app's fallback downloads it once per version with ``download_index()`` and
+opens it with ``open_saved_index()``, building and saving it locally only
+when nothing was published for that version.
+
+Benchmark on the shipped CSV and a synthetic 1M-row scorecard::
+
+    python snow_bear_search.py bench --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import hashlib
+import re
+import shutil
+import tempfile
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_ATTRIBUTES = ["SEGMENT", "SEGMENT_ALT", "MAIN_THEME", "SECONDARY_THEME"]
+SCORE_ATTRIBUTES = [
+    "AGGREGATE_SCORE", "PARKING_SCORE", "SEAT_LOCATION_SCORE", "OVERALL_EVENT_SCORE",
+    "MERCHANDISE_PRICING_SCORE", "MERCHANDISE_OFFERING_SCORE", "GAME_EXPERIENCE_SCORE",
+    "FOOD_OFFERING_SCORE",
+]
+NUMERIC_ATTRIBUTES = SCORE_ATTRIBUTES + ["AGGREGATE_SENTIMENT"]
+DATE_ATTRIBUTES = ["REVIEW_DATE"]
+TEXT_COLUMN = "AGGREGATE_COMMENT"
+INDEX_COLUMNS = ["ID", TEXT_COLUMN] + CATEGORY_ATTRIBUTES + NUMERIC_ATTRIBUTES + DATE_ATTRIBUTES
+INDEX_QUERY = (
+    f"SELECT {', '.join(INDEX_COLUMNS)} FROM SNOW_BEAR_DB.GOLD_LAYER.QUALTRICS_SCORECARD "
+    f"WHERE {TEXT_COLUMN} IS NOT NULL ORDER BY ID"
+)
+
+INDEX_STAGE = "SNOW_BEAR_DB.GOLD_LAYER.SEARCH_INDEX_STAGE"
+INDEX_META = "meta.json"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+VECTOR_DIM = 256
+# Reciprocal rank fusion constant, and how deep each ranking is read before fusing
+RRF_K = 60
+FUSION_DEPTH = 2
+SEARCH_MODES = ("hybrid", "lexical", "vector")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have i in is it its me my of on or our so "
+    "that the their there they this to was we were with you".split()
+)
+_TOKEN = re.compile(r"[a-z0-9']+")
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def tokenize(text: str):
+    """Lower-cased word tokens without stopwords and with plural/possessive endings trimmed"""
+    terms = []
+    for token in _TOKEN.findall(str(text).lower()):
+        token = token.strip("'")
+        if token.endswith("'s"):
+            token = token[:-2]
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        if token and token not in STOPWORDS:
+            terms.append(token)
+    return terms
+
+
+def embed_text(text: str, dim: int = VECTOR_DIM) -> np.ndarray:
+    """Unit-length signed feature-hashing vector of the character trigrams of each token"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for token in tokenize(text):
+        padded = f" {token} "
+        for i in range(len(padded) - 2):
+            h = zlib.crc32(padded[i:i + 3].encode("utf-8"))
+            vector[h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _pack_strings(values):
+    """UTF-8 blob plus int64 offsets; None is stored as an empty string"""
+    encoded = [b"" if v is None else str(v).encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_string(blob, offsets, i):
+    return bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+
+def _format_number(value) -> str:
+    """Render a score like Snowflake's ::string does (3.0 -> '3')"""
+    return None if np.isnan(value) else format(float(value), ".6g")
+
+
+class SearchIndex:
+    """BM25 postings plus attribute columns for filtered top-k search"""
+
+    def __init__(self, arrays: dict, meta: dict):
+        self.arrays = arrays
+        self.meta = meta
+        self.n_docs = meta["n_docs"]
+        self.vocab = {term: i for i, term in enumerate(meta["vocab"])}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, k1: float = BM25_K1, b: float = BM25_B):
+        """Index a scorecard frame with the INDEX_COLUMNS columns"""
+        n_docs = len(df)
+        # Tokenize each distinct comment once - repeated text shares its term counts
+        text_codes, texts = pd.factorize(df[TEXT_COLUMN].fillna(""), use_na_sentinel=False)
+        text_codes = text_codes.astype(np.int32)
+        vocab = {}
+        u_terms, u_tf, u_ptr, u_len = [], [], [0], []
+        for text in texts:
+            counts = {}
+            tokens = tokenize(text)
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for term, tf in counts.items():
+                u_terms.append(vocab.setdefault(term, len(vocab)))
+                u_tf.append(tf)
+            u_ptr.append(len(u_terms))
+            u_len.append(len(tokens))
+        u_terms = np.asarray(u_terms, dtype=np.int32)
+        u_tf = np.asarray(u_tf, dtype=np.float32)
+        u_ptr = np.asarray(u_ptr, dtype=np.int64)
+        u_len = np.asarray(u_len, dtype=np.float32)
+
+        # Expand per-text postings to per-document postings, grouped by term
+        per_doc = np.diff(u_ptr)[text_codes]
+        doc_ids = np.repeat(np.arange(n_docs, dtype=np.int32), per_doc)
+        entry = np.repeat(u_ptr[text_codes] - np.cumsum(per_doc) + per_doc, per_doc) + np.arange(len(doc_ids))
+        terms = u_terms[entry]
+        order = np.argsort(terms, kind="stable")
+        doc_ids, terms, entry = doc_ids[order], terms[order], entry[order]
+        ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocab)), out=ptr[1:])
+
+        # Precompute each posting's BM25 contribution so a query is only gathers and adds
+        doc_len = u_len[text_codes]
+        avgdl = float(doc_len.mean()) if n_docs else 0.0
+        df_term = np.diff(ptr).astype(np.float32)
+        idf = np.log1p((n_docs - df_term + 0.5) / (df_term + 0.5))
+        tf = u_tf[entry]
+        norm = k1 * (1 - b + b * doc_len[doc_ids] / max(avgdl, 1e-9))
+        weights = (idf[terms] * tf * (k1 + 1) / (tf + norm)).astype(np.float16)
+
+        # One quantized vector per distinct comment, shared by every document with that text
+        vectors = np.stack([embed_text(text) for text in texts]) if len(texts) else np.zeros((0, VECTOR_DIM), np.float32)
+        text_vectors = np.round(vectors * 127).astype(np.int8)
+
+        arrays = {
+            "postings_ptr": ptr, "postings_doc": doc_ids, "postings_weight": weights,
+            "text_codes": text_codes, "text_vectors": text_vectors,
+        }
+        arrays["text_blob"], arrays["text_offsets"] = _pack_strings(texts)
+        arrays["id_blob"], arrays["id_offsets"] = _pack_strings(df["ID"].tolist())
+        labels = {}
+        for column in CATEGORY_ATTRIBUTES:
+            codes, uniques = pd.factorize(df[column])
+            arrays[f"{column}.codes"] = codes.astype(np.int16)
+            labels[column] = [str(u) for u in uniques]
+        for column in NUMERIC_ATTRIBUTES:
+            arrays[column] = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+        for column in DATE_ATTRIBUTES:
+            days = pd.to_datetime(df[column]).to_numpy().astype("datetime64[D]")
+            arrays[column] = np.where(np.isnat(days), np.iinfo(np.int32).min, (days - _EPOCH).astype(np.int64)).astype(np.int32)
+        meta = {"n_docs": n_docs, "avgdl": avgdl, "k1": k1, "b": b, "vocab": list(vocab), "labels": labels}
+        return cls(arrays, meta)
+
+    def save(self, path: str):
+        """Write the index as .npy files plus meta.json, ready for ``load()``"""
+        os.makedirs(path, exist_ok=True)
+        for name, array in self.arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(self.meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """Open a saved index; arrays are memory-mapped read-only unless mmap=False"""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {
+            name[:-4]: np.load(os.path.join(path, name), mmap_mode="r" if mmap else None)
+            for name in os.listdir(path) if name.endswith(".npy")
+        }
+        return cls(arrays, meta)
+
+    def memory_usage(self, deep: bool = True) -> int:
+        """Bytes of the index arrays in process memory (read by the app's DataCache)
+
+        Memory-mapped arrays live in the page cache and are not counted.
+        """
+        return sum(int(a.nbytes) for a in self.arrays.values() if not isinstance(a, np.memmap))
+
+    def _column_values(self, column: str, doc_ids):
+        column = column.upper()
+        if column in CATEGORY_ATTRIBUTES:
+            return self.arrays[f"{column}.codes"][doc_ids]
+        if column in NUMERIC_ATTRIBUTES or column in DATE_ATTRIBUTES:
+            return self.arrays[column][doc_ids]
+        raise ValueError(f"'{column}' is not a filterable search attribute")
+
+    def _operand(self, column: str, value):
+        column = column.upper()
+        if column in CATEGORY_ATTRIBUTES:
+            labels = self.meta["labels"][column]
+            return labels.index(value) if value in labels else -2
+        if column in DATE_ATTRIBUTES:
+            return int((np.datetime64(str(value)[:10], "D") - _EPOCH).astype(np.int64))
+        return float(value)
+
+    def filter_mask(self, spec: dict, doc_ids) -> np.ndarray:
+        """Evaluate a Cortex Search style filter for the given documents"""
+        if not spec:
+            return np.ones(len(doc_ids), dtype=bool)
+        (op, arg), = spec.items()
+        if op == "@and":
+            mask = np.ones(len(doc_ids), dtype=bool)
+            for part in arg:
+                mask &= self.filter_mask(part, doc_ids)
+            return mask
+        if op == "@or":
+            mask = np.zeros(len(doc_ids), dtype=bool)
+            for part in arg:
+                mask |= self.filter_mask(part, doc_ids)
+            return mask
+        if op == "@not":
+            return ~self.filter_mask(arg, doc_ids)
+        (column, value), = arg.items()
+        values = self._column_values(column, doc_ids)
+        operand = self._operand(column, value)
+        if op == "@eq":
+            return values == operand
+        if op == "@gte":
+            return values >= operand
+        if op == "@lte":
+            return values <= operand
+        raise ValueError(f"Unsupported search filter operator '{op}'")
+
+    def lexical_scores(self, query: str):
+        """Candidate documents containing any query term and their BM25 scores"""
+        postings_ptr = self.arrays["postings_ptr"]
+        term_ids = sorted({self.vocab[t] for t in tokenize(query) if t in self.vocab})
+        if not term_ids:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        if len(term_ids) == 1:
+            lo, hi = postings_ptr[term_ids[0]], postings_ptr[term_ids[0] + 1]
+            return np.asarray(self.arrays["postings_doc"][lo:hi]), self.arrays["postings_weight"][lo:hi].astype(np.float32)
+        # Dense accumulator: a term lists each document once, so plain fancy-index adds are safe
+        accumulator = np.zeros(self.n_docs, dtype=np.float32)
+        for t in term_ids:
+            lo, hi = postings_ptr[t], postings_ptr[t + 1]
+            accumulator[self.arrays["postings_doc"][lo:hi]] += self.arrays["postings_weight"][lo:hi]
+        candidates = np.flatnonzero(accumulator).astype(np.int32)
+        return candidates, accumulator[candidates]
+
+    def vector_scores(self, query: str, doc_ids):
+        """Cosine similarity between the query vector and each document's comment vector"""
+        query_vector = embed_text(query)
+        text_vectors = self.arrays["text_vectors"]
+        # Score each distinct comment once, in chunks to bound the float32 copy
+        text_scores = np.empty(len(text_vectors), dtype=np.float32)
+        for start in range(0, len(text_vectors), 65536):
+            chunk = np.asarray(text_vectors[start:start + 65536], dtype=np.float32)
+            text_scores[start:start + len(chunk)] = chunk @ query_vector / 127
+        return text_scores[self.arrays["text_codes"][doc_ids]]
+
+    @staticmethod
+    def _top(candidates, scores, limit):
+        if len(candidates) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            candidates, scores = candidates[top], scores[top]
+        # Highest score first, ties broken by index order like a stable sort
+        order = np.lexsort((candidates, -scores))
+        return candidates[order], scores[order]
+
+    def search(self, query: str, limit: int = 200, filter: dict = None, mode: str = "hybrid"):
+        """Top ``limit`` (doc ids, scores) among documents passing ``filter``
+
+        ``mode`` is "lexical" (BM25), "vector" (hashed trigram cosine) or
+        "hybrid", which fuses the two rankings by reciprocal rank.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}', expected one of {SEARCH_MODES}")
+        depth = limit if mode != "hybrid" else limit * FUSION_DEPTH
+        rankings = []
+        if mode in ("hybrid", "lexical"):
+            candidates, scores = self.lexical_scores(query)
+            if filter and len(candidates):
+                keep = self.filter_mask(filter, candidates)
+                candidates, scores = candidates[keep], scores[keep]
+            rankings.append(self._top(candidates, scores, depth))
+        if mode in ("hybrid", "vector"):
+            candidates = np.arange(self.n_docs, dtype=np.int32)
+            if filter:
+                candidates = candidates[self.filter_mask(filter, candidates)]
+            scores = self.vector_scores(query, candidates)
+            positive = scores > 0
+            rankings.append(self._top(candidates[positive], scores[positive], depth))
+        if mode != "hybrid":
+            return rankings[0]
+        fused = {}
+        for ranked_docs, _ in rankings:
+            for rank, doc in enumerate(ranked_docs.tolist()):
+                fused[doc] = fused.get(doc, 0.0) + 1.0 / (RRF_K + rank + 1)
+        candidates = np.fromiter(fused.keys(), dtype=np.int32, count=len(fused))
+        scores = np.fromiter(fused.values(), dtype=np.float32, count=len(fused))
+        return self._top(candidates, scores, limit)
+
+    def rows(self, doc_ids, columns):
+        """Result rows for ``doc_ids`` as {lower-case column: string or None}, the Cortex Search shape"""
+        labels = self.meta["labels"]
+        result = []
+        for doc in np.asarray(doc_ids).tolist():
+            row = {}
+            for column in columns:
+                name = column.upper()
+                if name == "ID":
+                    row[column] = _unpack_string(self.arrays["id_blob"], self.arrays["id_offsets"], doc)
+                elif name == TEXT_COLUMN:
+                    code = self.arrays["text_codes"][doc]
+                    row[column] = _unpack_string(self.arrays["text_blob"], self.arrays["text_offsets"], code)
+                elif name in CATEGORY_ATTRIBUTES:
+                    code = self.arrays[f"{name}.codes"][doc]
+                    row[column] = labels[name][code] if code >= 0 else None
+                elif name in NUMERIC_ATTRIBUTES:
+                    row[column] = _format_number(self.arrays[name][doc])
+                elif name in DATE_ATTRIBUTES:
+                    day = int(self.arrays[name][doc])
+                    row[column] = None if day == np.iinfo(np.int32).min else str(_EPOCH + day)
+                else:
+                    row[column] = None
+            result.append(row)
+        return result
+
+
+def index_key(version) -> str:
+    """Directory name of the index saved for a scorecard table version"""
+    return hashlib.sha256(str(version).encode("utf-8")).hexdigest()[:16]
+
+
+def open_saved_index(root: str, version, populate) -> SearchIndex:
+    """Memory-map the index saved for ``version`` under ``root``
+
+    When it is missing, ``populate(path)`` writes it to a scratch directory
+    first, which is then renamed into place, so readers never see a half
+    written index. Indexes of other versions are removed.
+    """
+    path = os.path.join(root, index_key(version))
+    if not os.path.exists(os.path.join(path, INDEX_META)):
+        os.makedirs(root, exist_ok=True)
+        scratch = tempfile.mkdtemp(dir=root, prefix=".building-")
+        try:
+            populate(scratch)
+            os.replace(scratch, path)
+        except OSError:
+            # Another process renamed its copy into place first
+            if not os.path.exists(os.path.join(path, INDEX_META)):
+                raise
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        for name in os.listdir(root):
+            if name != os.path.basename(path) and not name.startswith("."):
+                # Open memory maps of an old index stay valid after the files are unlinked
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return SearchIndex.load(path, mmap=True)
+
+
+def publish_index(session, version, stage: str = INDEX_STAGE) -> int:
+    """Build the index from the scorecard and upload it to ``stage``/<index_key(version)>/; returns the documents indexed"""
+    index = SearchIndex.from_frame(session.sql(INDEX_QUERY).to_pandas())
+    with tempfile.TemporaryDirectory() as path:
+        index.save(path)
+        for name in os.listdir(path):
+            session.file.put(os.path.join(path, name), f"@{stage}/{index_key(version)}/", auto_compress=False, overwrite=True)
+    return index.n_docs
+
+
+def download_index(backend, version, path: str, stage: str = INDEX_STAGE) -> bool:
+    """Copy the index published for ``version`` into ``path``; False when there is none"""
+    key = index_key(version)
+    try:
+        names = [name.split("/")[-1] for name in backend.list_stage(stage) if f"/{key}/" in name]
+    except Exception:
+        # Stage not created yet: notebook step 5b has not run
+        return False
+    if INDEX_META not in names:
+        return False
+    for name in names:
+        with open(os.path.join(path, name), "wb") as f:
+            f.write(backend.read_stage_file(stage, f"{key}/{name}"))
+    return True
+
+
+def synthetic_scorecard(base: pd.DataFrame, rows: int, seed: int = 7) -> pd.DataFrame:
+    """Resample a scorecard to ``rows`` rows with fresh IDs and independently drawn attributes"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"ID": [f"SYN{i:08d}" for i in range(rows)]})
+    for column in INDEX_COLUMNS[1:]:
+        df[column] = base[column].to_numpy()[rng.integers(0, len(base), rows)]
+    return df
+
+
+# Queries used by the benchmark - the app's quick searches and examples, plus filtered variants
+BENCH_QUERIES = [
+    ("parking issues", None),
+    ("food quality", None),
+    ("game experience", None),
+    ("crowd atmosphere", None),
+    ("long lines at the concourse", None),
+    ("expensive concessions and drink options", None),
+    ("parking issues", {"@eq": {"segment": "Value-Conscious Fan"}}),
+    ("food quality", {"@and": [{"@eq": {"main_theme": "Food"}}, {"@lte": {"aggregate_score": 3}}]}),
+    ("game experience", {"@gte": {"game_experience_score": 4}}),
+]
+
+
+def benchmark(index: SearchIndex, repeats: int = 50, limit: int = 200, mode: str = "hybrid") -> dict:
+    """p50/p99 latency in milliseconds of BENCH_QUERIES against ``index``"""
+    timings = []
+    for _ in range(repeats):
+        for query, spec in BENCH_QUERIES:
+            started = time.perf_counter()
+            doc_ids, _ = index.search(query, limit=limit, filter=spec, mode=mode)
+            index.rows(doc_ids, ["aggregate_comment", "segment", "main_theme", "aggregate_score", "id"])
+            timings.append((time.perf_counter() - started) * 1000)
+    timings = np.asarray(timings)
+    return {"queries": len(timings), "p50_ms": float(np.percentile(timings, 50)), "p99_ms": float(np.percentile(timings, 99))}
+
+
+def _bench_report(label: str, df: pd.DataFrame, repeats: int, modes=SEARCH_MODES):
+    started = time.perf_counter()
+    index = SearchIndex.from_frame(df)
+    build_s = time.perf_counter() - started
+    with tempfile.TemporaryDirectory() as path:
+        index.save(path)
+        started = time.perf_counter()
+        mapped = SearchIndex.load(path)
+        open_ms = (time.perf_counter() - started) * 1000
+        print(
+            f"{label:<12} rows {len(df):>9,}  terms {len(index.vocab):>6,}  index {index.memory_usage() / 1024 / 1024:7.1f} MB  "
+            f"build {build_s:6.2f} s  open {open_ms:6.1f} ms"
+        )
+        for mode in modes:
+            stats = benchmark(mapped, repeats=repeats, mode=mode)
+            print(f"{'':<12} {mode:<8} p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or benchmark the local Snow Bear comment search index")
+    parser.add_argument("mode", choices=["build", "bench"])
+    parser.add_argument("--csv", default=None, help="survey export to build the gold layer from")
+    parser.add_argument("--out", default="snow_bear_search_index", help="directory written by build")
+    parser.add_argument("--rows", type=int, nargs="*", default=[1_000_000], help="synthetic scorecard sizes for bench")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--modes", choices=SEARCH_MODES, nargs="*", default=list(SEARCH_MODES), help="search modes to bench")
+    args = parser.parse_args()
+
+    from snow_bear_pipeline import SURVEY_CSV, build_local_gold
+
+    scorecard = build_local_gold(args.csv or SURVEY_CSV).sql(INDEX_QUERY).to_pandas()
+    if args.mode == "build":
+        SearchIndex.from_frame(scorecard).save(args.out)
+        print(f"wrote {len(scorecard):,} documents to {args.out}")
+    else:
+        _bench_report("shipped CSV", scorecard, args.repeats, args.modes)
+        for rows in args.rows:
+            _bench_report("synthetic", synthetic_scorecard(scorecard, rows), max(1, args.repeats // 5), args.modes)
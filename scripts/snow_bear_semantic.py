@@ -0,0 +1,171 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Semantic model discovery and validation for the AI Assistant tab.
+
+SemanticModelRegistry lists the SEMANTIC_MODELS stage at most once per
+TTL, or on demand. It keeps each YAML's name, stage MD5 and last-modified
+time. A file is downloaded and checked locally only when its MD5 is new
+to the registry. Models that fail the check are listed with their errors
+and never sent to Cortex Analyst. To check files before uploading them::
+
+    python snow_bear_semantic.py snow_bear_fan_360.yaml
+"""
+
+import argparse
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+import yaml
+
+SEMANTIC_MODEL_SUFFIXES = (".yaml", ".yml")
+
+# Column lists of a logical table; each entry needs a name and an expression
+COLUMN_SECTIONS = ["dimensions", "time_dimensions", "measures", "facts", "metrics"]
+BASE_TABLE_KEYS = ["database", "schema", "table"]
+
+
+def _missing(entry: dict, keys) -> list:
+    return [key for key in keys if not isinstance(entry.get(key), str) or not entry[key].strip()]
+
+
+def validate_semantic_model(text) -> list:
+    """Problems found in a semantic model YAML; an empty list means it can be sent to Analyst"""
+    try:
+        model = yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        return [f"invalid YAML: {str(e).splitlines()[0]}"]
+    if not isinstance(model, dict):
+        return ["top level must be a mapping"]
+    errors = [f"missing '{key}'" for key in _missing(model, ["name"])]
+    tables = model.get("tables")
+    if not isinstance(tables, list) or not tables:
+        return errors + ["'tables' must be a non-empty list"]
+    table_names = set()
+    for i, table in enumerate(tables):
+        if not isinstance(table, dict):
+            errors.append(f"tables[{i}] must be a mapping")
+            continue
+        label = table.get("name") or f"tables[{i}]"
+        errors += [f"{label}: missing '{key}'" for key in _missing(table, ["name"])]
+        if label in table_names:
+            errors.append(f"{label}: duplicate table name")
+        table_names.add(label)
+        base_table = table.get("base_table")
+        if not isinstance(base_table, dict):
+            errors.append(f"{label}: missing 'base_table'")
+        else:
+            errors += [f"{label}: base_table missing '{key}'" for key in _missing(base_table, BASE_TABLE_KEYS)]
+        column_names = set()
+        for section in COLUMN_SECTIONS:
+            columns = table.get(section) or []
+            if not isinstance(columns, list):
+                errors.append(f"{label}: '{section}' must be a list")
+                continue
+            for j, column in enumerate(columns):
+                if not isinstance(column, dict):
+                    errors.append(f"{label}.{section}[{j}] must be a mapping")
+                    continue
+                column_label = f"{label}.{column.get('name') or f'{section}[{j}]'}"
+                errors += [f"{column_label}: missing '{key}'" for key in _missing(column, ["name", "expr"])]
+                if column.get("name") in column_names:
+                    errors.append(f"{column_label}: duplicate column name")
+                column_names.add(column.get("name"))
+        if not column_names:
+            errors.append(f"{label}: no dimensions, measures or facts")
+    for i, query in enumerate(model.get("verified_queries") or []):
+        if not isinstance(query, dict):
+            errors.append(f"verified_queries[{i}] must be a mapping")
+            continue
+        errors += [f"verified_queries[{i}]: missing '{key}'" for key in _missing(query, ["name", "question", "sql"])]
+    return errors
+
+
+@dataclass(frozen=True)
+class SemanticModel:
+    """A semantic model YAML on the stage and the result of its local check"""
+
+    name: str
+    md5: str
+    last_modified: str
+    errors: tuple = ()
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+class SemanticModelRegistry:
+    """Stage listing and validation results for the semantic models, shared by all sessions"""
+
+    def __init__(self, stage: str, ttl: float = 10 * 60, clock=time.monotonic):
+        self.stage = stage
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._models = None
+        self._listed_at = None
+        # Validation results by MD5, so an unchanged file is only downloaded once
+        self._errors = {}
+
+    def _check(self, backend, name: str, md5: str) -> tuple:
+        if md5 not in self._errors:
+            try:
+                self._errors[md5] = tuple(validate_semantic_model(backend.read_stage_file(self.stage, name)))
+            except Exception as e:
+                # Not cached: a failed download is retried on the next listing
+                return (f"could not read file: {str(e)}",)
+        return self._errors[md5]
+
+    def models(self, backend, refresh: bool = False) -> list:
+        """Semantic models on the stage, listing it again only when the TTL has passed or ``refresh`` is set"""
+        with self._lock:
+            if refresh or self._models is None or self._clock() - self._listed_at > self.ttl:
+                files = backend.stage_file_info(self.stage)
+                self._models = [
+                    SemanticModel(name, info["md5"], info["last_modified"], self._check(backend, name, info["md5"]))
+                    for name, info in sorted(files.items())
+                    if name.lower().endswith(SEMANTIC_MODEL_SUFFIXES)
+                ]
+                self._listed_at = self._clock()
+            return list(self._models)
+
+    def get(self, backend, name: str):
+        return next((model for model in self.models(backend) if model.name == name), None)
+
+    def listed_seconds_ago(self):
+        return None if self._listed_at is None else self._clock() - self._listed_at
+
+    def invalidate(self):
+        """Drop the listing so the next call reads the stage again"""
+        with self._lock:
+            self._models = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check semantic model YAML files before uploading them to the stage")
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args()
+    failed = False
+    for path in args.files:
+        with open(path, "rb") as f:
+            errors = validate_semantic_model(f.read())
+        print(f"{path}: {'ok' if not errors else f'{len(errors)} problems'}")
+        for error in errors:
+            print(f"  - {error}")
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,306 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Rerun timing and profiling for the Snow Bear app.
+
+The app renders only the selected view on each rerun. RerunTimer splits
+one script run into laps (startup, filters, view, ...). ViewTimings keeps
+each view's recent render times for a browser session, so the debug panel
+can show what the skipped views would have cost if they had been rendered
+too, as the tabs did before.
+
+Profiler records one event per SQL statement (wall time, rows, bytes),
+section and view render, data cache lookup and Cortex call. Every event
+goes to the debug panel, as one JSON line on the "snow_bear.telemetry"
+logger, and optionally to a telemetry table. ``instrument_backend`` routes
+a backend's SQL through ProfiledSession and times its Cortex methods.
+"""
+
+import functools
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+from snow_bear_cache import estimate_nbytes
+
+logger = logging.getLogger("snow_bear.telemetry")
+
+TELEMETRY_COLUMNS = ["EVENT_TIME", "SESSION_ID", "RUN_ID", "KIND", "NAME", "MS", "ROW_COUNT", "BYTE_COUNT", "DETAIL"]
+_EVENT_FIELDS = {"ts", "session_id", "run_id", "kind", "name", "ms", "rows", "bytes"}
+
+
+class RerunTimer:
+    """Wall-clock laps of one script run"""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self.started = self._last = clock()
+        self.laps = {}
+        self.run_id = uuid.uuid4().hex[:12]
+        self.session_id = None
+        # Profiler events recorded on this run's thread
+        self.events = []
+        self.listener = None
+
+    def lap(self, name: str) -> float:
+        """Record the time since the previous lap (or the start) under ``name``"""
+        now = self._clock()
+        seconds = now - self._last
+        self.laps[name] = self.laps.get(name, 0.0) + seconds
+        self._last = now
+        if self.listener:
+            self.listener(name, seconds)
+        return seconds
+
+    def total(self) -> float:
+        return self._clock() - self.started
+
+
+class ViewTimings:
+    """Recent render times of each view for one browser session"""
+
+    def __init__(self, window: int = 20):
+        self._window = window
+        self._seconds = {}
+
+    def record(self, view: str, seconds: float):
+        self._seconds.setdefault(view, deque(maxlen=self._window)).append(seconds)
+
+    def last(self, view: str):
+        times = self._seconds.get(view)
+        return times[-1] if times else None
+
+    def median(self, view: str):
+        times = self._seconds.get(view)
+        return float(np.median(times)) if times else None
+
+    def report(self, views, active_view: str) -> dict:
+        """Render time of the active view and the typical cost of the views skipped this run
+
+        ``skipped_seconds`` only covers views rendered at least once in this
+        session. The others are listed in ``unmeasured``.
+        """
+        skipped = {view: self.median(view) for view in views if view != active_view}
+        return {
+            "active_view": active_view,
+            "active_seconds": self.last(active_view),
+            "skipped_seconds": sum(seconds for seconds in skipped.values() if seconds is not None),
+            "skipped": {view: seconds for view, seconds in skipped.items() if seconds is not None},
+            "unmeasured": [view for view, seconds in skipped.items() if seconds is None],
+        }
+
+
+def statement_name(query: str, width: int = 80) -> str:
+    """First characters of a statement with whitespace collapsed, used as its event name"""
+    text = " ".join(str(query).split())
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+class Profiler:
+    """Process-wide recorder of SQL, section, view, cache and Cortex events"""
+
+    def __init__(self, window: int = 5000, log_events: bool = True):
+        self.events = deque(maxlen=window)
+        self.log_events = log_events
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start_run(self, timer: RerunTimer, session_id: str = None) -> RerunTimer:
+        """Attribute the events recorded on this thread to ``timer`` until finish_run"""
+        timer.session_id = session_id
+        timer.listener = lambda name, seconds: self.record("section", name, seconds)
+        self._local.run = timer
+        return timer
+
+    def current_run(self):
+        return getattr(self._local, "run", None)
+
+    def finish_run(self) -> dict:
+        """Log a summary event for the current run and detach it from the thread"""
+        run = self.current_run()
+        if run is None:
+            return {}
+        self._local.run = None
+        summary = run_summary(run)
+        self._emit(dict(
+            ts=time.time(), session_id=run.session_id, run_id=run.run_id, kind="run", name="rerun",
+            ms=round(run.total() * 1000, 2), **{k: v for k, v in summary.items() if k != "total_ms"}
+        ))
+        return summary
+
+    def _emit(self, event: dict):
+        if self.log_events:
+            logger.info(json.dumps(event, default=str))
+
+    def record(self, kind: str, name: str, seconds: float = 0.0, **fields) -> dict:
+        event = {"ts": time.time(), "kind": kind, "name": name, "ms": round(seconds * 1000, 3), **fields}
+        run = self.current_run()
+        if run is not None:
+            event["session_id"] = run.session_id
+            event["run_id"] = run.run_id
+            run.events.append(event)
+        with self._lock:
+            self.events.append(event)
+        self._emit(event)
+        return event
+
+    @contextmanager
+    def timed(self, kind: str, name: str, **fields):
+        """Record the wall time of a block, with ``ok`` set to whether it raised"""
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(kind, name, time.perf_counter() - started, ok=ok, **fields)
+
+    def wrap(self, kind: str, name: str, func):
+        """``func`` with every call recorded as a ``kind`` event"""
+        @functools.wraps(func)
+        def timed_call(*args, **kwargs):
+            with self.timed(kind, name):
+                return func(*args, **kwargs)
+        return timed_call
+
+    def cache_event(self, namespace: str, outcome: str):
+        """DataCache listener: one "cache" event per hit, miss or coalesced lookup"""
+        self.record("cache", namespace, outcome=outcome)
+
+    def summary(self, kind: str) -> list:
+        """Recent ``kind`` events by name - count, p50/p95/max ms, rows and bytes - slowest p95 first"""
+        with self._lock:
+            events = [event for event in self.events if event["kind"] == kind]
+        by_name = {}
+        for event in events:
+            by_name.setdefault(event["name"], []).append(event)
+        report = []
+        for name, named in by_name.items():
+            ms = np.array([event["ms"] for event in named])
+            report.append(dict(
+                name=name, count=len(named),
+                p50_ms=float(np.percentile(ms, 50)), p95_ms=float(np.percentile(ms, 95)), max_ms=float(ms.max()),
+                rows=sum(event.get("rows") or 0 for event in named),
+                bytes=sum(event.get("bytes") or 0 for event in named),
+            ))
+        return sorted(report, key=lambda row: row["p95_ms"], reverse=True)
+
+
+def run_summary(run: RerunTimer) -> dict:
+    """Totals of one run's events for the debug panel and the run log line"""
+    sql = [event for event in run.events if event["kind"] == "sql"]
+    cortex = [event for event in run.events if event["kind"] == "cortex"]
+    cache = [event for event in run.events if event["kind"] == "cache"]
+    return {
+        "total_ms": round(run.total() * 1000, 2),
+        "laps_ms": {name: round(seconds * 1000, 2) for name, seconds in run.laps.items()},
+        "sql_count": len(sql),
+        "sql_ms": round(sum(event["ms"] for event in sql), 2),
+        "rows": sum(event.get("rows") or 0 for event in sql),
+        "bytes": sum(event.get("bytes") or 0 for event in sql),
+        "cortex_count": len(cortex),
+        "cortex_ms": round(sum(event["ms"] for event in cortex), 2),
+        "cache_hits": sum(event["outcome"] != "miss" for event in cache),
+        "cache_misses": sum(event["outcome"] == "miss" for event in cache),
+    }
+
+
+class _ProfiledResult:
+    """A lazy Snowpark-style result whose collect()/to_pandas() calls are recorded"""
+
+    def __init__(self, result, query: str, profiler: Profiler):
+        self._result = result
+        self._query = query
+        self._profiler = profiler
+
+    def _fetch(self, method: str):
+        started = time.perf_counter()
+        rows = None
+        try:
+            rows = getattr(self._result, method)()
+            return rows
+        finally:
+            self._profiler.record(
+                "sql", statement_name(self._query), time.perf_counter() - started,
+                ok=rows is not None,
+                rows=len(rows) if rows is not None else 0,
+                bytes=estimate_nbytes(rows) if rows is not None else 0,
+            )
+
+    def collect(self):
+        return self._fetch("collect")
+
+    def to_pandas(self):
+        return self._fetch("to_pandas")
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+
+class ProfiledSession:
+    """Snowpark-style session that records wall time, rows and bytes of every sql() statement"""
+
+    def __init__(self, session, profiler: Profiler):
+        self.unwrapped = session
+        self._profiler = profiler
+
+    def sql(self, query: str, params=None):
+        return _ProfiledResult(self.unwrapped.sql(query, params=params), query, self._profiler)
+
+    def __getattr__(self, name):
+        return getattr(self.unwrapped, name)
+
+
+def instrument_backend(backend, profiler: Profiler):
+    """Profile a backend's SQL and its Cortex Search, Analyst and COMPLETE calls (idempotent)"""
+    if isinstance(backend.session, ProfiledSession):
+        return backend
+    backend.session = ProfiledSession(backend.session, profiler)
+    backend.queries.session = backend.session
+    for method in ("search", "analyst_message", "complete"):
+        setattr(backend, method, profiler.wrap("cortex", method, getattr(backend, method)))
+    return backend
+
+
+def write_events(session, table: str, events, batch_size: int = 200) -> int:
+    """Append events to a telemetry table, creating it if needed; returns the number written"""
+    session.sql(
+        f"CREATE TABLE IF NOT EXISTS {table} (EVENT_TIME TIMESTAMP, SESSION_ID VARCHAR, RUN_ID VARCHAR, "
+        "KIND VARCHAR, NAME VARCHAR, MS DOUBLE, ROW_COUNT BIGINT, BYTE_COUNT BIGINT, DETAIL VARCHAR)"
+    ).collect()
+    rows = [
+        [
+            datetime.fromtimestamp(event["ts"], timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f"),
+            event.get("session_id"), event.get("run_id"), event["kind"], event["name"], event["ms"],
+            event.get("rows"), event.get("bytes"),
+            json.dumps({k: v for k, v in event.items() if k not in _EVENT_FIELDS}, default=str),
+        ]
+        for event in events
+    ]
+    placeholders = "(CAST(? AS TIMESTAMP), " + ", ".join(["?"] * (len(TELEMETRY_COLUMNS) - 1)) + ")"
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        session.sql(
+            f"INSERT INTO {table} ({', '.join(TELEMETRY_COLUMNS)}) VALUES " + ", ".join([placeholders] * len(batch)),
+            params=[value for row in batch for value in row],
+        ).collect()
+    return len(rows)
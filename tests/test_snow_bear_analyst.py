@@ -0,0 +1,44 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The Analyst SQL cache keys on normalized text but runs the SQL as generated."""
+
+from snow_bear_analyst import AnalystCache, normalize_sql
+
+COMMENTED_SQL = "SELECT a -- pick a\nFROM t\nWHERE x = 1;"
+
+
+def test_line_comments_keep_their_line_break():
+    assert normalize_sql(COMMENTED_SQL) == "SELECT a -- pick a\nFROM t WHERE x = 1"
+    # Without the break, the comment would swallow the FROM clause: a different query
+    assert normalize_sql("SELECT a -- pick a FROM t\nWHERE x = 1") != normalize_sql(COMMENTED_SQL)
+
+
+def test_whitespace_in_string_literals_is_kept():
+    assert normalize_sql("SELECT  'a  -- b'\n  FROM t ;") == "SELECT 'a  -- b' FROM t"
+
+
+def test_sql_result_runs_the_original_statement():
+    cache = AnalystCache()
+    executed = []
+
+    def loader(statement):
+        executed.append(statement)
+        return len(executed)
+
+    assert cache.sql_result(COMMENTED_SQL, "model", 1, loader) == 1
+    # Same query up to whitespace: served from the cache
+    assert cache.sql_result("SELECT a -- pick a\n  FROM t WHERE x = 1", "model", 1, loader) == 1
+    assert executed == [COMMENTED_SQL]
@@ -0,0 +1,49 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The benchmark's baseline check compares stage times relative to the reference workload."""
+
+from snow_bear_benchmark import compare_to_baseline
+
+
+def results(ms, relative, peak_mb=10.0):
+    return {"rows": {"100000": {"Executive Dashboard": {"load": {"ms": ms, "relative": relative, "peak_mb": peak_mb}}}}}
+
+
+BASELINE = results(400.0, 4.0)
+
+
+def test_a_uniformly_slower_machine_is_not_a_regression():
+    # Twice the time, but the reference workload took twice as long too
+    assert compare_to_baseline(results(800.0, 4.0), BASELINE, tolerance=0.25) == []
+
+
+def test_a_slower_stage_is_a_regression():
+    regressions = compare_to_baseline(results(600.0, 6.0), BASELINE, tolerance=0.25)
+    assert len(regressions) == 1 and "load: ms 600.0 > baseline 400.0" in regressions[0]
+
+
+def test_differences_below_the_noise_floors_are_ignored():
+    assert compare_to_baseline(results(10.0, 0.1, peak_mb=1.0), results(5.0, 0.05, peak_mb=0.1), tolerance=0.25) == []
+
+
+def test_memory_growth_is_a_regression():
+    regressions = compare_to_baseline(results(400.0, 4.0, peak_mb=20.0), BASELINE, tolerance=0.25)
+    assert len(regressions) == 1 and "peak_mb" in regressions[0]
+
+
+def test_baselines_without_relative_times_compare_milliseconds():
+    old = {"rows": {"100000": {"Executive Dashboard": {"load": {"ms": 400.0, "peak_mb": 10.0}}}}}
+    assert compare_to_baseline(results(600.0, 4.0), old, tolerance=0.25)
@@ -0,0 +1,81 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The load test's RSS figures, its queue wait, and the backend mode's shared cache."""
+
+import sys
+import time
+
+import pytest
+
+from snow_bear_backend import LocalBackend
+from snow_bear_benchmark import default_filters
+from snow_bear_cache import DataCache
+from snow_bear_loadtest import SCENARIOS, BackendUser, CachedSession, RssSampler, UserResult, rss_bytes, summarize
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RSS is read from /proc")
+def test_rss_is_current_not_peak():
+    before = rss_bytes()
+    ballast = b"\x01" * (64 * 1024 * 1024)
+    assert rss_bytes() - before > 48 * 1024 * 1024
+    del ballast
+    # A peak (ru_maxrss) would not come back down
+    assert rss_bytes() - before < 16 * 1024 * 1024
+
+
+def test_sampler_records_until_stopped():
+    sampler = RssSampler(interval=0.01)
+    sampler.start()
+    sampler.stop()
+    assert sampler.samples and not sampler.is_alive()
+
+
+def test_summary_separates_the_peak_from_the_steady_state():
+    sampler = RssSampler()
+    # Ramp-up until t=10, then a short spike in a steady run
+    sampler.samples = [(0, 100), (5, 150), (10, 200), (11, 400), (12, 210), (13, 205), (14, 200)]
+    rss = sampler.summary(before=100, after=190, steady_from=10)
+    assert rss == {"before": 100, "peak": 400, "steady": 205, "after": 190}
+    report = summarize([], elapsed=1.0, rss=rss)
+    assert report["rss_growth_bytes"] == {"peak": 300, "steady": 105, "after": 90}
+
+
+def test_queue_wait_is_reported_apart_from_the_latency():
+    result = UserResult(0, "executive")
+    # (kind, latency, service time): the second step waited 300 ms for its turn
+    result.steps = [("view", 0.1, 0.1), ("view", 0.5, 0.2)]
+    report = summarize([result], elapsed=1.0)
+    assert report["queue_wait"]["max_ms"] == pytest.approx(300)
+    assert report["service"]["max_ms"] == pytest.approx(200)
+    assert report["latency"]["all"]["max_ms"] == pytest.approx(500)
+
+
+def test_backend_users_share_one_cache_concurrently():
+    backend = LocalBackend.from_csv()
+    cache = DataCache()
+    filters = default_filters(CachedSession(backend, cache))
+    users = [
+        BackendUser(user, scenario, time.monotonic() + 0.5, 0, 0, backend, cache, filters)
+        for user, scenario in enumerate(SCENARIOS)
+    ]
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+    assert all(user.result.steps and not user.result.errors for user in users)
+    # Later users and passes are served from what the first ones loaded
+    stats = cache.stats()["namespaces"]["scorecard"]
+    assert stats["hits"] + stats["coalesced"] > stats["misses"]
@@ -0,0 +1,153 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The vectorized metrics must match the pandas groupby implementation they replaced."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import snow_bear_metrics as sb_metrics
+from snow_bear_data import SENTIMENT_COLUMNS, build_rollup
+
+METRIC_COLUMNS = ["FAN_COUNT", "AVG_SCORE", "AVG_SENTIMENT", "SATISFACTION_PCT"] + SENTIMENT_COLUMNS
+
+
+def assert_matches_pandas(df: pd.DataFrame, by: str):
+    expected = sb_metrics._pandas_metrics(df, by, SENTIMENT_COLUMNS)
+    actual = sb_metrics.group_metrics(df, by, category_cols=SENTIMENT_COLUMNS)[expected.columns]
+    assert list(actual.index) == list(expected.index)
+    np.testing.assert_allclose(actual.to_numpy(float), expected.to_numpy(float), equal_nan=True)
+
+
+@pytest.fixture
+def scorecard():
+    return sb_metrics.synthetic_scorecard(5_000, seed=3)
+
+
+@pytest.mark.parametrize("by", ["SEGMENT", "MAIN_THEME"])
+def test_group_metrics_matches_pandas(scorecard, by):
+    assert_matches_pandas(scorecard, by)
+
+
+@pytest.mark.parametrize("by", ["SEGMENT", "MAIN_THEME"])
+def test_categorical_keys_match_pandas_and_drop_unobserved_categories(scorecard, by):
+    labels = sorted(scorecard[by].unique()) + ["Never Seen"]
+    scorecard[by] = pd.Categorical(scorecard[by], categories=labels)
+    assert_matches_pandas(scorecard, by)
+    assert "Never Seen" not in sb_metrics.group_metrics(scorecard, by).index
+
+
+def test_missing_group_keys_are_dropped_like_pandas(scorecard):
+    scorecard.loc[scorecard.sample(frac=0.05, random_state=1).index, "SEGMENT"] = np.nan
+    assert_matches_pandas(scorecard, "SEGMENT")
+    assert sb_metrics.group_metrics(scorecard, "SEGMENT")["FAN_COUNT"].sum() == scorecard["SEGMENT"].notna().sum()
+
+
+def test_missing_scores_count_as_not_satisfied():
+    df = pd.DataFrame({
+        "ID": ["1", "2", "3", "4", "5"],
+        "SEGMENT": ["A", "A", "A", "A", "B"],
+        "AGGREGATE_SCORE": [5, np.nan, 4, 1, np.nan],
+        "AGGREGATE_SENTIMENT": [0.5, np.nan, -0.5, 0.0, 0.25],
+    })
+    metrics = sb_metrics.group_metrics(df, "SEGMENT")
+    assert metrics.loc["A", "FAN_COUNT"] == 4
+    assert metrics.loc["A", "SATISFACTION_PCT"] == pytest.approx(50.0)
+    assert metrics.loc["A", "AVG_SCORE"] == pytest.approx(10 / 3)
+    assert metrics.loc["A", "AVG_SENTIMENT"] == pytest.approx(0.0)
+    assert metrics.loc["B", "SATISFACTION_PCT"] == 0.0
+    assert np.isnan(metrics.loc["B", "AVG_SCORE"])
+    expected = sb_metrics._pandas_metrics(df, "SEGMENT", [])
+    np.testing.assert_allclose(metrics[expected.columns].to_numpy(float), expected.to_numpy(float), equal_nan=True)
+
+
+def test_whole_frame_summary(scorecard):
+    overall = sb_metrics.group_metrics(scorecard, category_cols=SENTIMENT_COLUMNS).iloc[0]
+    assert overall["FAN_COUNT"] == len(scorecard)
+    assert overall["AVG_SCORE"] == pytest.approx(scorecard["AGGREGATE_SCORE"].mean())
+    assert overall["SATISFACTION_PCT"] == pytest.approx((scorecard["AGGREGATE_SCORE"] >= 4).mean() * 100)
+    assert overall["PARKING_SENTIMENT"] == pytest.approx(scorecard["PARKING_SENTIMENT"].mean())
+
+
+def test_empty_frames(scorecard):
+    empty = scorecard.iloc[:0]
+    by_segment = sb_metrics.group_metrics(empty, "SEGMENT", category_cols=SENTIMENT_COLUMNS)
+    assert by_segment.empty
+    assert list(by_segment.columns) == METRIC_COLUMNS
+    overall = sb_metrics.group_metrics(empty).iloc[0]
+    assert overall["FAN_COUNT"] == 0
+    assert np.isnan(overall["AVG_SCORE"]) and np.isnan(overall["SATISFACTION_PCT"])
+
+
+def test_group_sums_matches_pandas(scorecard):
+    codes, index = sb_metrics.group_codes(scorecard, "MAIN_THEME")
+    values = scorecard["AGGREGATE_SCORE"].to_numpy(dtype=np.float64)
+    assert np.isnan(values).any()
+    sums, counts = sb_metrics.group_sums(codes, len(index), values)
+    expected = scorecard.groupby("MAIN_THEME")["AGGREGATE_SCORE"].agg(["sum", "count"])
+    np.testing.assert_allclose(sums, expected["sum"].to_numpy())
+    np.testing.assert_array_equal(counts, expected["count"].to_numpy())
+
+
+def test_group_sums_ignores_rows_without_a_group():
+    codes = np.array([0, -1, 1, 0, -1])
+    sums, counts = sb_metrics.group_sums(codes, 2, [1.0, 100.0, 2.0, np.nan, 100.0])
+    np.testing.assert_allclose(sums, [1.0, 2.0])
+    np.testing.assert_array_equal(counts, [1, 1])
+
+
+def _rows_with_missing_keys(scorecard):
+    df = scorecard.assign(REVIEW_DATE=pd.Timestamp("2025-01-01") + pd.to_timedelta(np.arange(len(scorecard)) % 7, unit="D"))
+    df.loc[df.index[::11], "SEGMENT"] = np.nan
+    df.loc[df.index[::13], "MAIN_THEME"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("max_dense_groups", [sb_metrics._MAX_DENSE_GROUPS, 1])
+def test_multi_key_codes_keep_missing_keys(scorecard, monkeypatch, max_dense_groups):
+    # A limit of 1 forces the sparse (np.unique) path
+    monkeypatch.setattr(sb_metrics, "_MAX_DENSE_GROUPS", max_dense_groups)
+    df = _rows_with_missing_keys(scorecard)
+    keys = ["SEGMENT", "MAIN_THEME", "AGGREGATE_SCORE"]
+    codes, index = sb_metrics.group_codes(df, keys, dropna=False)
+    assert (codes >= 0).all()
+    expected = df.groupby(keys, dropna=False).size()
+    actual = pd.Series(np.bincount(codes, minlength=len(index)), index=index)
+    assert len(actual) == len(expected)
+    pd.testing.assert_series_equal(
+        actual.sort_index(), expected.sort_index(), check_names=False, check_index_type=False
+    )
+    # Every row's code points at its own key tuple
+    for row in [0, 11, 13, 143]:
+        looked_up = index[codes[row]]
+        for key, label in zip(keys, looked_up):
+            value = df[key].iloc[row]
+            assert (pd.isna(value) and pd.isna(label)) or value == label
+
+
+def test_build_rollup_matches_pandas(scorecard):
+    df = _rows_with_missing_keys(scorecard)
+    rollup = build_rollup(df).set_index(["REVIEW_DAY", "SEGMENT", "MAIN_THEME", "AGGREGATE_SCORE"]).sort_index()
+    expected = (
+        df.assign(REVIEW_DAY=df["REVIEW_DATE"].dt.normalize())
+        .groupby(["REVIEW_DAY", "SEGMENT", "MAIN_THEME", "AGGREGATE_SCORE"], dropna=False)["AGGREGATE_SENTIMENT"]
+        .agg(FAN_COUNT="size", SENTIMENT_COUNT="count", SENTIMENT_SUM="sum")
+        .sort_index()
+    )
+    assert rollup["FAN_COUNT"].sum() == len(df)
+    np.testing.assert_array_equal(rollup["FAN_COUNT"].to_numpy(), expected["FAN_COUNT"].to_numpy())
+    np.testing.assert_array_equal(rollup["SENTIMENT_COUNT"].to_numpy(), expected["SENTIMENT_COUNT"].to_numpy())
+    np.testing.assert_allclose(rollup["SENTIMENT_SUM"].to_numpy(), expected["SENTIMENT_SUM"].to_numpy())
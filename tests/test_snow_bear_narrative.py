@@ -0,0 +1,192 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""NarrativeStream's statuses on a fake clock and a fake LLM that hangs on cue, and build_context's token budget."""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from snow_bear_analyst import estimate_tokens
+from snow_bear_narrative import FakeStreamingLLM, NarrativeStream, build_context, context_json
+
+TEXT = "one two three four five six"
+MESSAGES = [{"role": "user", "content": "Summarize the result"}]
+
+
+class FakeClock:
+    """Stays at ``now`` unless the test moves it; ``step`` is added on every read"""
+
+    def __init__(self, step: float = 0.0):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        value = self.now
+        self.now += self.step
+        return value
+
+
+class GatedSleep:
+    """Returns at once for the first ``allowed`` calls, then blocks until released: a stalled service"""
+
+    def __init__(self, allowed: int):
+        self.allowed = allowed
+        self.calls = 0
+        self.released = threading.Event()
+
+    def __call__(self, seconds: float):
+        self.calls += 1
+        if self.calls > self.allowed:
+            self.released.wait()
+
+
+@pytest.fixture
+def gate():
+    gate = GatedSleep(allowed=10_000)
+    yield gate
+    # Let a stalled producer thread finish
+    gate.released.set()
+
+
+def stream_of(gate, clock, closed=None, **timeouts) -> NarrativeStream:
+    llm = FakeStreamingLLM(TEXT, sleep=gate)
+
+    def chunks():
+        try:
+            yield from llm.stream("fake", MESSAGES)
+        finally:
+            if closed is not None:
+                closed.set()
+
+    return NarrativeStream(chunks, clock=clock, **timeouts)
+
+
+def test_completed_stream_keeps_every_chunk(gate):
+    stream = stream_of(gate, FakeClock())
+    assert list(stream) == ["one ", "two ", "three ", "four ", "five ", "six"]
+    assert stream.status == "completed"
+    assert stream.text == TEXT
+    assert stream.time_to_first_token == 0.0
+
+
+def test_first_token_timeout(gate):
+    gate.allowed = 0
+    # Every clock read is 100 s later than the last, past the 10 s limit before anything arrives
+    stream = stream_of(gate, FakeClock(step=100), first_token_timeout=10, total_timeout=1000)
+    assert list(stream) == []
+    assert stream.status == "timed_out"
+    assert stream.time_to_first_token is None
+    assert stream.text == ""
+
+
+def test_total_timeout_keeps_the_partial_text(gate):
+    # Time to first token plus two gaps: three words, then the service stalls
+    gate.allowed = 3
+    clock = FakeClock()
+    stream = stream_of(gate, clock, first_token_timeout=10, total_timeout=60)
+    received = []
+    for chunk in stream:
+        received.append(chunk)
+        if len(received) == 3:
+            clock.now = 61
+    assert received == ["one ", "two ", "three "]
+    assert stream.status == "timed_out"
+    assert stream.text == "one two three "
+
+
+def test_cancel_mid_stream_keeps_the_partial_text(gate):
+    stream = stream_of(gate, FakeClock())
+    received = []
+    for chunk in stream:
+        received.append(chunk)
+        if len(received) == 2:
+            stream.cancel()
+    assert received == ["one ", "two "]
+    assert stream.status == "cancelled"
+    assert stream.text == "one two "
+
+
+def test_abandoned_consumer_cancels_the_producer(gate):
+    # Streamlit drops the generator when the user clicks Stop or changes a widget mid-stream
+    gate.allowed = 2
+    closed = threading.Event()
+    stream = stream_of(gate, FakeClock(), closed=closed)
+    chunks = iter(stream)
+    assert next(chunks) == "one "
+    chunks.close()
+    assert stream.status == "cancelled"
+    assert stream.text == "one "
+    assert stream.elapsed == 0.0
+    # The producer stops at its next chunk and closes the service's stream
+    gate.released.set()
+    assert closed.wait(5)
+
+
+def test_error_is_reported_with_the_text_so_far():
+    def chunks():
+        yield "partial "
+        raise RuntimeError("connection reset")
+
+    stream = NarrativeStream(chunks, clock=FakeClock())
+    assert list(stream) == ["partial "]
+    assert stream.status == "error"
+    assert str(stream.error) == "connection reset"
+    assert stream.text == "partial "
+
+
+@pytest.fixture
+def large_result():
+    rng = np.random.default_rng(0)
+    rows = 2000
+    return pd.DataFrame({
+        "SEGMENT": rng.choice([f"Segment {i}" for i in range(8)], rows),
+        "MAIN_THEME": rng.choice([f"Theme {i} with a long descriptive label" for i in range(30)], rows),
+        "COMMENT": [f"fan comment number {i}" for i in range(rows)],
+        "AGGREGATE_SCORE": rng.integers(1, 6, rows),
+        "AGGREGATE_SENTIMENT": rng.uniform(-1, 1, rows),
+    })
+
+
+def test_context_within_budget_is_not_shrunk(large_result):
+    context = build_context(large_result, "SELECT 1", token_budget=100_000)
+    assert 0 < len(context["sample_rows"]) <= 20
+    assert all(len(stats.get("top", {})) <= 5 for stats in context["stats"].values())
+    assert max(len(stats.get("top", {})) for stats in context["stats"].values()) == 5
+
+
+def test_context_drops_sample_rows_before_categories(large_result):
+    full = build_context(large_result, "SELECT 1", token_budget=100_000)
+    context = build_context(large_result, "SELECT 1", token_budget=full["estimated_tokens"] - 1)
+    assert context["estimated_tokens"] <= full["estimated_tokens"] - 1
+    assert len(context["sample_rows"]) < len(full["sample_rows"])
+    assert context["stats"] == full["stats"]
+
+
+def test_context_shrinks_to_its_floor_when_the_budget_is_too_small(large_result):
+    context = build_context(large_result, "SELECT 1", token_budget=10)
+    # No sample rows and one top category per column is as small as it gets; it is returned over budget
+    assert context["sample_rows"] == []
+    assert all(len(stats.get("top", {})) <= 1 for stats in context["stats"].values())
+    assert context["estimated_tokens"] > 10
+    assert context["row_count"] == len(large_result)
+
+
+def test_estimated_tokens_match_the_sent_json(large_result):
+    context = build_context(large_result, "SELECT 1", token_budget=600)
+    tokens = context.pop("estimated_tokens")
+    assert tokens == estimate_tokens(context_json(context)) <= 600
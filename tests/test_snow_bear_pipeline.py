@@ -0,0 +1,140 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Gold layer statements: the notebook's copies and the incremental refresh on DuckDB."""
+
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import snow_bear_pipeline as sb_pipeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NOTEBOOK = os.path.join(ROOT, "notebooks", "snow_bear_complete_setup.ipynb")
+SURVEY_CSV = os.path.join(ROOT, "scripts", sb_pipeline.SURVEY_CSV)
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(re.sub(r"--[^\n]*", "", sql).split())
+
+
+def notebook_statements():
+    with open(NOTEBOOK) as f:
+        cells = json.load(f)["cells"]
+    return [
+        _normalize(statement)
+        for cell in cells if cell["cell_type"] == "code"
+        for statement in "".join(cell["source"]).split(";")
+    ]
+
+
+@pytest.mark.parametrize("statement", sb_pipeline.summary_table_statements(), ids=["themes", "rollup", "quick_insights"])
+def test_notebook_summary_tables_match_the_pipeline(statement):
+    # Steps 3, 3b and 3c and the incremental refresh must build each table the same way
+    expected = _normalize(statement)
+    create = expected.split(" AS ")[0] + " AS"
+    copies = [statement for statement in notebook_statements() if statement.startswith(create)]
+    assert copies
+    assert all(copy == expected for copy in copies)
+
+
+def _frame(session, query: str) -> pd.DataFrame:
+    return session.sql(query).to_pandas()
+
+
+def _count(session, table: str) -> int:
+    return int(_frame(session, f"SELECT COUNT(*) AS N FROM {table}").iloc[0, 0])
+
+
+def _rollup_totals(session) -> pd.DataFrame:
+    # REVIEW_DATE of a new row is random, so compare the rollup without its day
+    return _frame(session, f"""SELECT SEGMENT, MAIN_THEME, AGGREGATE_SCORE, SUM(FAN_COUNT) AS FAN_COUNT,
+       SUM(SENTIMENT_COUNT) AS SENTIMENT_COUNT, SUM(SENTIMENT_SUM) AS SENTIMENT_SUM
+FROM {sb_pipeline.ROLLUP_TABLE}
+GROUP BY 1, 2, 3
+ORDER BY 1, 2, 3""")
+
+
+def _themes(session) -> pd.DataFrame:
+    # THEME_NUMBER breaks count ties arbitrarily
+    return _frame(session, f"""SELECT MAIN_THEME, SENTIMENT_CATEGORY, RESPONSE_COUNT
+FROM {sb_pipeline.THEMES_TABLE}
+ORDER BY MAIN_THEME""")
+
+
+def _assert_same(actual: pd.DataFrame, expected: pd.DataFrame):
+    pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
+
+
+def test_incremental_refresh_enriches_only_the_delta_and_matches_a_full_rebuild():
+    session = sb_pipeline.build_local_gold(SURVEY_CSV)
+    bronze, gold, cache = sb_pipeline.BRONZE_TABLE, sb_pipeline.SCORECARD_TABLE, sb_pipeline.CORTEX_CACHE_TABLE
+    gold_before = _frame(session, f"SELECT ID, REVIEW_DATE FROM {gold}")
+    rollup_before = _rollup_totals(session)
+    cached_before = _count(session, cache)
+    # Rows with every AGGREGATE_COMMENT part, so each change also yields one new aggregate text
+    complete = " AND ".join(f"{column} IS NOT NULL" for column in sb_pipeline.AGGREGATE_COMMENT_SOURCES)
+    ids = _frame(session, f"SELECT ID FROM {bronze} WHERE {complete} ORDER BY ID LIMIT 3")["ID"].tolist()
+
+    # Two new fans copied from existing rows with a new parking comment, and one edited food comment
+    others = ", ".join(c for c in sb_pipeline.BRONZE_COLUMNS if c not in ("ID", "PARKING_COMMENT", "CREATED_TIMESTAMP"))
+    for n, source_id in enumerate(ids[:2]):
+        session.sql(f"""INSERT INTO {bronze} (ID, PARKING_COMMENT, CREATED_TIMESTAMP, {others})
+SELECT 'new-fan-{n}', 'Shuttle {n} from the far lot was a nightmare', CREATED_TIMESTAMP + INTERVAL 1 DAY, {others}
+FROM {bronze} WHERE ID = '{source_id}'""").collect()
+    session.sql(f"""UPDATE {bronze}
+SET FOOD_OFFERING_COMMENT = 'The pretzel stand ran out before halftime',
+    CREATED_TIMESTAMP = CREATED_TIMESTAMP + INTERVAL 1 DAY
+WHERE ID = '{ids[2]}'""").collect()
+
+    sb_pipeline.run_statements(session, sb_pipeline.incremental_statements(sb_pipeline.LOCAL_DIALECT))
+
+    # 3 new comments and 3 new aggregate comments, each scored and themed once
+    assert _count(session, cache) - cached_before == 6 * 2
+    merged = _frame(session, f"SELECT * FROM {gold} ORDER BY ID")
+    assert len(merged) == len(gold_before) + 2
+    kept = gold_before.merge(merged[["ID", "REVIEW_DATE"]], on="ID", suffixes=("", "_AFTER"))
+    assert (kept["REVIEW_DATE"] == kept["REVIEW_DATE_AFTER"]).all()
+    rollup, themes = _rollup_totals(session), _themes(session)
+    assert rollup["FAN_COUNT"].sum() == rollup_before["FAN_COUNT"].sum() + 2
+    assert themes["RESPONSE_COUNT"].sum() == len(merged)
+
+    cached_after = _count(session, cache)
+    sb_pipeline.run_statements(session, sb_pipeline.full_build_statements(sb_pipeline.LOCAL_DIALECT))
+
+    assert _count(session, cache) == cached_after
+    rebuilt = _frame(session, f"SELECT * FROM {gold} ORDER BY ID")
+    columns = [c for c in rebuilt.columns if c != "REVIEW_DATE"]
+    numeric = [c for c in columns if pd.api.types.is_float_dtype(rebuilt[c])]
+    _assert_same(merged[columns].drop(columns=numeric), rebuilt[columns].drop(columns=numeric))
+    assert np.allclose(merged[numeric].astype(float), rebuilt[numeric].astype(float), equal_nan=True)
+    _assert_same(_rollup_totals(session).drop(columns="SENTIMENT_SUM"), rollup.drop(columns="SENTIMENT_SUM"))
+    assert np.allclose(_rollup_totals(session)["SENTIMENT_SUM"], rollup["SENTIMENT_SUM"])
+    _assert_same(_themes(session), themes)
+
+
+def test_dedup_report_counts_only_non_null_texts():
+    comments = sorted({comment for _, comment in sb_pipeline.SENTIMENT_SOURCES + sb_pipeline.SUMMARY_SOURCES})
+    df = pd.DataFrame({comment: ["Great  view", "Great view"] for comment in comments})
+    df.loc[1, "PARKING_COMMENT"] = None
+    report = sb_pipeline.dedup_report(df)
+    # 2 x 8 comment cells less the NULL one, plus the one complete AGGREGATE_COMMENT
+    assert report["functions"]["SENTIMENT"]["per_row_calls"] == 15 + 1
+    assert report["functions"]["SENTIMENT"]["distinct_texts"] == 2
+    assert report["per_row_calls"] == 2 * 16
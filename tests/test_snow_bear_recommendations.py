@@ -0,0 +1,86 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Rate limiting of the recommendation worker's COMPLETE batches."""
+
+import os
+
+import pytest
+
+import snow_bear_recommendations as sb_recs
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_batches_above_the_burst_size_are_charged_in_full():
+    clock = FakeClock()
+    limiter = sb_recs.RateLimiter(rate=20, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        limiter.acquire(25)
+    # 125 calls at 20/s, the first 20 covered by the initial burst; the last
+    # batch's 5 calls beyond the burst are owed by the next caller
+    assert clock.now == pytest.approx((125 - 20 - 5) / 20)
+    limiter.acquire(1)
+    assert clock.now == pytest.approx((126 - 20) / 20)
+
+
+def test_requests_within_the_burst_size():
+    clock = FakeClock()
+    limiter = sb_recs.RateLimiter(rate=10, burst=5, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        limiter.acquire()
+    assert clock.now == 0.0
+    limiter.acquire(2)
+    assert clock.now == pytest.approx(0.2)
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.charged = []
+
+    def acquire(self, tokens=1):
+        self.charged.append(tokens)
+
+
+class FailingOnceLLM(sb_recs.FakeLLM):
+    def complete_many(self, prompts):
+        if self.calls == 0:
+            self.calls += 1
+            raise RuntimeError("throttled")
+        return super().complete_many(prompts)
+
+
+def test_every_retry_goes_through_the_rate_limiter():
+    from snow_bear_pipeline import SURVEY_CSV, build_local_gold
+
+    session = build_local_gold(os.path.join(os.path.dirname(sb_recs.__file__), SURVEY_CSV))
+    limiter = CountingLimiter()
+    report = sb_recs.generate_recommendations(
+        session, FailingOnceLLM(latency=0, per_prompt_latency=0), batch_size=10, max_workers=1,
+        rate_limiter=limiter, retry=sb_recs.RetryPolicy(base_delay=0), max_batches=2, log=lambda *_: None,
+    )
+    assert report["retries"] == 1
+    assert report["batches_written"] == 2
+    # Two batches plus the retried attempt, each charged for all its prompts
+    assert limiter.charged == [10, 10, 10]
@@ -0,0 +1,86 @@
+# Copyright 2026 Snowflake Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Saved search indexes: one memory-mapped directory per scorecard version, published through a stage."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import snow_bear_search as sb_search
+
+
+@pytest.fixture
+def scorecard():
+    return pd.DataFrame({
+        "ID": ["1", "2", "3"],
+        "AGGREGATE_COMMENT": ["Parking was a nightmare", "Great food and friendly staff", "Long lines for parking"],
+        **{column: ["Casual", "Die-hard", "Casual"] for column in sb_search.CATEGORY_ATTRIBUTES},
+        **{column: [2.0, 5.0, 3.0] for column in sb_search.NUMERIC_ATTRIBUTES},
+        "REVIEW_DATE": pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03"]),
+    })
+
+
+def test_an_index_is_built_once_per_version_and_memory_mapped(tmp_path, scorecard):
+    builds = []
+
+    def populate(path):
+        builds.append(path)
+        sb_search.SearchIndex.from_frame(scorecard).save(path)
+
+    index = sb_search.open_saved_index(str(tmp_path), "v1", populate)
+    again = sb_search.open_saved_index(str(tmp_path), "v1", populate)
+    assert len(builds) == 1
+    assert all(isinstance(array, np.memmap) for array in again.arrays.values())
+    # Mapped arrays are not counted against the app's data cache
+    assert again.memory_usage() == 0
+    doc_ids, _ = index.search("parking")
+    assert sorted(row["id"] for row in index.rows(doc_ids, ["id"])) == ["1", "3"]
+
+
+def test_a_new_version_replaces_the_old_index(tmp_path, scorecard):
+    populate = lambda path: sb_search.SearchIndex.from_frame(scorecard).save(path)
+    sb_search.open_saved_index(str(tmp_path), "v1", populate)
+    sb_search.open_saved_index(str(tmp_path), "v2", populate)
+    assert os.listdir(tmp_path) == [sb_search.index_key("v2")]
+
+
+class StageBackend:
+    """list_stage/read_stage_file over a local directory laid out like the index stage"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def list_stage(self, stage):
+        return [f"search_index_stage/{key}/{name}" for key in os.listdir(self.root) for name in os.listdir(os.path.join(self.root, key))]
+
+    def read_stage_file(self, stage, name):
+        with open(os.path.join(self.root, name), "rb") as f:
+            return f.read()
+
+
+def test_a_published_index_is_downloaded_instead_of_built(tmp_path, scorecard):
+    stage = tmp_path / "stage"
+    sb_search.SearchIndex.from_frame(scorecard).save(str(stage / sb_search.index_key("v1")))
+    backend = StageBackend(str(stage))
+
+    def populate(path):
+        assert sb_search.download_index(backend, "v1", path)
+
+    index = sb_search.open_saved_index(str(tmp_path / "cache"), "v1", populate)
+    assert index.n_docs == 3
+    assert not sb_search.download_index(backend, "v2", str(tmp_path))